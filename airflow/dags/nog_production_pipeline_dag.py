@@ -1,8 +1,6 @@
 from airflow import DAG
 from airflow.operators.python import PythonOperator
 from airflow.operators.email import EmailOperator
-from airflow.operators.python import BranchPythonOperator
-from airflow.operators.empty import EmptyOperator
 from airflow.utils.dates import days_ago
 from datetime import datetime, timedelta
 import sys
@@ -11,7 +9,8 @@ import os
 # Add the project root to Python path
 sys.path.append('/opt/airflow/project')
 
-from src.models.weekly_predict import WeeklyPredictionPipeline
+from src.models import pipeline_stages
+from src.utils.artifact_store import ArtifactStore
 import json
 import logging
 
@@ -31,99 +30,94 @@ default_args = {
 dag = DAG(
     'nog_production_pipeline',
     default_args=default_args,
-    description='Production NOG pipeline: Force data update first, fallback to weekly predictions if fails',
+    description='Production NOG pipeline: parallel data refresh, then features, drift-triggered training, predict and scoring stages that skip when inputs are unchanged',
     schedule_interval='0 9 * * 1',  # Run every Monday at 9 AM
     catchup=False,
     tags=['nog', 'production', 'prediction', 'xgboost', 'ml'],
 )
 
-def force_data_update(**context):
+def refresh_prices(**context):
     """
-    Force data update from Yahoo Finance (fresh data).
-    Returns success=True if successful, False if failed.
+    Append fresh Yahoo Finance prices. A failed fetch keeps the saved CSV.
     """
-    try:
-        logging.info("🔄 Force data update: Fetching fresh data from Yahoo Finance...")
-        
-        # Initialize the pipeline
-        pipeline = WeeklyPredictionPipeline()
-        
-        # Try to run with fresh data
-        results = pipeline.run_weekly_pipeline(update_data=True)
-        
-        if results["status"] == "success":
-            logging.info("✅ Force data update successful!")
-            context['task_instance'].xcom_push(key='force_update_success', value=True)
-            context['task_instance'].xcom_push(key='prediction_results', value=results)
-            return True
-        else:
-            logging.warning(f"⚠️ Force data update failed: {results.get('error', 'Unknown error')}")
-            context['task_instance'].xcom_push(key='force_update_success', value=False)
-            return False
-            
-    except Exception as e:
-        logging.error(f"❌ Error in force data update: {e}")
-        context['task_instance'].xcom_push(key='force_update_success', value=False)
-        return False
+    logging.info("🔄 Refreshing prices from Yahoo Finance...")
+    result = pipeline_stages.refresh_prices()
+    if result.get('error'):
+        logging.warning(f"⚠️ Price fetch failed, continuing with saved prices: {result['error']}")
+    return result
 
-def run_weekly_predictions(**context):
+def refresh_macro(**context):
     """
-    Run weekly predictions with existing data (fallback).
+    Refresh the FRED macro indicator cache.
     """
-    try:
-        logging.info("🔄 Running weekly predictions with existing data...")
-        
-        # Initialize the pipeline
-        pipeline = WeeklyPredictionPipeline()
-        
-        # Run with existing data
-        results = pipeline.run_weekly_pipeline(update_data=False)
-        
-        if results["status"] == "success":
-            logging.info("✅ Weekly predictions with existing data completed successfully")
-            context['task_instance'].xcom_push(key='prediction_results', value=results)
-            return results
-        else:
-            error_msg = f"Weekly predictions failed: {results.get('error', 'Unknown error')}"
-            logging.error(f"❌ {error_msg}")
-            raise Exception(error_msg)
-            
-    except Exception as e:
-        logging.error(f"❌ Error in weekly predictions: {e}")
-        raise
+    logging.info("🔄 Refreshing macro indicators...")
+    return pipeline_stages.refresh_macro()
 
-def decide_next_step(**context):
+def refresh_news(**context):
     """
-    Decide whether to send email (force update succeeded) or run weekly predictions.
+    Fetch recent news and rebuild the news chunks.
     """
-    force_update_success = context['task_instance'].xcom_pull(key='force_update_success')
-    
-    if force_update_success:
-        logging.info("✅ Force data update succeeded, proceeding to send email")
-        return 'send_success_email'
-    else:
-        logging.info("⚠️ Force data update failed, proceeding to run weekly predictions")
-        return 'run_weekly_predictions'
+    logging.info("🔄 Refreshing news...")
+    return pipeline_stages.refresh_news()
+
+def build_features(**context):
+    """
+    Build the feature frame, skipped when prices and macro data are unchanged.
+    """
+    return pipeline_stages.build_features()
+
+def train_model(**context):
+    """
+    Retrain the model, only when the features changed and the drift check finds it stale.
+    """
+    features = context['task_instance'].xcom_pull(task_ids='build_features')
+    result = pipeline_stages.train(features_path=features['path'])
+    decision = result.get('decision') or {}
+    if decision.get('retrain'):
+        logging.info(f"🔁 Retrained: {'; '.join(decision['reasons'])}")
+    elif decision:
+        logging.info("✅ No drift detected, keeping the saved model")
+    return result
+
+def predict(**context):
+    """
+    Generate and save the predictions for the coming week.
+    """
+    features = context['task_instance'].xcom_pull(task_ids='build_features')
+    result = pipeline_stages.predict(features_path=features['path'])
+    logging.info(f"✅ Predictions {'reused' if result['skipped'] else 'saved'}: {result['path']}")
+    return result
+
+def score_predictions(**context):
+    """
+    Score past predictions against realized closes and check the alert thresholds.
+    """
+    result = pipeline_stages.score()
+    for alert in result['alerts']:
+        logging.warning(f"⚠️ {alert['message']}")
+    return result
 
 def send_success_email(**context):
     """
     Send success email with prediction results.
     """
     try:
-        # Get prediction results from XCom
-        prediction_results = context['task_instance'].xcom_pull(key='prediction_results')
-        force_update_success = context['task_instance'].xcom_pull(key='force_update_success')
+        # XCom only carries artifact references, load the results from the store
+        prices = context['task_instance'].xcom_pull(task_ids='refresh_prices')
+        prediction_stage = context['task_instance'].xcom_pull(task_ids='predict')
+        scoring = context['task_instance'].xcom_pull(task_ids='score_predictions') or {}
         
-        if prediction_results:
+        if prediction_stage and prediction_stage.get('artifact'):
+            prediction_results = ArtifactStore.from_config().get(prediction_stage['artifact'])
             predictions = prediction_results.get("predictions", [])
             metrics = prediction_results.get("model_metrics", {})
             
             # Create email content
-            data_source = "fresh Yahoo Finance data" if force_update_success else "existing data"
+            data_source = "fresh Yahoo Finance data" if prices and prices.get('updated') else "existing data"
             email_content = f"""
             <h2>✅ NOG Weekly Prediction Results</h2>
             <p><strong>Data Source:</strong> {data_source}</p>
-            <p><strong>Model R² Score:</strong> {metrics.get('R2', 'N/A'):.4f}</p>
+            <p><strong>Model R² Score:</strong> {metrics.get('R2', float('nan')):.4f}</p>
             <p><strong>Data Points Used:</strong> {prediction_results.get('data_points', 'N/A')}</p>
             
             <h3>Predictions for Next Week:</h3>
@@ -133,8 +127,13 @@ def send_success_email(**context):
             for pred in predictions:
                 email_content += f"<li><strong>{pred['date']}:</strong> ${pred['predicted_price']:.2f}</li>"
             
+            email_content += "</ul>"
+            if scoring.get('alerts'):
+                email_content += "<h3>⚠️ Live Forecast Alerts:</h3><ul>"
+                for alert in scoring['alerts']:
+                    email_content += f"<li>{alert['message']}</li>"
+                email_content += "</ul>"
             email_content += """
-            </ul>
             <p><em>Generated on: {{ ds }}</em></p>
             """
             
@@ -158,21 +157,45 @@ def send_success_email(**context):
         raise
 
 # Define tasks
-force_data_update_task = PythonOperator(
-    task_id='force_data_update',
-    python_callable=force_data_update,
+refresh_prices_task = PythonOperator(
+    task_id='refresh_prices',
+    python_callable=refresh_prices,
+    dag=dag,
+)
+
+refresh_macro_task = PythonOperator(
+    task_id='refresh_macro',
+    python_callable=refresh_macro,
+    dag=dag,
+)
+
+refresh_news_task = PythonOperator(
+    task_id='refresh_news',
+    python_callable=refresh_news,
+    dag=dag,
+)
+
+build_features_task = PythonOperator(
+    task_id='build_features',
+    python_callable=build_features,
+    dag=dag,
+)
+
+train_model_task = PythonOperator(
+    task_id='train_model',
+    python_callable=train_model,
     dag=dag,
 )
 
-decide_next_step_task = BranchPythonOperator(
-    task_id='decide_next_step',
-    python_callable=decide_next_step,
+predict_task = PythonOperator(
+    task_id='predict',
+    python_callable=predict,
     dag=dag,
 )
 
-run_weekly_predictions_task = PythonOperator(
-    task_id='run_weekly_predictions',
-    python_callable=run_weekly_predictions,
+score_predictions_task = PythonOperator(
+    task_id='score_predictions',
+    python_callable=score_predictions,
     dag=dag,
 )
 
@@ -182,7 +205,6 @@ send_email_task = PythonOperator(
     dag=dag,
 )
 
-# Define task dependencies
-force_data_update_task >> decide_next_step_task
-decide_next_step_task >> [send_email_task, run_weekly_predictions_task]
-run_weekly_predictions_task >> send_email_task 
\ No newline at end of file
+# Define task dependencies: the three refreshes run in parallel
+[refresh_prices_task, refresh_macro_task, refresh_news_task] >> build_features_task
+build_features_task >> train_model_task >> predict_task >> score_predictions_task >> send_email_task
@@ -10,6 +10,7 @@ import os
 sys.path.append('/opt/airflow/project')
 
 from src.models.weekly_predict import WeeklyPredictionPipeline
+from src.utils.artifact_store import ArtifactStore
 import json
 import logging
 
@@ -61,10 +62,11 @@ def run_testing_predictions(**context):
             for pred in predictions:
                 logging.info(f"Prediction for {pred['date']}: ${pred['predicted_price']:.2f}")
             
-            # Store results in XCom for email
-            context['task_instance'].xcom_push(key='prediction_results', value=results)
+            # Store results as an artifact, XCom only carries the reference
+            ref = ArtifactStore.from_config().put('testing_results', results)
+            context['task_instance'].xcom_push(key='prediction_results_ref', value=ref)
             
-            return results
+            return ref
         else:
             error_msg = f"Testing predictions failed: {results.get('error', 'Unknown error')}"
             logging.error(f"❌ {error_msg}")
@@ -79,8 +81,9 @@ def send_testing_email(**context):
     Send testing results email.
     """
     try:
-        # Get prediction results from XCom
-        prediction_results = context['task_instance'].xcom_pull(key='prediction_results')
+        # Get prediction results through the artifact reference in XCom
+        ref = context['task_instance'].xcom_pull(key='prediction_results_ref')
+        prediction_results = ArtifactStore.from_config().get(ref) if ref else None
         
         if prediction_results:
             predictions = prediction_results.get("predictions", [])
@@ -0,0 +1,174 @@
+"""
+Synthetic, offline fixtures for the benchmark suite: OHLCV prices, FRED-style
+macro series, a RAG corpus and a deterministic hashing text encoder that stands
+in for all-MiniLM-L6-v2.
+"""
+import json
+import os
+import re
+import zlib
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+EMBEDDING_DIM = 384
+
+CHUNK_TYPES = ['news', 'financials', 'sec_filing', 'fundamentals']
+
+_VOCABULARY = [
+    'Northern', 'Oil', 'Gas', 'NOG', 'revenue', 'earnings', 'production', 'wells',
+    'Williston', 'Permian', 'acquisition', 'dividend', 'quarterly', 'guidance',
+    'debt', 'equity', 'cash', 'flow', 'hedging', 'crude', 'price', 'growth',
+    'decline', 'strong', 'risk', 'profit', 'loss', 'reserves', 'drilling', 'market',
+]
+
+
+def synthetic_ohlcv(n_rows: int, start: str = '2015-01-02', seed: int = 0) -> pd.DataFrame:
+    """
+    Random-walk OHLCV frame shaped like data/NOG.csv.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start, periods=n_rows)
+    close = 25 * np.exp(np.cumsum(rng.normal(0, 0.02, n_rows)))
+    spread = np.abs(rng.normal(0, 0.01, n_rows)) * close
+    return pd.DataFrame({
+        'Date': dates,
+        'Close': close,
+        'High': close + spread,
+        'Low': close - spread,
+        'Open': close + rng.normal(0, 0.005, n_rows) * close,
+        'Volume': rng.integers(500_000, 5_000_000, n_rows).astype(float),
+    })
+
+
+def synthetic_macro(start, end, seed: int = 0) -> pd.DataFrame:
+    """
+    Daily crude oil prices merged with a monthly fed funds rate, like
+    macroeconomic_indicators() returns.
+    """
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range(start, end)
+    months = pd.date_range(pd.Timestamp(start) - pd.offsets.MonthBegin(1), end, freq='MS')
+    oil = pd.DataFrame({'Date': days, 'Crude_Oil': 70 + np.cumsum(rng.normal(0, 0.8, len(days)))})
+    fed = pd.DataFrame({'Date': months, 'Fed_Funds_Rate': np.clip(2 + np.cumsum(rng.normal(0, 0.1, len(months))), 0, None)})
+    return pd.merge_asof(oil, fed, on='Date', direction='backward').dropna()
+
+
+def synthetic_corpus(n_docs: int, seed: int = 0) -> List[Dict]:
+    """
+    Chunks in the {'text', 'metadata'} format of data/chunks/*.json.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2023-01-02', periods=max(n_docs, 1))
+    corpus = []
+    for i in range(n_docs):
+        chunk_type = CHUNK_TYPES[i % len(CHUNK_TYPES)]
+        sentences = []
+        for _ in range(rng.integers(2, 6)):
+            words = rng.choice(_VOCABULARY, size=rng.integers(6, 18))
+            sentences.append(' '.join(words).capitalize() + '.')
+        amount = f"${rng.integers(10, 900)}.{rng.integers(0, 9)}M"
+        sentences.append(f"Total revenue was {amount} in Q{i % 4 + 1} {2020 + i % 5}.")
+        corpus.append({
+            'text': ' '.join(sentences),
+            'metadata': {
+                'type': chunk_type,
+                'date': dates[i].strftime('%Y-%m-%d'),
+                'ticker': 'NOG',
+            },
+        })
+    return corpus
+
+
+def write_jsonl(chunks: List[Dict], path: str) -> str:
+    """
+    Write chunks as JSONL, the format ChromaDBRetriever.build_index_from_jsonl reads.
+    """
+    with open(path, 'w') as f:
+        for chunk in chunks:
+            f.write(json.dumps(chunk) + '\n')
+    return path
+
+
+class HashingEncoder:
+    """
+    Deterministic bag-of-words encoder with the SentenceTransformer encode() API.
+    Lets the RAG components run without downloading a model.
+    """
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in re.findall(r'\w+', text.lower()):
+            bucket = zlib.crc32(token.encode())
+            vector[bucket % self.dim] += 1.0 if bucket & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def encode(self, sentences, convert_to_tensor: bool = False, **kwargs):
+        single = isinstance(sentences, str)
+        batch = [sentences] if single else list(sentences)
+        embeddings = np.stack([self._embed(text) for text in batch]) if batch else np.zeros((0, self.dim), dtype=np.float32)
+        if single:
+            embeddings = embeddings[0]
+        if convert_to_tensor:
+            import torch
+            return torch.from_numpy(embeddings)
+        return embeddings
+
+
+try:
+    from chromadb.api.types import EmbeddingFunction
+except ImportError:  # chromadb is only needed for the retriever benchmarks
+    EmbeddingFunction = object
+
+
+class HashingEmbeddingFunction(EmbeddingFunction):
+    """
+    Chroma embedding function backed by HashingEncoder.
+    """
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.encoder = HashingEncoder(dim)
+
+    def __call__(self, input):
+        return [row for row in self.encoder.encode(list(input))]
+
+    @staticmethod
+    def name() -> str:
+        return 'nog_hashing_encoder'
+
+    def get_config(self) -> Dict:
+        return {'dim': self.encoder.dim}
+
+    @staticmethod
+    def build_from_config(config: Dict) -> 'HashingEmbeddingFunction':
+        return HashingEmbeddingFunction(config.get('dim', EMBEDDING_DIM))
+
+
+def write_fixture_data_root(root: str, n_rows: int = 500, start: str = '2023-01-02', seed: int = 0) -> str:
+    """
+    Populate a data root for offline runs (PipelineConfig offline mode): NOG.csv,
+    the macro indicator cache and the news articles/chunks files.
+    """
+    os.makedirs(os.path.join(root, 'chunks'), exist_ok=True)
+    prices = synthetic_ohlcv(n_rows, start=start, seed=seed)
+    prices.to_csv(os.path.join(root, 'NOG.csv'), index=False,
+                  columns=['Date', 'Close', 'High', 'Low', 'Open', 'Volume'])
+    synthetic_macro(prices['Date'].iloc[0], prices['Date'].iloc[-1], seed=seed).to_csv(
+        os.path.join(root, 'macro_indicators.csv'), index=False)
+    news = [c for c in synthetic_corpus(max(n_rows // 10, 4), seed=seed) if c['metadata']['type'] == 'news']
+    pd.DataFrame({
+        'date': [c['metadata']['date'] for c in news],
+        'title': [c['text'][:60] for c in news],
+        'description': [c['text'] for c in news],
+        'content': [c['text'] for c in news],
+        'url': [f"https://example.com/news/{i}" for i in range(len(news))],
+        'publisher': 'Fixture Wire',
+    }).to_csv(os.path.join(root, 'NOG_news_2years.csv'), index=False)
+    with open(os.path.join(root, 'chunks', 'enhanced_news_chunks.json'), 'w') as f:
+        json.dump(news, f)
+    return root
@@ -0,0 +1,342 @@
+"""
+Offline benchmark harness for the data, model and RAG hot paths.
+
+Every benchmark runs on synthetic fixtures (see benchmarks/fixtures.py) at several
+data sizes. Results are written as JSON so that runs can be compared:
+
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --quick --only compute_technical_indicators
+    python -m benchmarks.run_benchmarks --baseline benchmarks/results/<previous>.json
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fixtures
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+SIZES = {
+    'rows': [1_000, 5_000, 20_000],
+    'docs': [200, 1_000, 5_000],
+    'queries': [10, 100, 1_000],
+}
+
+QUICK_SIZES = {
+    'rows': [300, 1_000],
+    'docs': [50, 200],
+    'queries': [10, 50],
+}
+
+QUERIES = [
+    "What is the current forecast for NOG?",
+    "Q3 2024 10-Q net income",
+    "How leveraged is Northern Oil and Gas?",
+    "Any recent news about NOG acquisitions?",
+    "What is the latest P/E ratio?",
+    "How was the quarterly production in the Williston basin?",
+    "Tell me about the dividend",
+    "What are the key financials this year?",
+    "Show debt to equity ratio",
+    "How did crude prices affect revenue?",
+]
+
+
+def _price_frames(n_rows: int):
+    prices = fixtures.synthetic_ohlcv(n_rows)
+    macro = fixtures.synthetic_macro(prices['Date'].iloc[0], prices['Date'].iloc[-1])
+    return prices, macro
+
+
+def setup_compute_technical_indicators(n_rows: int) -> Callable:
+    from src.features.feature_engineering import compute_technical_indicators
+    prices, _ = _price_frames(n_rows)
+    return lambda: compute_technical_indicators(prices)
+
+
+def setup_preprocess_data(n_rows: int) -> Callable:
+    from src.data.data_pipeline import preprocess_data
+    prices, macro = _price_frames(n_rows)
+    return lambda: preprocess_data(prices, macro)
+
+
+def setup_train_model(n_rows: int) -> Callable:
+    from src.data.data_pipeline import preprocess_data
+    from src.features.feature_matrix import FeatureMatrix
+    from src.models.xgb import train_model
+    prices, macro = _price_frames(n_rows)
+    matrix = FeatureMatrix.from_frame(preprocess_data(prices, macro))
+    train, _ = matrix.split(test_size=0.2)
+    params = {"n_estimators": 200, "learning_rate": 0.05, "max_depth": 6, "tree_method": "hist"}
+    return lambda: train_model(train.values, train.target, params, feature_names=matrix.feature_columns)
+
+
+def _build_retriever(n_docs: int, hybrid: bool):
+    from src.llm.rag_retrieval import ChromaDBRetriever
+    workdir = tempfile.mkdtemp(prefix='nog_bench_chroma_')
+    corpus_path = fixtures.write_jsonl(fixtures.synthetic_corpus(n_docs), os.path.join(workdir, 'corpus.jsonl'))
+    with contextlib.redirect_stdout(io.StringIO()):
+        retriever = ChromaDBRetriever(collection_name=f"bench_{n_docs}",
+                                      persist_directory=os.path.join(workdir, 'chroma'),
+                                      embedding_function=fixtures.HashingEmbeddingFunction(),
+                                      hybrid=hybrid)
+        retriever.build_index_from_jsonl(corpus_path)
+    return retriever
+
+
+def setup_retriever_search(n_docs: int) -> Callable:
+    retriever = _build_retriever(n_docs, hybrid=False)
+
+    def run():
+        for query in QUERIES:
+            retriever.search(query, top_k=5)
+    run.items = len(QUERIES)
+    return run
+
+
+def setup_hybrid_search(n_docs: int) -> Callable:
+    retriever = _build_retriever(n_docs, hybrid=True)
+
+    def run():
+        for query in QUERIES:
+            retriever.search(query, top_k=5)
+    run.items = len(QUERIES)
+    return run
+
+
+def setup_bm25_search(n_docs: int) -> Callable:
+    from src.llm.bm25_index import BM25Index
+    corpus = fixtures.synthetic_corpus(n_docs)
+    index = BM25Index(tempfile.mkdtemp(prefix='nog_bench_bm25_'))
+    index.upsert([f"doc_{i}" for i in range(n_docs)], [c['text'] for c in corpus], [c['metadata'] for c in corpus])
+
+    def run():
+        for query in QUERIES:
+            index.search(query, top_k=50)
+    run.items = len(QUERIES)
+    return run
+
+
+def setup_rl_training(n_rows: int) -> Callable:
+    from src.rl.agent import QLearningAgent
+    from src.rl.environment import HistoricalTradingEnv
+    from src.rl.run_rl_loop import train_agent
+    prices = fixtures.synthetic_ohlcv(n_rows)['Close'].to_numpy()
+    env = HistoricalTradingEnv(prices, prices * 1.01, n_envs=32,
+                               episode_length=min(252, n_rows // 2), seed=0)
+
+    def run():
+        train_agent(env, QLearningAgent(state_size=3, seed=0))
+    run.items = env.steps * env.n_envs
+    return run
+
+
+def setup_classify_query(n_queries: int) -> Callable:
+    from src.llm.query_classifier import QueryClassifier
+    classifier = QueryClassifier(model=fixtures.HashingEncoder())
+    queries = [QUERIES[i % len(QUERIES)] for i in range(n_queries)]
+
+    def run():
+        for query in queries:
+            classifier.classify_query(query)
+    run.items = n_queries
+    return run
+
+
+def setup_corpus_quality(n_docs: int) -> Callable:
+    from src.utils.rag_data_quality import RAGDataQualityPipeline
+    workdir = tempfile.mkdtemp(prefix='nog_bench_corpus_')
+    corpus = fixtures.synthetic_corpus(n_docs)
+    news_file = os.path.join(workdir, 'news.json')
+    financials_file = os.path.join(workdir, 'financials.json')
+    with open(news_file, 'w') as f:
+        json.dump([c for c in corpus if c['metadata']['type'] == 'news'], f)
+    with open(financials_file, 'w') as f:
+        json.dump([c for c in corpus if c['metadata']['type'] != 'news'], f)
+    pipeline = RAGDataQualityPipeline()
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            pipeline.build_high_quality_corpus(news_file=news_file,
+                                               financials_file=financials_file,
+                                               output_file=os.path.join(workdir, 'corpus.jsonl'),
+                                               target_size=n_docs)
+    run.items = n_docs
+    return run
+
+
+# name -> (size key, setup function returning the callable to time)
+BENCHMARKS = {
+    'compute_technical_indicators': ('rows', setup_compute_technical_indicators),
+    'preprocess_data': ('rows', setup_preprocess_data),
+    'train_model': ('rows', setup_train_model),
+    'retriever_search': ('docs', setup_retriever_search),
+    'hybrid_search': ('docs', setup_hybrid_search),
+    'bm25_search': ('docs', setup_bm25_search),
+    'rl_training': ('rows', setup_rl_training),
+    'classify_query': ('queries', setup_classify_query),
+    'corpus_quality': ('docs', setup_corpus_quality),
+}
+
+
+def time_callable(fn: Callable, repeat: int) -> Dict:
+    """
+    Run fn once to warm up, then time it `repeat` times.
+    """
+    fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    result = {
+        "repeat": repeat,
+        "min_seconds": min(timings),
+        "median_seconds": statistics.median(timings),
+        "mean_seconds": statistics.mean(timings),
+    }
+    items = getattr(fn, 'items', None)
+    if items:
+        result["items"] = items
+        result["median_seconds_per_item"] = result["median_seconds"] / items
+    return result
+
+
+def run_benchmarks(only: Optional[List[str]] = None, quick: bool = False,
+                   repeat: int = 5, sizes: Optional[Dict[str, List[int]]] = None) -> Dict:
+    """
+    Run the selected benchmarks at every configured size.
+
+    Args:
+        only: Benchmark names to run, defaults to all
+        quick: Use the small QUICK_SIZES instead of SIZES
+        repeat: Timed repetitions per benchmark and size
+        sizes: Explicit sizes per size key, overrides quick/SIZES
+
+    Returns:
+        Dictionary with environment info and one record per (benchmark, size)
+    """
+    sizes = sizes or (QUICK_SIZES if quick else SIZES)
+    results = []
+    for name, (size_key, setup) in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        for size in sizes[size_key]:
+            record = {"benchmark": name, "size_key": size_key, "size": size}
+            try:
+                fn = setup(size)
+            except (ImportError, OSError, LookupError) as e:
+                # missing optional dependency or model/data download
+                record.update(status="skipped", reason=f"{type(e).__name__}: {e}")
+                print(f"[WARNING] Skipping {name} ({size_key}={size}): {record['reason']}")
+                results.append(record)
+                break
+            record.update(status="ok", **time_callable(fn, repeat))
+            print(f"[INFO] {name} ({size_key}={size}): median {record['median_seconds'] * 1000:.2f} ms")
+            results.append(record)
+    return {
+        "created_at": datetime.datetime.now().isoformat(),
+        "environment": environment_info(),
+        "results": results,
+    }
+
+
+def environment_info() -> Dict:
+    """
+    Python, platform, package versions and git commit of the run.
+    """
+    packages = {}
+    for package in ['numpy', 'pandas', 'xgboost', 'numba', 'chromadb', 'sentence_transformers']:
+        try:
+            packages[package] = __import__(package).__version__
+        except Exception:
+            packages[package] = None
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except Exception:
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": commit,
+        "packages": packages,
+    }
+
+
+def save_results(report: Dict, output_dir: str = RESULTS_DIR) -> str:
+    """
+    Save a benchmark report as results/<timestamp>.json.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    path = os.path.join(output_dir, f"{stamp}.json")
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def compare_results(report: Dict, baseline: Dict) -> List[Dict]:
+    """
+    Compare median timings against a baseline report.
+
+    Returns:
+        One record per benchmark/size present in both reports, with the
+        speedup (> 1 means the current run is faster)
+    """
+    baseline_medians = {
+        (r["benchmark"], r["size"]): r["median_seconds"]
+        for r in baseline.get("results", []) if r.get("status") == "ok"
+    }
+    comparison = []
+    for r in report["results"]:
+        key = (r["benchmark"], r["size"])
+        if r.get("status") != "ok" or key not in baseline_medians:
+            continue
+        comparison.append({
+            "benchmark": r["benchmark"],
+            "size": r["size"],
+            "baseline_seconds": baseline_medians[key],
+            "current_seconds": r["median_seconds"],
+            "speedup": baseline_medians[key] / r["median_seconds"] if r["median_seconds"] else None,
+        })
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the NOG benchmark suite")
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help="benchmarks to run")
+    parser.add_argument('--quick', action='store_true', help="use small data sizes")
+    parser.add_argument('--repeat', type=int, default=5, help="timed repetitions per size")
+    parser.add_argument('--output', default=RESULTS_DIR, help="directory for the JSON report")
+    parser.add_argument('--baseline', help="previous report to compare against")
+    args = parser.parse_args()
+
+    report = run_benchmarks(only=args.only, quick=args.quick, repeat=args.repeat)
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            report["comparison"] = compare_results(report, json.load(f))
+        print("\n=== Comparison with baseline ===")
+        for row in report["comparison"]:
+            print(f"  {row['benchmark']:<30} {row['size']:>7}  "
+                  f"{row['baseline_seconds'] * 1000:9.2f} ms -> {row['current_seconds'] * 1000:9.2f} ms  "
+                  f"x{row['speedup']:.2f}")
+    path = save_results(report, args.output)
+    print(f"\nResults saved to: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Startup-time benchmark: how long a fresh interpreter needs to import the
+modules Airflow and the CLIs load, and which heavy dependencies they drag in.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --module src.llm.main --repeat 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules importing src.models.weekly_predict (and so parsing the DAGs) must not load
+HEAVY_MODULES = [
+    'gnews', 'bs4', 'matplotlib', 'openai', 'pandas_datareader', 'yfinance',
+    'xgboost', 'sklearn', 'numba', 'nltk', 'sentence_transformers', 'torch', 'chromadb',
+]
+
+DEFAULT_MODULES = ['src.models.weekly_predict']
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(module: str, repeat: int = 5, env: Dict = None) -> Dict:
+    """
+    Import `module` in `repeat` fresh interpreters, without network credentials.
+
+    Returns:
+        Dictionary with min/median import time and the heavy modules that got loaded
+    """
+    env = dict(os.environ if env is None else env)
+    env.pop('OPENAI_API_KEY', None)
+    env['PYTHONPATH'] = PROJECT_ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    timings = []
+    heavy: List[str] = []
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, '-c', _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+                              capture_output=True, text=True, cwd=PROJECT_ROOT, env=env)
+        if proc.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{proc.stderr}")
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        timings.append(result["seconds"])
+        heavy = result["heavy"]
+    return {
+        "module": module,
+        "repeat": repeat,
+        "min_seconds": min(timings),
+        "median_seconds": statistics.median(timings),
+        "heavy_modules_loaded": heavy,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure module import time")
+    parser.add_argument('--module', nargs='+', default=DEFAULT_MODULES)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=None,
+                        help="fail if the median import time exceeds this many seconds")
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.module:
+        result = measure_import(module, repeat=args.repeat)
+        print(f"{module}: median {result['median_seconds'] * 1000:.0f} ms, "
+              f"heavy modules loaded: {result['heavy_modules_loaded'] or 'none'}")
+        if result['heavy_modules_loaded']:
+            failed = True
+        if args.budget is not None and result['median_seconds'] > args.budget:
+            print(f"  over budget of {args.budget:.2f}s")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Project root is the directory that contains src/ and config/
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CONFIG_PATH = PROJECT_ROOT / 'config' / 'prediction_config.json'
+
+# Environment variables that override the JSON config
+ENV_CONFIG_PATH = 'NOG_CONFIG_PATH'
+ENV_DATA_ROOT = 'NOG_DATA_ROOT'
+ENV_MODEL_ROOT = 'NOG_MODEL_ROOT'
+ENV_OFFLINE = 'NOG_OFFLINE'
+
+_TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+
+class PipelineConfig:
+    """
+    Central configuration loaded from config/prediction_config.json.
+    Resolves every data, model and corpus location from two roots so the
+    pipeline can run from the Airflow container, a local checkout, a fast
+    local disk/tmpfs or a fixture directory without code changes.
+    """
+
+    def __init__(self, settings: Dict, project_root: Optional[str] = None,
+                 data_root: Optional[str] = None, model_root: Optional[str] = None,
+                 offline: Optional[bool] = None):
+        """
+        Args:
+            settings: Parsed prediction_config.json
+            project_root: Base for relative paths, defaults to the repository root
+            data_root: Directory replacing paths.data_root (data files, news, corpus, chroma index)
+            model_root: Directory replacing paths.model_root (saved models)
+            offline: Use only local files, no Yahoo/FRED/news requests
+        """
+        self.settings = settings
+        self.project_root = Path(project_root) if project_root else PROJECT_ROOT
+        paths = settings.get('paths', {})
+        self._default_roots = {
+            'data_root': self._absolute(paths.get('data_root', 'data')),
+            'model_root': self._absolute(paths.get('model_root', 'saved_models')),
+        }
+        self.data_root = self._absolute(data_root) if data_root else self._default_roots['data_root']
+        self.model_root = self._absolute(model_root) if model_root else self._default_roots['model_root']
+        self.offline = bool(settings.get('data', {}).get('offline', False)) if offline is None else offline
+
+    @classmethod
+    def load(cls, path: Optional[str] = None, **overrides) -> 'PipelineConfig':
+        """
+        Load the config file, applying NOG_* environment variables and keyword overrides.
+
+        Args:
+            path: Config file, defaults to $NOG_CONFIG_PATH or config/prediction_config.json
+            **overrides: project_root, data_root, model_root or offline
+
+        Returns:
+            PipelineConfig
+        """
+        path = path or os.getenv(ENV_CONFIG_PATH) or DEFAULT_CONFIG_PATH
+        with open(path, 'r') as f:
+            settings = json.load(f)
+        overrides.setdefault('data_root', os.getenv(ENV_DATA_ROOT) or None)
+        overrides.setdefault('model_root', os.getenv(ENV_MODEL_ROOT) or None)
+        if overrides.get('offline') is None and os.getenv(ENV_OFFLINE) is not None:
+            overrides['offline'] = os.getenv(ENV_OFFLINE).strip().lower() in _TRUE_VALUES
+        return cls(settings, **overrides)
+
+    def _absolute(self, path) -> Path:
+        path = Path(path)
+        return path if path.is_absolute() else self.project_root / path
+
+    def path(self, key: str) -> str:
+        """
+        Resolve a location from the "paths" section.
+        Paths below the configured data/model root are rebased onto the active root.
+
+        Args:
+            key: Key in the "paths" section, e.g. "stock_csv" or "model_path"
+
+        Returns:
+            Absolute path as a string
+        """
+        try:
+            configured = self.settings['paths'][key]
+        except KeyError:
+            raise KeyError(f"Unknown path '{key}' in pipeline config")
+        resolved = self._absolute(configured)
+        for root_name, active_root in (('data_root', self.data_root), ('model_root', self.model_root)):
+            default_root = self._default_roots[root_name]
+            if active_root != default_root and resolved.is_relative_to(default_root):
+                return str(active_root / resolved.relative_to(default_root))
+        return str(resolved)
+
+    def get(self, section: str, key: str, default: Any = None) -> Any:
+        """Read a value from a config section."""
+        return self.settings.get(section, {}).get(key, default)
+
+    @property
+    def ticker(self) -> str:
+        return self.get('data', 'ticker', 'NOG')
+
+    @property
+    def start_date(self) -> str:
+        return self.get('data', 'start_date', '2023-04-27')
+
+    @property
+    def model_parameters(self) -> Dict:
+        return dict(self.settings.get('model', {}).get('parameters', {}))
+
+
+_config: Optional[PipelineConfig] = None
+
+
+def get_config() -> PipelineConfig:
+    """
+    Get the process-wide config, loading it on first use.
+
+    Returns:
+        PipelineConfig
+    """
+    global _config
+    if _config is None:
+        _config = PipelineConfig.load()
+    return _config
+
+
+def set_config(config: Optional[PipelineConfig]) -> None:
+    """
+    Replace the process-wide config, e.g. to point a worker at its own data root.
+    Passing None makes the next get_config() reload from disk and environment.
+    """
+    global _config
+    _config = config
@@ -2,15 +2,13 @@ import datetime
 from datetime import date, timedelta
 from dateutil.relativedelta import relativedelta
 from src.features.feature_engineering import compute_technical_indicators, macroeconomic_indicators
-from src.data.news_ingest import run_news_data_pipeline
+from src.config import get_config
 import math
+import os
 import numpy as np
 import pandas as pd
-import pandas_datareader.data as web
-import ta
 import warnings
 warnings.filterwarnings("ignore")
-import yfinance as yf
 
 sentiment_map = {'Positive': 1, 'Neutral': 0, 'Negative': -1}
 
@@ -26,6 +24,7 @@ def get_data_from_yahoo(ticker, startdate, enddate):
     Returns:
         pd.DataFrame: historical stock data.
     """
+    import yfinance as yf
     df = yf.download(ticker, start=startdate, end=enddate)
     df = process_data_from_yahoo(df)
     return df
@@ -74,35 +73,108 @@ def preprocess_data(main_df, macro_df):
     macro_df['Date'] = pd.to_datetime(macro_df['Date'], format='mixed')
     # Merge the two dataframes on the 'Date' column
     merged_data = pd.merge_asof(tech_data, macro_df, on='Date', direction='backward')
-    merged_data.fillna(method='ffill', inplace=True)  # Forward fill any missing values
+    merged_data.ffill(inplace=True)  # Forward fill any missing values
     merged_data.dropna(inplace=True)  # Drop any remaining NaN values
     return merged_data
 
-def run_data_pipeline(ticker='NOG', csvflag=True):
+def load_macro_data(startdate, enddate, config=None):
     """
-    Main func to run the data pipeline.
+    Macroeconomic indicators for the date range. Fetched from FRED and merged
+    into the local cache, or read from the cache when running offline.
     Args:
-        ticker (str): The stock ticker symbol.
         startdate (str): The start date for fetching data.
         enddate (str): The end date for fetching data.
+        config (PipelineConfig): pipeline config, defaults to get_config().
+    Returns:
+        pd.DataFrame: macroeconomic indicators.
+    """
+    config = config or get_config()
+    cache_path = config.path('macro_cache_path')
+    if config.offline:
+        return read_macro_cache(cache_path, startdate, enddate)
+    macro_df = macroeconomic_indicators(startdate, enddate)
+    update_macro_cache(cache_path, macro_df)
+    return macro_df
+
+def update_macro_cache(cache_path, macro_df):
+    """
+    Merge freshly fetched indicators into the local cache. Incremental runs
+    only fetch the days after the saved prices, so the cache must keep the
+    older rows; fetched rows replace cached ones of the same date.
+    Args:
+        cache_path (str): CSV read by read_macro_cache.
+        macro_df (pd.DataFrame): fetched indicators with a 'Date' column.
+    """
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    if os.path.exists(cache_path):
+        cached = pd.read_csv(cache_path)
+        cached['Date'] = pd.to_datetime(cached['Date'], format='mixed')
+        fetched = macro_df.assign(Date=pd.to_datetime(macro_df['Date'], format='mixed'))
+        macro_df = (pd.concat([cached, fetched])
+                    .drop_duplicates('Date', keep='last')
+                    .sort_values('Date'))
+    macro_df.to_csv(cache_path, index=False)
+
+def read_macro_cache(cache_path, startdate, enddate):
+    """
+    Macroeconomic indicators for the date range from the local cache.
+    Args:
+        cache_path (str): CSV written by load_macro_data.
+        startdate (str): The start date.
+        enddate (str): The end date.
+    Returns:
+        pd.DataFrame: macroeconomic indicators.
+    """
+    macro_df = pd.read_csv(cache_path)
+    macro_df['Date'] = pd.to_datetime(macro_df['Date'], format='mixed')
+    return macro_df[(macro_df['Date'] >= pd.to_datetime(startdate)) &
+                    (macro_df['Date'] <= pd.to_datetime(enddate))].reset_index(drop=True)
+
+def append_yahoo_data(ticker, stock_csv):
+    """
+    Append the days after the last row of the saved CSV from Yahoo Finance.
+    Args:
+        ticker (str): The stock ticker symbol.
+        stock_csv (str): Saved price CSV, rewritten with the new rows.
+    Returns:
+        tuple: (combined stock data, first fetched date)
+    """
+    data = pd.read_csv(stock_csv)
+    startdate = (pd.to_datetime(data['Date'].iloc[-1]) + timedelta(days=1)).date()
+    df = get_data_from_yahoo(ticker, startdate, datetime.date.today())
+    stock_df = pd.concat([data, df])
+    stock_df.to_csv(stock_csv, index=False, encoding='utf-8-sig', sep=',', columns=['Date','Close','High','Low','Open','Volume'])
+    return stock_df, startdate
+
+def run_data_pipeline(ticker='NOG', csvflag=True, config=None):
+    """
+    Main func to run the data pipeline.
+    Args:
+        ticker (str): The stock ticker symbol.
+        csvflag (bool): use the saved CSV only (True) or append fresh Yahoo Finance data (False).
+        config (PipelineConfig): pipeline config with data locations, defaults to get_config().
+            In offline mode no network requests are made.
     Returns:
         pd.DataFrame: Preprocessed data with technical and macroeconomic indicators.
     """
+    config = config or get_config()
+    stock_csv = config.path('stock_csv')
     # fetch stock data
-    data = pd.read_csv('/opt/airflow/project/data/NOG.csv')
-    run_news_data_pipeline()
+    data = pd.read_csv(stock_csv)
+    if config.offline:
+        csvflag = True
+    else:
+        # news_ingest pulls in gnews, only import it when news is fetched
+        from src.data.news_ingest import run_news_data_pipeline
+        run_news_data_pipeline(config=config)
     if csvflag:
-        startdate = '2023-04-27'
+        startdate = config.start_date
         enddate = pd.to_datetime(data['Date'].iloc[-1]).date()
-        stock_df = get_data_from_csv('/opt/airflow/project/data/NOG.csv', startdate, enddate)
+        stock_df = get_data_from_csv(stock_csv, startdate, enddate)
     else:
-        today = datetime.date.today()
-        startdate = (pd.to_datetime(data['Date'].iloc[-1]) + timedelta(days=1)).date()
-        enddate = today
-        df = get_data_from_yahoo(ticker, startdate, enddate)
-        stock_df = pd.concat([data, df])
-        stock_df.to_csv('/opt/airflow/project/data/NOG.csv', index=False, encoding='utf-8-sig', sep=',', columns=['Date','Close','High','Low','Open','Volume'])
-    macro_df = macroeconomic_indicators(startdate, enddate)
+        enddate = datetime.date.today()
+        stock_df, startdate = append_yahoo_data(ticker, stock_csv)
+    macro_df = load_macro_data(startdate, enddate, config=config)
     processed_data = preprocess_data(stock_df, macro_df)
     return processed_data
 
@@ -1,11 +1,10 @@
-from gnews import GNews
+import os
 import pandas as pd
 import time
 from typing import List
-import requests
-from bs4 import BeautifulSoup
 import re
 from datetime import datetime
+from src.config import get_config
 
 queries = [
     "Northern Oil and Gas",
@@ -89,6 +88,7 @@ def fetch_nog_news(period: str = '2y', delay: float = 1.0) -> pd.DataFrame:
     Returns:
         pd.DataFrame: DataFrame containing deduplicated news articles with enhanced content.
     """
+    from gnews import GNews
     gnews = GNews(language='en', country='US', period=period, max_results=100)
     
     for query in queries:
@@ -170,19 +170,31 @@ URL: {row['url']}
     
     return chunks
 
-def run_news_data_pipeline():
-    """Enhanced news data pipeline that creates better chunks for RAG."""
+def run_news_data_pipeline(config=None):
+    """Enhanced news data pipeline that creates better chunks for RAG.
+    
+    Args:
+        config: PipelineConfig with the news locations, defaults to get_config().
+            In offline mode the saved articles are re-chunked without fetching.
+    """
+    config = config or get_config()
+    news_csv = config.path('news_csv')
+    chunks_path = config.path('news_chunks_path')
     try:
         # Load existing news data
-        old_news_df = pd.read_csv('/opt/airflow/project/data/NOG_news_2years.csv')
+        old_news_df = pd.read_csv(news_csv)
         print(f"[INFO] Loaded {len(old_news_df)} existing news articles")
     except FileNotFoundError:
         old_news_df = pd.DataFrame()
         print("[INFO] No existing news file found, starting fresh")
     
     # Fetch new news
-    updated_news_df = fetch_nog_news(period='7d')
-    print(f"[INFO] Fetched {len(updated_news_df)} new news articles")
+    if config.offline:
+        updated_news_df = pd.DataFrame()
+        print("[INFO] Offline mode, skipping news fetch")
+    else:
+        updated_news_df = fetch_nog_news(period='7d')
+        print(f"[INFO] Fetched {len(updated_news_df)} new news articles")
     
     # Combine old and new data
     if not old_news_df.empty:
@@ -192,15 +204,16 @@ def run_news_data_pipeline():
         data = updated_news_df
     
     # Save the raw data
-    data.to_csv('/opt/airflow/project/data/NOG_news_2years.csv', index=False)
-    print(f"[INFO] Saved {len(data)} total news articles to data/NOG_news_2years.csv")
+    os.makedirs(os.path.dirname(chunks_path), exist_ok=True)
+    data.to_csv(news_csv, index=False)
+    print(f"[INFO] Saved {len(data)} total news articles to {news_csv}")
 
     # Create enhanced chunks
     enhanced_chunks = create_enhanced_news_chunks(data)
     
     # Save enhanced chunks
     import json
-    with open('/opt/airflow/project/data/chunks/enhanced_news_chunks.json', 'w') as f:
+    with open(chunks_path, 'w') as f:
         json.dump(enhanced_chunks, f, indent=2)
     
     print(f"[INFO] Created {len(enhanced_chunks)} enhanced news chunks")
@@ -1,7 +1,6 @@
 import pandas as pd
 import numpy as np 
-import pandas_datareader.data as web
-import ta
+from src.features.indicator_kernels import INDICATOR_COLUMNS, compute_indicators
 import warnings
 warnings.filterwarnings("ignore")
 # OpenAI client removed since classify_news_sentiment is not used
@@ -14,25 +13,13 @@ def compute_technical_indicators(df):
     Returns:
         pd.DataFrame: dataframe with technical indicators.
     """
-    # Calculate moving averages
-    df['ma_10'] = pd.DataFrame(df['Close'].rolling(window=10).mean())
-    df['m_50'] = pd.DataFrame(df['Close'].rolling(window=50).mean())
-    # daily change
-    df['daily_change'] = df['Close'].pct_change()
-    # volatility
-    df['volatility_10'] = df['Close'].rolling(window=10).std()
-    # RSI 
-    df['RSI_14'] = calculate_rsi(df['Close'], window=14)
-    # Bollinger Bands
-    bb_indicator = ta.volatility.BollingerBands(close=df['Close'], window=20)
-    df['bb_high'] = bb_indicator.bollinger_hband()
-    df['bb_low'] = bb_indicator.bollinger_lband()
-    # Momentum
-    df['Momentum_10'] = df['Close'] - df['Close'].shift(10)  
-    # Volume-Weighted Average Price (VWAP) = (Cumulative Sum of (Price * Volume)) / (Cumulative Sum of Volume)
-    df['Cumulative_Price_Volume'] = (df['Close'] * df['Volume']).cumsum()
-    df['Cumulative_Volume'] = df['Volume'].cumsum()
-    df['VWAP'] = df['Cumulative_Price_Volume'] / df['Cumulative_Volume']
+    # All rolling indicators are computed in a single pass over the close/volume
+    # arrays, see src/features/indicator_kernels.py
+    close = df['Close'].to_numpy(dtype=np.float64)
+    volume = df['Volume'].to_numpy(dtype=np.float64)
+    indicators = compute_indicators(close, volume)
+    for name, values in zip(INDICATOR_COLUMNS, indicators):
+        df[name] = values
     return df
 
 def calculate_rsi(series, window=14):
@@ -65,7 +52,7 @@ def macroeconomic_indicators(startime, endtime):
     oil_prices = fetch_oil_prices(startime, endtime)
     fed_funds = fetch_fed_funds(startime, endtime)
     macro_data = pd.merge_asof(oil_prices, fed_funds, on='Date', direction='backward')
-    macro_data.fillna(method='ffill', inplace=True) # Forward fill any missing values
+    macro_data.ffill(inplace=True) # Forward fill any missing values
     macro_data.dropna(inplace=True) 
     return macro_data
     
@@ -75,6 +62,7 @@ def fetch_oil_prices(starttime, endtime):
     Returns:
         pd.DataFrame: Oil prices data.
     """
+    import pandas_datareader.data as web
     oil_prices = web.DataReader('DCOILWTICO', 'fred', starttime, endtime)
     oil_prices.reset_index(inplace=True)
     oil_prices.rename(columns={'DATE': 'Date', 'DCOILWTICO': 'Crude_Oil'}, inplace=True)
@@ -88,6 +76,7 @@ def fetch_fed_funds(starttime, endtime):
     Returns:
         pd.DataFrame: Federal Funds Rate data.
     """
+    import pandas_datareader.data as web
     fed_funds = web.DataReader('FEDFUNDS', 'fred', starttime, endtime)
     fed_funds.reset_index(inplace=True)
     fed_funds.rename(columns={'DATE': 'Date', 'FEDFUNDS': 'Fed_Funds_Rate'}, inplace=True)
@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+from typing import List, Optional, Sequence, Tuple
+
+NON_FEATURE_COLUMNS = ('Date', 'Close', 'Ticker')
+
+
+class FeatureMatrix:
+    """
+    Model-ready features held in a single C-contiguous float32 buffer.
+    Rows are observations in chronological order, columns follow feature_columns.
+    Splits and row selections are views into the same buffer, never copies.
+    """
+
+    def __init__(self, values: np.ndarray, feature_columns: Sequence[str],
+                 target: Optional[np.ndarray] = None,
+                 dates: Optional[np.ndarray] = None,
+                 tickers: Optional[np.ndarray] = None):
+        """
+        Args:
+            values: float32 array of shape (n_rows, n_features)
+            feature_columns: Column name for every feature
+            target: Optional target values, one per row
+            dates: Optional datetime64 array, one per row
+            tickers: Optional ticker label per row for multi-ticker matrices
+        """
+        if values.ndim != 2 or values.shape[1] != len(feature_columns):
+            raise ValueError("values must be 2-D with one column per feature")
+        self.values = values
+        self.feature_columns = list(feature_columns)
+        self.target = target
+        self.dates = dates
+        self.tickers = tickers
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, feature_columns: Optional[List[str]] = None,
+                   target_column: Optional[str] = 'Close',
+                   ticker_column: str = 'Ticker') -> 'FeatureMatrix':
+        """
+        Build a feature matrix from a processed data frame.
+        Every feature column is copied exactly once, straight into the float32
+        buffer, and missing values are forward/backward filled in place. For
+        multi-ticker frames the fill never crosses from one ticker to another.
+
+        Args:
+            df: Processed data, sorted by date (then ticker)
+            feature_columns: Columns to use, defaults to everything but Date/Close/Ticker
+            target_column: Target column, or None for inference-only matrices
+            ticker_column: Column identifying the ticker of each row, if present
+
+        Returns:
+            FeatureMatrix
+        """
+        if feature_columns is None:
+            feature_columns = [col for col in df.columns if col not in NON_FEATURE_COLUMNS]
+        values = np.empty((len(df), len(feature_columns)), dtype=np.float32, order='C')
+        for j, col in enumerate(feature_columns):
+            values[:, j] = df[col].to_numpy(dtype=np.float32, na_value=np.nan)
+
+        tickers = df[ticker_column].to_numpy() if ticker_column in df.columns else None
+        if tickers is None:
+            _fill_missing_inplace(values)
+        else:
+            for ticker in pd.unique(tickers):
+                rows = np.flatnonzero(tickers == ticker)
+                block = values[rows]
+                _fill_missing_inplace(block)
+                values[rows] = block
+
+        target = None
+        if target_column is not None and target_column in df.columns:
+            target = df[target_column].to_numpy(dtype=np.float64)
+        dates = None
+        if 'Date' in df.columns:
+            dates = df['Date']
+            # parsing goes through strings, skip it for columns that already hold datetimes
+            if not pd.api.types.is_datetime64_any_dtype(dates):
+                dates = pd.to_datetime(dates, format='mixed')
+            dates = dates.to_numpy()
+        return cls(values, feature_columns, target=target, dates=dates, tickers=tickers)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.values.shape
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def rows(self, start: Optional[int] = None, stop: Optional[int] = None) -> 'FeatureMatrix':
+        """
+        Slice rows as a view sharing the underlying buffer.
+        """
+        sl = slice(start, stop)
+        return FeatureMatrix(
+            self.values[sl],
+            self.feature_columns,
+            target=self.target[sl] if self.target is not None else None,
+            dates=self.dates[sl] if self.dates is not None else None,
+            tickers=self.tickers[sl] if self.tickers is not None else None,
+        )
+
+    def split(self, test_size: float = 0.2) -> Tuple['FeatureMatrix', 'FeatureMatrix']:
+        """
+        Chronological train/test split, equivalent to train_test_split(shuffle=False).
+        When dates are known the cut is moved back so that all tickers of a date
+        end up on the same side.
+
+        Args:
+            test_size: Proportion of rows for testing
+
+        Returns:
+            Tuple of (train, test) views
+        """
+        n_rows = len(self)
+        n_test = int(np.ceil(n_rows * test_size))
+        cut = n_rows - n_test
+        if self.tickers is not None and self.dates is not None and 0 < cut < n_rows:
+            cut = int(np.searchsorted(self.dates, self.dates[cut], side='left'))
+        return self.rows(stop=cut), self.rows(start=cut)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Wrap the buffer in a DataFrame with the feature column names.
+        """
+        return pd.DataFrame(self.values, columns=self.feature_columns, copy=False)
+
+
+def _fill_missing_inplace(values: np.ndarray) -> None:
+    """
+    Forward fill then backward fill NaNs column by column, in place.
+    Only columns that actually contain NaNs are touched.
+    """
+    n_rows = values.shape[0]
+    if n_rows == 0:
+        return
+    positions = np.arange(n_rows)
+    for j in np.flatnonzero(np.isnan(values).any(axis=0)):
+        column = values[:, j]
+        valid = ~np.isnan(column)
+        if not valid.any():
+            continue
+        # index of the last valid value at or before each row
+        last = np.maximum.accumulate(np.where(valid, positions, 0))
+        # rows before the first valid value take the first valid value
+        last[:np.argmax(valid)] = np.argmax(valid)
+        column[:] = column[last]
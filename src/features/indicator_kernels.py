@@ -0,0 +1,326 @@
+import numpy as np
+
+# Output rows of the indicator buffer, in the order they are written to the frame
+INDICATOR_COLUMNS = (
+    'ma_10',
+    'm_50',
+    'daily_change',
+    'volatility_10',
+    'RSI_14',
+    'bb_high',
+    'bb_low',
+    'Momentum_10',
+    'Cumulative_Price_Volume',
+    'Cumulative_Volume',
+    'VWAP',
+)
+
+MA_SHORT = 10
+MA_LONG = 50
+VOLATILITY_WINDOW = 10
+RSI_WINDOW = 14
+BB_WINDOW = 20
+BB_WINDOW_DEV = 2.0
+MOMENTUM_WINDOW = 10
+# rows between exact recomputations of the Welford window statistics
+RESYNC_EVERY = 256
+
+
+def allocate_indicator_buffer(n_rows):
+    """
+    Allocate the output buffer for compute_indicators.
+    Args:
+        n_rows (int): number of rows in the price history.
+    Returns:
+        np.ndarray: float64 array of shape (len(INDICATOR_COLUMNS), n_rows); every
+            indicator is a contiguous row so it can be handed to pandas as a column.
+    """
+    return np.empty((len(INDICATOR_COLUMNS), n_rows), dtype=np.float64)
+
+
+def _fused_kernel(close, volume, out):
+    """
+    Single pass over close/volume computing every rolling indicator.
+    Rolling windows keep running sums plus a count of missing values so that a
+    NaN only invalidates the windows it falls in, mirroring pandas' rolling().
+    The volatility and Bollinger windows keep a Welford mean and sum of squared
+    deviations instead of raw sums of squares, which cancel catastrophically
+    when the price level is large against its spread; every RESYNC_EVERY rows
+    both are recomputed from the window so rounding cannot build up.
+    """
+    n = close.shape[0]
+    # count of finite values, mean and sum of squared deviations per window
+    n10 = 0
+    mean10 = 0.0
+    m2_10 = 0.0
+    nan10 = 0
+    s50 = 0.0
+    nan50 = 0
+    n20 = 0
+    mean20 = 0.0
+    m2_20 = 0.0
+    nan20 = 0
+    gain_sum = 0.0
+    loss_sum = 0.0
+    cum_pv = 0.0
+    cum_v = 0.0
+    prev = np.nan
+    for i in range(n):
+        x = close[i]
+        finite = not np.isnan(x)
+
+        # add the new observation to every window
+        if finite:
+            n10 += 1
+            d = x - mean10
+            mean10 += d / n10
+            m2_10 += d * (x - mean10)
+            s50 += x
+            n20 += 1
+            d = x - mean20
+            mean20 += d / n20
+            m2_20 += d * (x - mean20)
+        else:
+            nan10 += 1
+            nan50 += 1
+            nan20 += 1
+
+        # RSI: pandas' where() maps NaN deltas to zero gain and zero loss
+        delta = x - prev
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        gain_sum += gain
+        loss_sum += loss
+
+        # drop the observation leaving each window
+        if i >= MA_SHORT:
+            old = close[i - MA_SHORT]
+            if np.isnan(old):
+                nan10 -= 1
+            elif n10 == 1:
+                n10, mean10, m2_10 = 0, 0.0, 0.0
+            else:
+                n10 -= 1
+                d = old - mean10
+                mean10 -= d / n10
+                m2_10 -= d * (old - mean10)
+        if i >= MA_LONG:
+            old = close[i - MA_LONG]
+            if np.isnan(old):
+                nan50 -= 1
+            else:
+                s50 -= old
+        if i >= BB_WINDOW:
+            old = close[i - BB_WINDOW]
+            if np.isnan(old):
+                nan20 -= 1
+            elif n20 == 1:
+                n20, mean20, m2_20 = 0, 0.0, 0.0
+            else:
+                n20 -= 1
+                d = old - mean20
+                mean20 -= d / n20
+                m2_20 -= d * (old - mean20)
+        if i >= RSI_WINDOW:
+            old_delta = close[i - RSI_WINDOW] - (close[i - RSI_WINDOW - 1] if i > RSI_WINDOW else np.nan)
+            if old_delta > 0:
+                gain_sum -= old_delta
+            elif old_delta < 0:
+                loss_sum += old_delta
+
+        if i % RESYNC_EVERY == RESYNC_EVERY - 1:
+            if i >= MA_SHORT - 1 and nan10 == 0:
+                mean10 = 0.0
+                for j in range(i - MA_SHORT + 1, i + 1):
+                    mean10 += close[j]
+                mean10 /= MA_SHORT
+                m2_10 = 0.0
+                for j in range(i - MA_SHORT + 1, i + 1):
+                    m2_10 += (close[j] - mean10) ** 2
+            if i >= BB_WINDOW - 1 and nan20 == 0:
+                mean20 = 0.0
+                for j in range(i - BB_WINDOW + 1, i + 1):
+                    mean20 += close[j]
+                mean20 /= BB_WINDOW
+                m2_20 = 0.0
+                for j in range(i - BB_WINDOW + 1, i + 1):
+                    m2_20 += (close[j] - mean20) ** 2
+
+        # moving averages and volatility
+        if i >= MA_SHORT - 1 and nan10 == 0:
+            out[0, i] = mean10
+            var10 = m2_10 / (MA_SHORT - 1)
+            out[3, i] = np.sqrt(var10) if var10 > 0.0 else 0.0
+        else:
+            out[0, i] = np.nan
+            out[3, i] = np.nan
+        out[1, i] = s50 / MA_LONG if i >= MA_LONG - 1 and nan50 == 0 else np.nan
+
+        # daily change
+        out[2, i] = x / prev - 1.0 if i > 0 else np.nan
+
+        # RSI
+        if i >= RSI_WINDOW - 1:
+            avg_gain = gain_sum / RSI_WINDOW
+            avg_loss = loss_sum / RSI_WINDOW
+            if avg_loss > 0.0:
+                out[4, i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+            elif avg_gain > 0.0:
+                out[4, i] = 100.0
+            else:
+                out[4, i] = np.nan
+        else:
+            out[4, i] = np.nan
+
+        # Bollinger bands (population std, as in ta.volatility.BollingerBands)
+        if i >= BB_WINDOW - 1 and nan20 == 0:
+            var20 = m2_20 / BB_WINDOW
+            std20 = np.sqrt(var20) if var20 > 0.0 else 0.0
+            out[5, i] = mean20 + BB_WINDOW_DEV * std20
+            out[6, i] = mean20 - BB_WINDOW_DEV * std20
+        else:
+            out[5, i] = np.nan
+            out[6, i] = np.nan
+
+        # momentum
+        out[7, i] = x - close[i - MOMENTUM_WINDOW] if i >= MOMENTUM_WINDOW else np.nan
+
+        # VWAP, skipping missing values like pandas' cumsum()
+        v = volume[i]
+        pv = x * v
+        if np.isnan(pv):
+            out[8, i] = np.nan
+        else:
+            cum_pv += pv
+            out[8, i] = cum_pv
+        if np.isnan(v):
+            out[9, i] = np.nan
+        else:
+            cum_v += v
+            out[9, i] = cum_v
+        out[10, i] = out[8, i] / out[9, i]
+
+        prev = x
+    return out
+
+
+def _rolling_into(close, window, out_row, ddof=None):
+    """
+    Rolling mean (ddof=None) or standard deviation over a strided window view,
+    written into out_row. The view itself is zero-copy.
+    """
+    out_row[:window - 1] = np.nan
+    if close.shape[0] < window:
+        return
+    windows = np.lib.stride_tricks.sliding_window_view(close, window)
+    if ddof is None:
+        np.mean(windows, axis=1, out=out_row[window - 1:])
+    else:
+        np.var(windows, axis=1, ddof=ddof, out=out_row[window - 1:])
+        np.sqrt(out_row[window - 1:], out=out_row[window - 1:])
+
+
+def _numpy_kernel(close, volume, out):
+    """
+    Vectorized fallback used when numba is not installed.
+    """
+    n = close.shape[0]
+    ma10, ma50, change, vol10, rsi, bb_high, bb_low, momentum, cum_pv, cum_v, vwap = out
+
+    _rolling_into(close, MA_SHORT, ma10)
+    _rolling_into(close, MA_LONG, ma50)
+    _rolling_into(close, VOLATILITY_WINDOW, vol10, ddof=1)
+
+    change[0] = np.nan
+    np.divide(close[1:], close[:-1], out=change[1:])
+    change[1:] -= 1.0
+
+    # RSI: reuse the momentum row as scratch space for the deltas
+    delta = momentum
+    delta[0] = 0.0
+    np.subtract(close[1:], close[:-1], out=delta[1:])
+    np.nan_to_num(delta, copy=False, nan=0.0)
+    np.clip(delta, 0.0, None, out=bb_high)
+    np.clip(delta, None, 0.0, out=bb_low)
+    np.negative(bb_low, out=bb_low)
+    _rolling_into(bb_high, RSI_WINDOW, cum_pv)
+    _rolling_into(bb_low, RSI_WINDOW, cum_v)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(cum_pv, cum_v, out=rsi)
+        rsi += 1.0
+        np.divide(100.0, rsi, out=rsi)
+        np.subtract(100.0, rsi, out=rsi)
+
+    # Bollinger bands: mean in bb_high, population std in bb_low
+    _rolling_into(close, BB_WINDOW, bb_high)
+    _rolling_into(close, BB_WINDOW, bb_low, ddof=0)
+    bb_low *= BB_WINDOW_DEV
+    np.subtract(bb_high, bb_low, out=vwap)
+    bb_high += bb_low
+    bb_low[:] = vwap
+
+    momentum[:MOMENTUM_WINDOW] = np.nan
+    if n > MOMENTUM_WINDOW:
+        np.subtract(close[MOMENTUM_WINDOW:], close[:-MOMENTUM_WINDOW], out=momentum[MOMENTUM_WINDOW:])
+
+    # VWAP: cumulative sums skip missing values like pandas' cumsum()
+    np.multiply(close, volume, out=cum_pv)
+    missing_pv = np.isnan(cum_pv)
+    np.nan_to_num(cum_pv, copy=False, nan=0.0)
+    np.cumsum(cum_pv, out=cum_pv)
+    cum_pv[missing_pv] = np.nan
+    cum_v[:] = volume
+    missing_v = np.isnan(cum_v)
+    np.nan_to_num(cum_v, copy=False, nan=0.0)
+    np.cumsum(cum_v, out=cum_v)
+    cum_v[missing_v] = np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(cum_pv, cum_v, out=vwap)
+    return out
+
+
+_jitted_kernel = None
+
+
+def _get_jitted_kernel():
+    """
+    Compile _fused_kernel with numba on first use. numba is optional and slow to
+    import, so it is only loaded when indicators are actually computed.
+    Returns:
+        The jitted kernel, or None when numba is not installed.
+    """
+    global _jitted_kernel
+    if _jitted_kernel is None:
+        try:
+            from numba import njit
+        except ImportError:  # numba is optional, fall back to the NumPy kernels
+            _jitted_kernel = False
+        else:
+            _jitted_kernel = njit(cache=True, nogil=True, error_model='numpy')(_fused_kernel)
+    return _jitted_kernel or None
+
+
+def compute_indicators(close, volume, out=None):
+    """
+    Compute every technical indicator in one pass over the price history.
+    Args:
+        close (np.ndarray): closing prices.
+        volume (np.ndarray): traded volume, same length as close.
+        out (np.ndarray): optional buffer from allocate_indicator_buffer to write into.
+    Returns:
+        np.ndarray: indicator buffer, one row per entry of INDICATOR_COLUMNS.
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    volume = np.ascontiguousarray(volume, dtype=np.float64)
+    if close.shape != volume.shape or close.ndim != 1:
+        raise ValueError("close and volume must be 1-D arrays of the same length")
+    if out is None:
+        out = allocate_indicator_buffer(close.shape[0])
+    elif out.shape != (len(INDICATOR_COLUMNS), close.shape[0]) or out.dtype != np.float64:
+        raise ValueError(f"out must be a float64 array of shape ({len(INDICATOR_COLUMNS)}, {close.shape[0]})")
+    if close.shape[0] == 0:
+        return out
+    kernel = _get_jitted_kernel()
+    if kernel is not None:
+        return kernel(close, volume, out)
+    return _numpy_kernel(close, volume, out)
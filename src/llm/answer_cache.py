@@ -0,0 +1,213 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query for exact-match caching: lowercase, collapse whitespace
+    and drop trailing punctuation.
+    """
+    query = re.sub(r'\s+', ' ', query.strip().lower())
+    return query.rstrip('?!. ')
+
+
+class AnswerCache:
+    """
+    Two-level cache for analyze_query responses, persisted in SQLite.
+
+    Level 1 is an exact-match LRU keyed on (normalized query, intent, top_k,
+    corpus version). Level 2 (optional) is a semantic cache: a response is
+    reused when the new query's embedding has cosine similarity >=
+    semantic_threshold with a cached query of the same intent and top_k.
+    Entries built against another corpus version are dropped as soon as a
+    lookup sees a new version.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 256,
+                 semantic_threshold: Optional[float] = 0.95,
+                 max_semantic_entries: int = 2048):
+        """
+        Args:
+            path: SQLite file for persistence, None keeps the cache in memory only
+            max_entries: Size of the in-memory exact-match LRU
+            semantic_threshold: Cosine similarity needed for a semantic hit, None disables level 2
+            max_semantic_entries: Maximum number of persisted entries
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.semantic_threshold = semantic_threshold
+        self.max_semantic_entries = max_semantic_entries
+        self.corpus_version: Optional[str] = None
+        self.stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0}
+
+        self._lock = threading.Lock()
+        self._lru: "OrderedDict[Tuple[str, str, int, str], Dict]" = OrderedDict()
+        # semantic index for the current corpus version: keys plus a row-normalized matrix
+        self._semantic_keys = []
+        self._semantic_matrix: Optional[np.ndarray] = None
+
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path or ':memory:', check_same_thread=False)
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(answers)")]
+        if columns and 'top_k' not in columns:
+            # written before answers were keyed on top_k, nothing in it can be reused
+            self._db.execute("DROP TABLE answers")
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS answers (
+                   query TEXT NOT NULL,
+                   intent TEXT NOT NULL,
+                   top_k INTEGER NOT NULL,
+                   corpus_version TEXT NOT NULL,
+                   response TEXT NOT NULL,
+                   embedding BLOB,
+                   created_at REAL NOT NULL,
+                   PRIMARY KEY (query, intent, top_k, corpus_version))"""
+        )
+        self._db.commit()
+
+    def _sync_version(self, corpus_version: str) -> None:
+        """Drop everything built against another corpus version."""
+        if corpus_version == self.corpus_version:
+            return
+        self._db.execute("DELETE FROM answers WHERE corpus_version != ?", (corpus_version,))
+        self._db.commit()
+        self.corpus_version = corpus_version
+        self._lru.clear()
+        self._load_semantic_index()
+
+    def _load_semantic_index(self) -> None:
+        self._semantic_keys = []
+        self._semantic_matrix = None
+        if self.semantic_threshold is None:
+            return
+        rows = self._db.execute(
+            "SELECT query, intent, top_k, embedding FROM answers WHERE corpus_version = ? AND embedding IS NOT NULL",
+            (self.corpus_version,)).fetchall()
+        if rows:
+            self._semantic_keys = [(query, intent, top_k) for query, intent, top_k, _ in rows]
+            self._semantic_matrix = np.stack([np.frombuffer(blob, dtype=np.float32) for *_, blob in rows])
+
+    def _remember(self, key: Tuple[str, str, int, str], response: Dict) -> None:
+        self._lru[key] = response
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def _load(self, query: str, intent: str, top_k: int) -> Optional[Dict]:
+        row = self._db.execute(
+            "SELECT response FROM answers WHERE query = ? AND intent = ? AND top_k = ? AND corpus_version = ?",
+            (query, intent, top_k, self.corpus_version)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get(self, query: str, intent: str, corpus_version: str,
+            query_embedding: Optional[np.ndarray] = None,
+            top_k: int = 5) -> Tuple[Optional[Dict], Optional[str]]:
+        """
+        Look up a cached response.
+
+        Args:
+            query: User query
+            intent: Classified intent of the query
+            corpus_version: Version of the retrieval index the answer must come from
+            query_embedding: Query embedding for the semantic level, optional
+            top_k: Number of sources the answer must be built from
+
+        Returns:
+            Tuple of (response or None, "exact" / "semantic" / None)
+        """
+        normalized = normalize_query(query)
+        with self._lock:
+            self._sync_version(corpus_version)
+            key = (normalized, intent, top_k, corpus_version)
+            response = self._lru.get(key)
+            if response is None:
+                response = self._load(normalized, intent, top_k)
+                if response is not None:
+                    self._remember(key, response)
+            else:
+                self._lru.move_to_end(key)
+            if response is not None:
+                self.stats["exact_hits"] += 1
+                return response, "exact"
+
+            if query_embedding is not None and self._semantic_matrix is not None:
+                vector = _unit(query_embedding)
+                if vector.shape[0] == self._semantic_matrix.shape[1]:
+                    scores = self._semantic_matrix @ vector
+                    # only reuse answers given for the same intent and top_k
+                    for i in np.argsort(scores)[::-1]:
+                        if scores[i] < self.semantic_threshold:
+                            break
+                        cached_query, cached_intent, cached_top_k = self._semantic_keys[i]
+                        if cached_intent == intent and cached_top_k == top_k:
+                            response = self._load(cached_query, cached_intent, cached_top_k)
+                            if response is not None:
+                                self.stats["semantic_hits"] += 1
+                                return response, "semantic"
+            self.stats["misses"] += 1
+            return None, None
+
+    def put(self, query: str, intent: str, corpus_version: str, response: Dict,
+            query_embedding: Optional[np.ndarray] = None, top_k: int = 5) -> None:
+        """
+        Store a response.
+
+        Args:
+            query: User query
+            intent: Classified intent of the query
+            corpus_version: Version of the retrieval index used for the answer
+            response: JSON-serializable analyze_query response
+            query_embedding: Query embedding for the semantic level, optional
+            top_k: Number of sources the answer was built from
+        """
+        normalized = normalize_query(query)
+        blob = None
+        vector = None
+        if query_embedding is not None and self.semantic_threshold is not None:
+            vector = _unit(query_embedding)
+            blob = vector.tobytes()
+        with self._lock:
+            self._sync_version(corpus_version)
+            self._db.execute(
+                "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (normalized, intent, top_k, corpus_version, json.dumps(response), blob, time.time()))
+            count = self._db.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+            if count > self.max_semantic_entries:
+                self._db.execute(
+                    "DELETE FROM answers WHERE rowid IN (SELECT rowid FROM answers ORDER BY created_at LIMIT ?)",
+                    (count - self.max_semantic_entries,))
+                self._db.commit()
+                self._load_semantic_index()
+            else:
+                self._db.commit()
+                if vector is not None and (normalized, intent, top_k) not in self._semantic_keys:
+                    self._semantic_keys.append((normalized, intent, top_k))
+                    row = vector[np.newaxis, :]
+                    self._semantic_matrix = row if self._semantic_matrix is None else np.vstack([self._semantic_matrix, row])
+            self._remember((normalized, intent, top_k, corpus_version), response)
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with self._lock:
+            self._db.execute("DELETE FROM answers")
+            self._db.commit()
+            self._lru.clear()
+            self._semantic_keys = []
+            self._semantic_matrix = None
+
+
+def _unit(vector) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32).ravel()
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
@@ -0,0 +1,211 @@
+import asyncio
+import os
+import random
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Type
+
+from src.llm.llm_inference import build_prompt
+
+
+class OpenAIBackend:
+    """
+    Streams chat completions from the OpenAI API.
+    """
+
+    def __init__(self, model: str = 'gpt-4o', max_tokens: int = 256, temperature: float = 0.2):
+        self.model = model
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self._client = None
+
+    @property
+    def client(self):
+        """AsyncOpenAI client, created on first use."""
+        if self._client is None:
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        return self._client
+
+    @property
+    def retryable_exceptions(self) -> Tuple[Type[BaseException], ...]:
+        import openai
+        return (openai.APIConnectionError, openai.APITimeoutError,
+                openai.RateLimitError, openai.InternalServerError)
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[{'role': 'user', 'content': prompt}],
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+            stream=True
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+class EchoBackend:
+    """
+    Local stand-in for the API: streams back the question (or a fixed reply)
+    word by word, optionally sleeping between tokens. Used in tests and for
+    running the server without network access.
+    """
+
+    retryable_exceptions: Tuple[Type[BaseException], ...] = ()
+
+    def __init__(self, reply: Optional[str] = None, token_delay: float = 0.0):
+        self.reply = reply
+        self.token_delay = token_delay
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        if self.reply is not None:
+            text = self.reply
+        else:
+            question = prompt.rsplit('Question:', 1)[-1].rsplit('Answer:', 1)[0].strip()
+            text = f"Echo: {question}"
+        for i, word in enumerate(text.split(' ')):
+            if self.token_delay:
+                await asyncio.sleep(self.token_delay)
+            yield word if i == 0 else ' ' + word
+
+
+class AsyncLLMClient:
+    """
+    Asyncio inference client: token streaming, a bound on concurrent requests,
+    timeouts and retries with jittered exponential backoff.
+
+    A request is only retried before its first token has been streamed; after
+    that a failure is raised so callers never see duplicated output.
+    """
+
+    def __init__(self, backend=None, max_concurrency: int = 8, timeout: float = 30.0,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 8.0):
+        """
+        Args:
+            backend: Object with an async stream(prompt) generator, defaults to OpenAIBackend
+            max_concurrency: Maximum number of requests streaming at once
+            timeout: Seconds to wait for the first token and between later tokens
+            max_retries: Retries after the first attempt for timeouts and retryable errors
+            backoff_base: First backoff ceiling in seconds, doubled per retry
+            backoff_max: Upper bound on the backoff ceiling
+        """
+        self.backend = backend if backend is not None else OpenAIBackend()
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.stats = {"requests": 0, "retries": 0, "failures": 0, "in_flight": 0,
+                      "last_time_to_first_token": None}
+        # created lazily so the client can be built outside a running event loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def from_config(cls, config=None, backend=None) -> 'AsyncLLMClient':
+        """
+        Build a client from the llm section of the pipeline config.
+        """
+        if config is None:
+            from src.config import get_config
+            config = get_config()
+        llm = config.settings.get('llm', {})
+        settings = llm.get('inference', {})
+        if backend is None:
+            backend = OpenAIBackend(model=llm.get('model', 'gpt-4o'),
+                                    max_tokens=llm.get('max_tokens', 256),
+                                    temperature=llm.get('temperature', 0.2))
+        return cls(backend=backend,
+                   max_concurrency=settings.get('max_concurrency', 8),
+                   timeout=settings.get('timeout_seconds', 30.0),
+                   max_retries=settings.get('max_retries', 3))
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _backoff(self, attempt: int) -> float:
+        # full jitter: uniform in [0, min(cap, base * 2^attempt)]
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def stream_prompt(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Stream the completion of a raw prompt.
+
+        Args:
+            prompt: Full prompt text
+
+        Yields:
+            Text deltas as they arrive
+        """
+        retryable = (asyncio.TimeoutError, ConnectionError) + tuple(getattr(self.backend, 'retryable_exceptions', ()))
+        self.stats["requests"] += 1
+        async with self.semaphore:
+            self.stats["in_flight"] += 1
+            try:
+                attempt = 0
+                while True:
+                    started = time.perf_counter()
+                    stream = self.backend.stream(prompt).__aiter__()
+                    emitted = False
+                    try:
+                        while True:
+                            try:
+                                token = await asyncio.wait_for(stream.__anext__(), self.timeout)
+                            except StopAsyncIteration:
+                                return
+                            if not emitted:
+                                emitted = True
+                                self.stats["last_time_to_first_token"] = time.perf_counter() - started
+                            yield token
+                    except retryable:
+                        if emitted or attempt >= self.max_retries:
+                            self.stats["failures"] += 1
+                            raise
+                    finally:
+                        await _aclose(stream)
+                    attempt += 1
+                    self.stats["retries"] += 1
+                    await asyncio.sleep(self._backoff(attempt))
+            finally:
+                self.stats["in_flight"] -= 1
+
+    async def stream_answer(self, question: str, context_texts: List[str]) -> AsyncIterator[str]:
+        """
+        Stream an answer to the question based on the context texts.
+
+        Args:
+            question: User question
+            context_texts: Retrieved context
+
+        Yields:
+            Text deltas as they arrive
+        """
+        async for token in self.stream_prompt(build_prompt(question, context_texts)):
+            yield token
+
+    async def generate_answer(self, question: str, context_texts: List[str]) -> str:
+        """
+        Async counterpart of llm_inference.generate_answers.
+
+        Returns:
+            The complete answer
+        """
+        return ''.join([token async for token in self.stream_answer(question, context_texts)])
+
+    async def generate_many(self, requests: List[Dict]) -> List[str]:
+        """
+        Answer several {"question", "context_texts"} requests concurrently,
+        at most max_concurrency at a time.
+        """
+        return list(await asyncio.gather(*[
+            self.generate_answer(r['question'], r['context_texts']) for r in requests
+        ]))
+
+
+async def _aclose(stream) -> None:
+    close = getattr(stream, 'aclose', None)
+    if close is not None:
+        await close()
@@ -0,0 +1,328 @@
+import datetime
+import json
+import math
+import os
+import re
+import shutil
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Keeps tickers, form names and accession numbers ("10-q", "0001104659-24-012345")
+# as single tokens; their parts are indexed as well
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-./][a-z0-9]+)*")
+_TOKEN_PARTS = re.compile(r"[-./]")
+
+_SEGMENT_ARRAYS = ('offsets', 'docs', 'tfs', 'doc_len', 'date_key', 'type_id')
+
+
+def shift_date_key(key: int, days: int) -> int:
+    """YYYYMMDD date key `days` days earlier."""
+    day = datetime.datetime.strptime(str(key), '%Y%m%d').date() - datetime.timedelta(days=days)
+    return int(day.strftime('%Y%m%d'))
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, compound tokens followed by their parts."""
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(token)
+        if _TOKEN_PARTS.search(token):
+            tokens.extend(part for part in _TOKEN_PARTS.split(token) if part)
+    return tokens
+
+
+class _Segment:
+    """
+    Immutable block of postings stored as .npy files and memory-mapped on load.
+    Postings for term t are docs[offsets[t]:offsets[t + 1]] with frequencies in tfs.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+        for name in _SEGMENT_ARRAYS:
+            setattr(self, name, np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r'))
+        with open(os.path.join(path, 'doc_ids.json'), 'r') as f:
+            self.doc_ids: List[str] = json.load(f)
+        self.live = np.ones(len(self.doc_ids), dtype=bool)
+
+    @staticmethod
+    def write(path: str, doc_ids: List[str], term_ids: np.ndarray, docs: np.ndarray, tfs: np.ndarray,
+              doc_len: np.ndarray, date_key: np.ndarray, type_id: np.ndarray, n_terms: int) -> None:
+        """Write postings given as parallel (term, doc, tf) arrays."""
+        order = np.lexsort((docs, term_ids))
+        term_ids, docs, tfs = term_ids[order], docs[order], tfs[order]
+        offsets = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_ids, minlength=n_terms), out=offsets[1:])
+        tmp = path + '.tmp'
+        os.makedirs(tmp, exist_ok=True)
+        arrays = {
+            'offsets': offsets,
+            'docs': docs.astype(np.int32),
+            'tfs': tfs.astype(np.int32),
+            'doc_len': doc_len.astype(np.int32),
+            'date_key': date_key.astype(np.int32),
+            'type_id': type_id.astype(np.int16),
+        }
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp, f'{name}.npy'), array)
+        with open(os.path.join(tmp, 'doc_ids.json'), 'w') as f:
+            json.dump(doc_ids, f)
+        os.replace(tmp, path)
+
+    def postings(self, term_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        if term_id + 1 >= self.offsets.shape[0]:
+            return self.docs[:0], self.tfs[:0]
+        start, stop = self.offsets[term_id], self.offsets[term_id + 1]
+        return self.docs[start:stop], self.tfs[start:stop]
+
+
+class BM25Index:
+    """
+    On-disk BM25 inverted index kept next to a Chroma collection.
+
+    Documents are added in immutable segments (integer postings, memory-mapped).
+    Upserting an existing id marks the old copy deleted; segments are merged back
+    into one when there are more than max_segments of them.
+    """
+
+    def __init__(self, path: str, k1: float = 1.5, b: float = 0.75, max_segments: int = 8):
+        """
+        Args:
+            path: Directory holding the index
+            k1: BM25 term-frequency saturation
+            b: BM25 document-length normalization
+            max_segments: Number of segments that triggers a merge
+        """
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.max_segments = max_segments
+        os.makedirs(path, exist_ok=True)
+        self._load()
+
+    # ---- persistence -------------------------------------------------------
+
+    def _load(self) -> None:
+        meta_path = os.path.join(self.path, 'meta.json')
+        meta = {}
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+        vocab_path = os.path.join(self.path, 'vocab.json')
+        self.vocab: Dict[str, int] = {}
+        if os.path.exists(vocab_path):
+            with open(vocab_path, 'r') as f:
+                self.vocab = json.load(f)
+        self.types: List[str] = meta.get('types', [])
+        self._next_segment = meta.get('next_segment', 0)
+        self.segments = [_Segment(os.path.join(self.path, name)) for name in meta.get('segments', [])]
+        self._locations: Dict[str, Tuple[_Segment, int]] = {}
+        deleted = meta.get('deleted', {})
+        for segment in self.segments:
+            segment.live[deleted.get(segment.name, [])] = False
+            for local, doc_id in enumerate(segment.doc_ids):
+                if segment.live[local]:
+                    self._locations[doc_id] = (segment, local)
+        self._refresh_stats()
+
+    def _save_meta(self) -> None:
+        with open(os.path.join(self.path, 'vocab.json.tmp'), 'w') as f:
+            json.dump(self.vocab, f)
+        os.replace(os.path.join(self.path, 'vocab.json.tmp'), os.path.join(self.path, 'vocab.json'))
+        meta = {
+            'segments': [segment.name for segment in self.segments],
+            'deleted': {segment.name: np.flatnonzero(~segment.live).tolist()
+                        for segment in self.segments if not segment.live.all()},
+            'types': self.types,
+            'next_segment': self._next_segment,
+        }
+        with open(os.path.join(self.path, 'meta.json.tmp'), 'w') as f:
+            json.dump(meta, f)
+        os.replace(os.path.join(self.path, 'meta.json.tmp'), os.path.join(self.path, 'meta.json'))
+
+    def _refresh_stats(self) -> None:
+        self.n_docs = int(sum(segment.live.sum() for segment in self.segments))
+        total = sum(int(segment.doc_len[segment.live].sum()) for segment in self.segments)
+        self.avg_doc_len = max(total / self.n_docs, 1.0) if self.n_docs else 1.0
+
+    def _new_segment_path(self) -> str:
+        name = f'seg_{self._next_segment:05d}'
+        self._next_segment += 1
+        return os.path.join(self.path, name)
+
+    def _type_id(self, chunk_type) -> int:
+        chunk_type = str(chunk_type) if chunk_type is not None else 'unknown'
+        if chunk_type not in self.types:
+            self.types.append(chunk_type)
+        return self.types.index(chunk_type)
+
+    # ---- updates -----------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self.n_docs
+
+    def upsert(self, ids: Sequence[str], documents: Sequence[str],
+               metadatas: Optional[Sequence[Dict]] = None) -> None:
+        """
+        Add documents, replacing earlier versions with the same id.
+
+        Args:
+            ids: Document ids (the Chroma ids)
+            documents: Document texts
+            metadatas: Metadata per document; "type" and "date_key" are kept for filtering
+        """
+        latest = {doc_id: i for i, doc_id in enumerate(ids)}
+        rows = sorted(latest.values())
+        if not rows:
+            return
+        metadatas = metadatas or [{}] * len(ids)
+        self._mark_deleted([ids[i] for i in rows])
+
+        term_ids, docs, tfs = [], [], []
+        doc_len = np.zeros(len(rows), dtype=np.int32)
+        for local, i in enumerate(rows):
+            counts = Counter(tokenize(documents[i]))
+            doc_len[local] = sum(counts.values())
+            for token, tf in counts.items():
+                term_ids.append(self.vocab.setdefault(token, len(self.vocab)))
+                docs.append(local)
+                tfs.append(tf)
+        date_key = np.array([int(metadatas[i].get('date_key') or 0) for i in rows], dtype=np.int32)
+        type_id = np.array([self._type_id(metadatas[i].get('type')) for i in rows], dtype=np.int16)
+
+        path = self._new_segment_path()
+        _Segment.write(path, [ids[i] for i in rows], np.array(term_ids, dtype=np.int64),
+                       np.array(docs, dtype=np.int32), np.array(tfs, dtype=np.int32),
+                       doc_len, date_key, type_id, len(self.vocab))
+        segment = _Segment(path)
+        self.segments.append(segment)
+        for local, doc_id in enumerate(segment.doc_ids):
+            self._locations[doc_id] = (segment, local)
+
+        if len(self.segments) > self.max_segments:
+            self.merge()
+        else:
+            self._save_meta()
+            self._refresh_stats()
+
+    def delete(self, ids: Sequence[str]) -> None:
+        """Remove documents by id."""
+        self._mark_deleted(ids)
+        self._save_meta()
+        self._refresh_stats()
+
+    def _mark_deleted(self, ids: Sequence[str]) -> None:
+        for doc_id in ids:
+            location = self._locations.pop(doc_id, None)
+            if location is not None:
+                segment, local = location
+                segment.live[local] = False
+
+    def merge(self) -> None:
+        """Rewrite all live documents into a single segment."""
+        term_parts, doc_parts, tf_parts = [], [], []
+        doc_ids, doc_len, date_key, type_id = [], [], [], []
+        base = 0
+        for segment in self.segments:
+            live = segment.live
+            if not live.any():
+                continue
+            new_index = np.cumsum(live) - 1 + base
+            terms = np.repeat(np.arange(segment.offsets.shape[0] - 1), np.diff(segment.offsets))
+            keep = live[segment.docs]
+            term_parts.append(terms[keep])
+            doc_parts.append(new_index[segment.docs[keep]])
+            tf_parts.append(np.asarray(segment.tfs)[keep])
+            doc_ids.extend(doc_id for doc_id, alive in zip(segment.doc_ids, live) if alive)
+            doc_len.append(np.asarray(segment.doc_len)[live])
+            date_key.append(np.asarray(segment.date_key)[live])
+            type_id.append(np.asarray(segment.type_id)[live])
+            base += int(live.sum())
+
+        old_segments = self.segments
+        self.segments = []
+        self._locations = {}
+        if doc_ids:
+            path = self._new_segment_path()
+            _Segment.write(path, doc_ids, np.concatenate(term_parts), np.concatenate(doc_parts),
+                           np.concatenate(tf_parts), np.concatenate(doc_len), np.concatenate(date_key),
+                           np.concatenate(type_id), len(self.vocab))
+            segment = _Segment(path)
+            self.segments.append(segment)
+            self._locations = {doc_id: (segment, local) for local, doc_id in enumerate(segment.doc_ids)}
+        self._save_meta()
+        self._refresh_stats()
+        for segment in old_segments:
+            shutil.rmtree(segment.path, ignore_errors=True)
+
+    # ---- search ------------------------------------------------------------
+
+    def _filter_mask(self, segment: _Segment, type_ids: Optional[np.ndarray],
+                     min_date_key: Optional[int]) -> np.ndarray:
+        mask = segment.live.copy()
+        if type_ids is not None:
+            mask &= np.isin(segment.type_id, type_ids)
+        if min_date_key is not None:
+            mask &= np.asarray(segment.date_key) >= min_date_key
+        return mask
+
+    def _latest_date_key(self, type_ids: Optional[np.ndarray]) -> int:
+        latest = 0
+        for segment in self.segments:
+            mask = self._filter_mask(segment, type_ids, None)
+            if mask.any():
+                latest = max(latest, int(np.asarray(segment.date_key)[mask].max()))
+        return latest
+
+    def search(self, query: str, top_k: int = 10, chunk_types: Optional[Sequence[str]] = None,
+               within_days: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        BM25 search.
+
+        Args:
+            query: Query text
+            top_k: Number of results
+            chunk_types: Only documents of these metadata types
+            within_days: Only documents dated at most this many days before the
+                newest matching document
+
+        Returns:
+            List of (document id, score), best first
+        """
+        if not self.n_docs:
+            return []
+        term_ids = [self.vocab[token] for token in set(tokenize(query)) if token in self.vocab]
+        if not term_ids:
+            return []
+        type_ids = None
+        if chunk_types:
+            type_ids = np.array([self.types.index(t) for t in chunk_types if t in self.types], dtype=np.int16)
+            if type_ids.size == 0:
+                return []
+        min_date_key = None
+        if within_days is not None:
+            latest = self._latest_date_key(type_ids)
+            min_date_key = shift_date_key(latest, within_days) if latest else None
+
+        df = {t: sum(segment.postings(t)[0].shape[0] for segment in self.segments) for t in term_ids}
+        idf = {t: math.log(1.0 + (self.n_docs - df[t] + 0.5) / (df[t] + 0.5)) for t in term_ids}
+
+        hits: List[Tuple[float, str]] = []
+        for segment in self.segments:
+            scores = np.zeros(len(segment.doc_ids), dtype=np.float32)
+            norm = self.k1 * (1.0 - self.b + self.b * np.asarray(segment.doc_len, dtype=np.float32) / self.avg_doc_len)
+            for t in term_ids:
+                docs, tfs = segment.postings(t)
+                if docs.shape[0]:
+                    tfs = np.asarray(tfs, dtype=np.float32)
+                    scores[docs] += idf[t] * tfs * (self.k1 + 1.0) / (tfs + norm[docs])
+            scores[~self._filter_mask(segment, type_ids, min_date_key)] = 0.0
+            candidates = np.flatnonzero(scores > 0)
+            if candidates.shape[0] > top_k:
+                candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+            hits.extend((float(scores[i]), segment.doc_ids[i]) for i in candidates)
+        hits.sort(key=lambda hit: -hit[0])
+        return [(doc_id, score) for score, doc_id in hits[:top_k]]
@@ -0,0 +1,119 @@
+import re
+from typing import Callable, List, Optional, Sequence
+
+# Encoding used by gpt-4o, only needed when tiktoken is installed
+TIKTOKEN_ENCODING = 'o200k_base'
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9"\'(\[])')
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+_token_counter: Optional[Callable[[str], int]] = None
+
+
+def get_token_counter() -> Callable[[str], int]:
+    """
+    Token counter for prompt budgeting. Uses tiktoken when installed, otherwise
+    counts words and punctuation marks, which tracks BPE token counts closely
+    for English financial text without needing a download.
+
+    Returns:
+        Function mapping a text to its token count
+    """
+    global _token_counter
+    if _token_counter is None:
+        try:
+            import tiktoken
+            encoding = tiktoken.get_encoding(TIKTOKEN_ENCODING)
+            _token_counter = lambda text: len(encoding.encode(text, disallowed_special=()))
+        except Exception:  # tiktoken missing or its encoding files unavailable offline
+            _token_counter = lambda text: len(_TOKEN_PATTERN.findall(text))
+    return _token_counter
+
+
+def count_tokens(text: str) -> int:
+    """Number of tokens in text."""
+    return get_token_counter()(text)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text on sentence boundaries."""
+    return [s for s in _SENTENCE_END.split(text.strip()) if s]
+
+
+def _shingles(text: str, size: int = 3) -> set:
+    words = re.findall(r'\w+', text.lower())
+    if len(words) < size:
+        return {tuple(words)} if words else set()
+    return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def truncate_to_tokens(text: str, max_tokens: int, counter: Optional[Callable[[str], int]] = None) -> str:
+    """
+    Keep the leading sentences of text that fit in max_tokens.
+
+    Returns:
+        Truncated text, empty when not even the first sentence fits
+    """
+    counter = counter or get_token_counter()
+    kept = []
+    used = 0
+    for sentence in split_sentences(text):
+        tokens = counter(sentence)
+        if used + tokens > max_tokens:
+            break
+        kept.append(sentence)
+        used += tokens
+    return ' '.join(kept)
+
+
+def pack_context(texts: Sequence[str], max_tokens: int, scores: Optional[Sequence[float]] = None,
+                 dedupe_threshold: float = 0.8, min_chunk_tokens: int = 16,
+                 separator: str = '\n\n') -> List[str]:
+    """
+    Select the context chunks for a prompt within a token budget.
+
+    Chunks are taken greedily from the most to the least relevant. A chunk whose
+    word 3-grams are mostly contained in an already selected chunk is dropped as
+    a duplicate. A chunk that does not fit is cut at a sentence boundary when at
+    least min_chunk_tokens of budget remain.
+
+    Args:
+        texts: Retrieved chunks
+        max_tokens: Token budget for the joined context
+        scores: Relevance per chunk (higher is better), defaults to the given order
+        dedupe_threshold: Share of a chunk's 3-grams already selected above which it is skipped
+        min_chunk_tokens: Smallest truncated chunk worth including
+        separator: String the chunks are joined with
+
+    Returns:
+        Selected chunks, most relevant first
+    """
+    counter = get_token_counter()
+    order = range(len(texts)) if scores is None else sorted(range(len(texts)), key=lambda i: -scores[i])
+    separator_tokens = counter(separator)
+
+    packed: List[str] = []
+    seen: List[set] = []
+    used = 0
+    for i in order:
+        text = texts[i].strip()
+        if not text:
+            continue
+        shingles = _shingles(text)
+        if any(len(shingles & other) >= dedupe_threshold * len(shingles) for other in seen):
+            continue
+        remaining = max_tokens - used - (separator_tokens if packed else 0)
+        if remaining <= 0:
+            break
+        tokens = counter(text)
+        if tokens > remaining:
+            if remaining < min_chunk_tokens:
+                continue
+            text = truncate_to_tokens(text, remaining, counter)
+            if not text:
+                continue
+            tokens = counter(text)
+        packed.append(text)
+        seen.append(shingles)
+        used += tokens + (separator_tokens if len(packed) > 1 else 0)
+    return packed
@@ -0,0 +1,106 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+import numpy as np
+
+_STOP = object()
+
+
+class EmbeddingScheduler:
+    """
+    Micro-batches query embeddings across concurrent callers.
+
+    Callers on any thread submit one text and block on a future. A
+    single worker thread waits for the first pending text, keeps collecting for
+    up to max_wait_ms or until max_batch_size texts are pending, runs one
+    batched encode() and fans the vectors back out. Identical texts in a batch
+    are encoded once.
+    """
+
+    def __init__(self, encoder, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        """
+        Args:
+            encoder: Model with the SentenceTransformer encode() API
+            max_batch_size: Most texts encoded in one forward pass
+            max_wait_ms: How long the first text in a batch waits for company
+        """
+        self.encoder = encoder
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.stats = {"requests": 0, "batches": 0, "encoded": 0, "largest_batch": 0}
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        # orders submits against close, so nothing is queued behind _STOP
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name='embedding-scheduler', daemon=True)
+        self._worker.start()
+
+    def submit(self, text: str) -> Future:
+        """
+        Queue a text for embedding.
+
+        Returns:
+            Future resolving to a float32 vector
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("EmbeddingScheduler is closed")
+            self.stats["requests"] += 1
+            self._queue.put((text, future))
+        return future
+
+    def encode(self, text: str, timeout: Optional[float] = None) -> np.ndarray:
+        """Embed one text, blocking until its batch has run."""
+        return self.submit(text).result(timeout)
+
+    def _collect(self, first) -> List:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.put(_STOP)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = [(text, future) for text, future in self._collect(first)
+                     if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            unique: Dict[str, int] = {}
+            for text, _ in batch:
+                unique.setdefault(text, len(unique))
+            try:
+                vectors = np.asarray(self.encoder.encode(list(unique)), dtype=np.float32)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.stats["batches"] += 1
+            self.stats["encoded"] += len(unique)
+            self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+            for text, future in batch:
+                future.set_result(vectors[unique[text]])
+
+    def close(self) -> None:
+        """Finish pending batches and stop the worker thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._worker.join()
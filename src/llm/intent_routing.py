@@ -0,0 +1,47 @@
+from typing import Dict, Optional
+
+# Chunk types that carry ratios and statement figures, as emitted by the ingest modules
+FINANCIAL_TYPES = ["company_info", "financial", "financials"]
+
+# Intent -> which chunk types to search; intents without a route search everything
+DEFAULT_ROUTES = {
+    "news": {"types": ["news"], "within_days": 180},
+    "pe_ratio": {"types": FINANCIAL_TYPES},
+    "roe": {"types": FINANCIAL_TYPES},
+    "debt_to_equity": {"types": FINANCIAL_TYPES},
+    "financials": {"types": FINANCIAL_TYPES + ["sec_filing"]},
+}
+
+
+class IntentRouter:
+    """
+    Maps a classified query intent to the retrieval scope for
+    ChromaDBRetriever.search (chunk types and, for news, a recency window).
+    """
+
+    def __init__(self, routes: Optional[Dict[str, Dict]] = None):
+        """
+        Args:
+            routes: Intent -> {"types": [...], "within_days": int}, defaults to
+                retrieval.intent_routes in the config, then DEFAULT_ROUTES
+        """
+        if routes is None:
+            from src.config import get_config
+            routes = get_config().get('retrieval', 'intent_routes', DEFAULT_ROUTES)
+        self.routes = routes
+
+    def route(self, intent: str) -> Dict:
+        """
+        Search keyword arguments for an intent.
+
+        Args:
+            intent: Output of QueryClassifier.classify_query
+
+        Returns:
+            {"chunk_types": [...] or None, "within_days": int or None}
+        """
+        route = self.routes.get(intent) or {}
+        return {
+            "chunk_types": list(route["types"]) if route.get("types") else None,
+            "within_days": route.get("within_days"),
+        }
@@ -1,29 +1,57 @@
-from openai import OpenAI
 import os 
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
-from dotenv import load_dotenv
 import warnings
 warnings.filterwarnings('ignore')
 
-api_key = os.getenv("OPENAI_API_KEY")
+_client = None
 
-# if not api_key:
-#     raise ValueError("OPENAI_API_KEY not found in environment variables.")
+def get_client():
+    """
+    OpenAI client, created on first use so that importing this module is
+    cheap and does not need OPENAI_API_KEY.
+    Return:
+        OpenAI client
+    """
+    global _client
+    if _client is None:
+        from openai import OpenAI
+        _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return _client
 
-client = OpenAI(api_key=api_key)
+def build_prompt(question, context_texts, max_context_tokens=None):
+    """
+    Build the answering prompt from the question and the context texts
+    Args:
+        question
+        context_texts: ordered from most to least relevant
+        max_context_tokens: token budget for the context, defaults to llm.context.max_tokens
+            in the config; duplicate chunks are dropped and the rest packed into the budget
+    Return:
+        prompt
+    """
+    from src.config import get_config
+    settings = get_config().get('llm', 'context', {})
+    if max_context_tokens is None:
+        max_context_tokens = settings.get('max_tokens')
+    if max_context_tokens:
+        from src.llm.context_packing import pack_context
+        context_texts = pack_context(context_texts, max_context_tokens,
+                                     dedupe_threshold=settings.get('dedupe_threshold', 0.8))
+    context = '\n\n'.join(context_texts)
+    return f'Answer the question based on the context below: \n{context}\n\nQuestion: {question}\nAnswer:'
 
-def generate_answers(question, context_texts):
+def generate_answers(question, context_texts, max_context_tokens=None):
     """
     Generate answers based on the question and the context texts
     Args:
         question
         context_text
+        max_context_tokens: token budget for the context, see build_prompt
     Return:
         response
     """
-    context = '\n\n'.join(context_texts)
-    prompt = f'Answer the question based on the context below: \n{context}\n\nQuestion: {question}\nAnswer:'
-    response = client.chat.completions.create(
+    prompt = build_prompt(question, context_texts, max_context_tokens)
+    response = get_client().chat.completions.create(
         model='gpt-4o',
         messages=[{'role':'user', 'content':prompt}], 
         max_tokens=256,
@@ -1,8 +1,13 @@
 from src.llm.query_classifier import QueryClassifier
 from src.llm.rag_retrieval import ChromaDBRetriever
 from src.llm.llm_inference import generate_answers
+from src.llm.answer_cache import AnswerCache
+from src.llm.embedding_scheduler import EmbeddingScheduler
+from src.llm.intent_routing import IntentRouter
+from src.llm.reranker import CrossEncoderReranker
+from src.config import get_config
 import os
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 class NOGAnalysisSystem:
     """
@@ -10,17 +15,60 @@ class NOGAnalysisSystem:
     for comprehensive NOG stock analysis.
     """
     
-    def __init__(self, collection_name: str = "nog_corpus"):
+    def __init__(self, collection_name: str = "nog_corpus", answer_cache: Optional[AnswerCache] = None,
+                 batch_embeddings: bool = False):
         """
         Initialize the NOG analysis system.
         
         Args:
             collection_name: Name of the ChromaDB collection
+            answer_cache: Cache for analyze_query responses, defaults to the one
+                configured under llm.cache (None when disabled there)
+            batch_embeddings: Micro-batch query embeddings across concurrent
+                analyze_query calls (for the HTTP service)
         """
         self.query_classifier = QueryClassifier()
         self.retriever = ChromaDBRetriever(collection_name=collection_name)
+        self.intent_router = IntentRouter()
+        self.reranker = CrossEncoderReranker.from_config()
+        self.rerank_candidates = get_config().get('retrieval', 'rerank', {}).get('candidates', 20)
+        self.answer_cache = answer_cache if answer_cache is not None else self._configured_cache()
+        self.embedding_scheduler = None
+        if batch_embeddings:
+            settings = get_config().get('llm', 'embedding_batch', {})
+            self.embedding_scheduler = EmbeddingScheduler(
+                self.query_classifier.model,
+                max_batch_size=settings.get('max_batch_size', 32),
+                max_wait_ms=settings.get('max_wait_ms', 5.0)
+            )
         print("[INFO] NOG Analysis System initialized")
     
+    @staticmethod
+    def _configured_cache() -> Optional[AnswerCache]:
+        config = get_config()
+        settings = config.get('llm', 'cache', {})
+        if not settings.get('enabled', False):
+            return None
+        return AnswerCache(
+            path=config.path('answer_cache_path'),
+            max_entries=settings.get('max_entries', 256),
+            semantic_threshold=settings.get('semantic_threshold', 0.95)
+        )
+    
+    def embed_query(self, query: str):
+        """
+        Embed a query once for every component that needs it.
+        
+        Args:
+            query: User's question
+            
+        Returns:
+            Query embedding as a numpy vector
+        """
+        if self.embedding_scheduler is not None:
+            return self.embedding_scheduler.encode(query)
+        return self.query_classifier.model.encode(query)
+    
     def analyze_query(self, query: str, top_k: int = 5) -> Dict:
         """
         Analyze a user query and provide comprehensive response.
@@ -32,48 +80,112 @@ class NOGAnalysisSystem:
         Returns:
             Dictionary containing analysis results
         """
-        # Classify the query intent
-        intent = self.query_classifier.classify_query(query)
+        context = self.retrieve_context(query, top_k)
+        if context["response"] is not None:
+            return context["response"]
+        
+        # Generate answer using LLM
+        try:
+            answer = generate_answers(query, context["context_texts"])
+        except Exception as e:
+            print(f"[ERROR] LLM inference failed: {e}")
+            return self.complete_response(context, None)
+        return self.complete_response(context, answer)
+    
+    def retrieve_context(self, query: str, top_k: int = 5) -> Dict:
+        """
+        Everything analyze_query does before the LLM call: classification,
+        cache lookup, retrieval and reranking. Split out so that async callers
+        can generate the answer themselves (see src.serving.server).
+        
+        Args:
+            query: User's question about NOG
+            top_k: Number of relevant documents to retrieve
+            
+        Returns:
+            Dictionary with query, intent, top_k, corpus_version, query_embedding,
+            documents, context_texts and response: the final response when no
+            LLM call is needed (cache hit, nothing relevant found), else None
+        """
+        # Embed the query once; the classifier, cache and retriever all reuse it
+        query_embedding = self.embed_query(query)
+        intent = self.query_classifier.classify_query(query, query_embedding=query_embedding)
         print(f"[INFO] Query classified as: {intent}")
+        context = {"query": query, "intent": intent, "top_k": top_k, "corpus_version": None,
+                   "query_embedding": query_embedding, "documents": [], "context_texts": [],
+                   "response": None}
+        
+        # Reuse an earlier answer for the same (or a near-identical) question
+        if self.answer_cache is not None:
+            context["corpus_version"] = self.retriever.get_corpus_version()
+            cached, level = self.answer_cache.get(query, intent, context["corpus_version"], query_embedding,
+                                                  top_k=top_k)
+            if cached is not None:
+                print(f"[INFO] Answer served from cache ({level} match)")
+                context["response"] = {**cached, "query": query, "cache": level}
+                return context
         
-        # Retrieve relevant documents
-        relevant_docs = self.retriever.search(query, top_k=top_k)
+        # Retrieve relevant documents, restricted to the chunk types the intent needs;
+        # with reranking, over-fetch and keep only the best top_k for the prompt
+        n_candidates = max(top_k, self.rerank_candidates) if self.reranker is not None else top_k
+        relevant_docs = self.retriever.search(query, top_k=n_candidates, query_embedding=query_embedding,
+                                              **self.intent_router.route(intent))
+        if self.reranker is not None:
+            relevant_docs = self.reranker.rerank(query, relevant_docs, top_k)
         
         if not relevant_docs:
-            return {
+            context["response"] = {
                 "query": query,
                 "intent": intent,
                 "answer": "I don't have enough relevant information to answer this question about NOG.",
                 "sources": [],
-                "confidence": "low"
+                "confidence": "low",
+                "cache": None
             }
+            return context
         
         # Extract text content for LLM
-        context_texts = [doc['text'] for doc in relevant_docs]
+        context["documents"] = relevant_docs
+        context["context_texts"] = [doc['text'] for doc in relevant_docs]
+        return context
+    
+    def complete_response(self, context: Dict, answer: Optional[str]) -> Dict:
+        """
+        Build (and cache) the response for a retrieve_context result.
         
-        # Generate answer using LLM
-        try:
-            answer = generate_answers(query, context_texts)
-        except Exception as e:
-            print(f"[ERROR] LLM inference failed: {e}")
+        Args:
+            context: retrieve_context output without a response
+            answer: Generated answer, None when LLM inference failed
+            
+        Returns:
+            Dictionary containing analysis results
+        """
+        failed = answer is None
+        if failed:
             answer = "I encountered an error while generating the answer. Please try again."
         
         # Prepare response
         response = {
-            "query": query,
-            "intent": intent,
+            "query": context["query"],
+            "intent": context["intent"],
             "answer": answer,
             "sources": [
                 {
                     "text": doc['text'][:200] + "...",
                     "metadata": doc['metadata'],
-                    "relevance_score": 1 - (doc['distance'] if doc['distance'] else 0)
+                    "relevance_score": doc.get('rerank_score', doc.get('rrf_score', 1 - (doc['distance'] if doc['distance'] else 0)))
                 }
-                for doc in relevant_docs
+                for doc in context["documents"]
             ],
-            "confidence": "high" if len(relevant_docs) >= 3 else "medium"
+            "confidence": "high" if len(context["documents"]) >= 3 else "medium",
+            "cache": None
         }
         
+        # Never cache failures, the next attempt may succeed
+        if self.answer_cache is not None and not failed:
+            self.answer_cache.put(context["query"], context["intent"], context["corpus_version"],
+                                  response, context["query_embedding"], top_k=context["top_k"])
+        
         return response
     
     def get_system_stats(self) -> Dict:
@@ -89,6 +201,9 @@ class NOGAnalysisSystem:
             "system": "NOG Analysis System",
             "status": "operational",
             "collection_stats": collection_stats,
+            "answer_cache": dict(self.answer_cache.stats) if self.answer_cache is not None else None,
+            "embedding_batches": dict(self.embedding_scheduler.stats) if self.embedding_scheduler is not None else None,
+            "reranker": dict(self.reranker.stats) if self.reranker is not None else None,
             "components": {
                 "query_classifier": "active",
                 "rag_retriever": "active",
@@ -1,12 +1,16 @@
 # src/llm/query_classifier.py
 
 from typing import Dict
-from sentence_transformers import SentenceTransformer, util
-import torch
+import numpy as np
 
 class QueryClassifier:
-    def __init__(self):
-        self.model = SentenceTransformer("all-MiniLM-L6-v2")
+    def __init__(self, model=None):
+        # model: any encoder with the SentenceTransformer encode() API, defaults to all-MiniLM-L6-v2;
+        # sentence_transformers (and torch) are only imported for the default
+        if model is None:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer("all-MiniLM-L6-v2")
+        self.model = model
         self.intent_templates = {
             "pe_ratio": [
                 "What is the latest P/E ratio?",
@@ -36,23 +40,36 @@ class QueryClassifier:
             ]
         }
 
+        # unit-length template embeddings, so cosine similarity is a dot product
         self.intent_embeddings = {
-            intent: self.model.encode(templates, convert_to_tensor=True)
+            intent: _unit_rows(self.model.encode(templates))
             for intent, templates in self.intent_templates.items()
         }
 
-    def classify_query(self, user_query: str) -> str:
-        query_embedding = self.model.encode(user_query, convert_to_tensor=True)
+    def classify_query(self, user_query: str, query_embedding=None) -> str:
+        # query_embedding: precomputed embedding of user_query, so callers that
+        # already encoded the query (cache, retriever, batching) skip a forward pass
+        if query_embedding is None:
+            query_embedding = self.model.encode(user_query)
+        query_embedding = _unit_rows(query_embedding)[0]
         best_intent = None
         best_score = -1
 
         for intent, embeddings in self.intent_embeddings.items():
-            # Calculate cosine similarity between query and all templates for this intent
-            cos_scores = util.pytorch_cos_sim(query_embedding, embeddings)
-            max_similarity = torch.max(cos_scores).item()
+            # Cosine similarity between the query and the closest template of this intent
+            max_similarity = float(np.max(embeddings @ query_embedding))
             
             if max_similarity > best_score:
                 best_score = max_similarity
                 best_intent = intent
 
         return best_intent if best_score > 0.5 else "general"
+
+
+def _unit_rows(embeddings) -> np.ndarray:
+    """Embeddings (numpy array or tensor) as a 2-D float32 array of unit-length rows."""
+    if hasattr(embeddings, 'detach'):
+        embeddings = embeddings.detach().cpu().numpy()
+    embeddings = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.where(norms > 0, norms, 1.0)
@@ -1,9 +1,29 @@
 import chromadb
 import numpy as np
-from sentence_transformers import SentenceTransformer
+import datetime
+import hashlib
 import json
 import os
+import re
+import time
 from typing import List, Dict, Optional
+from src.config import get_config
+from src.llm.bm25_index import BM25Index, shift_date_key
+
+# Per-type partitions are stored as "<collection>__<type>"
+PARTITION_SEPARATOR = '__'
+# seconds before a missing partition is looked up again (another process may build it)
+PARTITION_MISS_TTL = 60.0
+
+def date_key(value) -> Optional[int]:
+    """
+    Numeric YYYYMMDD form of a 'YYYY-MM-DD' metadata date, so Chroma can
+    range-filter on it. Returns None for missing or non-date values ("current").
+    """
+    try:
+        return int(datetime.date.fromisoformat(str(value)[:10]).strftime('%Y%m%d'))
+    except ValueError:
+        return None
 
 class ChromaDBRetriever:
     """
@@ -11,31 +31,65 @@ class ChromaDBRetriever:
     Works natively on M1/M2/M3 Macs.
     """
     
-    def __init__(self, collection_name: str = "nog_corpus", persist_directory: str = "data/chroma_db"):
+    def __init__(self, collection_name: str = "nog_corpus", persist_directory: Optional[str] = None,
+                 embedding_function=None, partition_by_type: Optional[bool] = None,
+                 hybrid: Optional[bool] = None):
         """
         Initialize ChromaDB retriever.
         
         Args:
             collection_name: Name of the collection
-            persist_directory: Directory to persist the database
+            persist_directory: Directory to persist the database, defaults to paths.chroma_path in the config
+            embedding_function: Optional Chroma embedding function, defaults to Chroma's own
+            partition_by_type: Also index every chunk type in its own collection so
+                type-restricted searches scan only that partition, defaults to
+                retrieval.partition_by_type in the config
+            hybrid: Keep a BM25 index next to the collection and fuse its ranking with
+                the dense one, defaults to retrieval.hybrid.enabled in the config
         """
         self.collection_name = collection_name
-        self.persist_directory = persist_directory
+        self.persist_directory = persist_directory or get_config().path('chroma_path')
+        if partition_by_type is None:
+            partition_by_type = get_config().get('retrieval', 'partition_by_type', True)
+        self.partition_by_type = partition_by_type
+        self._partitions: Dict[str, object] = {}
+        # chunk type -> when its partition was last found missing
+        self._partition_misses: Dict[str, float] = {}
+        
+        # Sparse (BM25) side of hybrid search, stored beside the Chroma files
+        hybrid_settings = get_config().get('retrieval', 'hybrid', {})
+        if hybrid is None:
+            hybrid = hybrid_settings.get('enabled', True)
+        self.hybrid_candidates = hybrid_settings.get('candidates', 50)
+        self.rrf_k = hybrid_settings.get('rrf_k', 60)
+        self.sparse_index = BM25Index(os.path.join(self.persist_directory, 'bm25', collection_name)) if hybrid else None
         
         # Initialize ChromaDB client
-        self.client = chromadb.PersistentClient(path=persist_directory)
+        self.client = chromadb.PersistentClient(path=self.persist_directory)
         
-        # Initialize sentence transformer for embeddings
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+        # Sentence transformer for query embeddings, loaded on first use
+        self._embedding_model = None
         
         # Get or create collection
+        collection_kwargs = {}
+        if embedding_function is not None:
+            collection_kwargs['embedding_function'] = embedding_function
+        self._collection_kwargs = collection_kwargs
         try:
-            self.collection = self.client.get_collection(name=collection_name)
+            self.collection = self.client.get_collection(name=collection_name, **collection_kwargs)
             print(f"[INFO] Loaded existing collection: {collection_name}")
         except:
-            self.collection = self.client.create_collection(name=collection_name)
+            self.collection = self.client.create_collection(name=collection_name, **collection_kwargs)
             print(f"[INFO] Created new collection: {collection_name}")
     
+    @property
+    def embedding_model(self):
+        """Sentence transformer for embeddings (all-MiniLM-L6-v2), loaded lazily."""
+        if self._embedding_model is None:
+            from sentence_transformers import SentenceTransformer
+            self._embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+        return self._embedding_model
+    
     def build_index_from_jsonl(self, jsonl_file_path: str) -> None:
         """
         Build ChromaDB index from JSONL file.
@@ -53,22 +107,166 @@ class ChromaDBRetriever:
             for i, line in enumerate(f):
                 if line.strip():
                     data = json.loads(line)
+                    metadata = dict(data.get('metadata', {}))
+                    key = date_key(metadata.get('date'))
+                    if key is not None:
+                        metadata['date_key'] = key
                     documents.append(data['text'])
-                    metadatas.append(data.get('metadata', {}))
+                    metadatas.append(metadata)
                     ids.append(f"doc_{i}")
         
         print(f"[INFO] Loaded {len(documents)} documents")
         
-        # Add documents to collection
-        self.collection.add(
+        # Ids are positional, so documents beyond the new corpus are gone
+        stale = set(self.collection.get(include=[])['ids']) - set(ids)
+        if stale:
+            self.delete_documents(sorted(stale))
+            print(f"[INFO] Removed {len(stale)} documents no longer in the corpus")
+        self.upsert_documents(ids, documents, metadatas)
+        
+        # Record which corpus the index was built from so caches can be invalidated
+        with open(jsonl_file_path, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        self.collection.modify(metadata={**(self.collection.metadata or {}), 'corpus_version': digest})
+        
+        print(f"[INFO] Successfully built index with {len(documents)} documents")
+    
+    def upsert_documents(self, ids: List[str], documents: List[str], metadatas: List[Dict]) -> None:
+        """
+        Add or replace documents in the collection, its type partitions and the
+        BM25 index.
+        
+        Args:
+            ids: Document ids
+            documents: Document texts
+            metadatas: Metadata per document
+        """
+        if not documents:
+            return
+        self.collection.upsert(
             documents=documents,
             metadatas=metadatas,
             ids=ids
         )
+        # newest dated chunk per type, for recency windows on unpartitioned searches
+        current = self.collection.metadata or {}
+        latest = {}
+        for metadata in metadatas:
+            if 'date_key' in metadata:
+                key = f"latest_date_key{PARTITION_SEPARATOR}{metadata.get('type', 'unknown')}"
+                latest[key] = max(latest.get(key, current.get(key, 0)), metadata['date_key'])
+        if latest:
+            self.collection.modify(metadata={**current, **latest})
+        if self.partition_by_type:
+            self._build_partitions(ids, documents, metadatas)
+        if self.sparse_index is not None:
+            self.sparse_index.upsert(ids, documents, metadatas)
+    
+    def delete_documents(self, ids: List[str]) -> None:
+        """
+        Remove documents from the collection, every type partition and the BM25 index.
         
-        print(f"[INFO] Successfully built index with {len(documents)} documents")
+        Args:
+            ids: Document ids
+        """
+        if not ids:
+            return
+        self.collection.delete(ids=list(ids))
+        for partition in self._all_partitions().values():
+            self._delete_from_partition(partition, list(ids))
+        if self.sparse_index is not None:
+            self.sparse_index.delete(ids)
     
-    def search(self, query: str, top_k: int = 5, filter_dict: Optional[Dict] = None) -> List[Dict]:
+    def rebuild_sparse_index(self) -> None:
+        """
+        Build the BM25 index from the documents already in the collection,
+        for indexes created before hybrid search was enabled.
+        """
+        if self.sparse_index is None:
+            return
+        stored = self.collection.get(include=['documents', 'metadatas'])
+        self.sparse_index.upsert(stored['ids'], stored['documents'], stored['metadatas'])
+        print(f"[INFO] BM25 index rebuilt with {len(self.sparse_index)} documents")
+    
+    def _partition_name(self, chunk_type: str) -> str:
+        return f"{self.collection_name}{PARTITION_SEPARATOR}{re.sub(r'[^A-Za-z0-9_-]', '_', chunk_type)}"
+    
+    def _get_partition(self, chunk_type: str):
+        """
+        Per-type collection, or None when the index has no such partition.
+        Misses are remembered for PARTITION_MISS_TTL seconds, so partitions
+        created later by another process (a corpus build) are still picked up.
+        """
+        if chunk_type in self._partitions:
+            return self._partitions[chunk_type]
+        missed_at = self._partition_misses.get(chunk_type)
+        if missed_at is not None and time.monotonic() - missed_at < PARTITION_MISS_TTL:
+            return None
+        try:
+            partition = self.client.get_collection(
+                name=self._partition_name(chunk_type), **self._collection_kwargs)
+        except Exception:
+            self._partition_misses[chunk_type] = time.monotonic()
+            return None
+        self._partitions[chunk_type] = partition
+        self._partition_misses.pop(chunk_type, None)
+        return partition
+    
+    def _all_partitions(self) -> Dict[str, object]:
+        """Every type partition of this collection, by partition name."""
+        prefix = f"{self.collection_name}{PARTITION_SEPARATOR}"
+        # list_collections returns names in older Chroma versions, collections in newer ones
+        names = [getattr(c, 'name', c) for c in self.client.list_collections()]
+        return {name: self.client.get_collection(name=name, **self._collection_kwargs)
+                for name in names if name.startswith(prefix)}
+    
+    @staticmethod
+    def _delete_from_partition(partition, ids: List[str]) -> None:
+        """Delete ids from a partition and recompute its newest date if any were there."""
+        present = partition.get(ids=ids, include=[])['ids'] if ids else []
+        if not present:
+            return
+        partition.delete(ids=present)
+        keys = [m['date_key'] for m in partition.get(include=['metadatas'])['metadatas'] if m and 'date_key' in m]
+        partition.modify(metadata={**(partition.metadata or {}), 'latest_date_key': max(keys) if keys else 0})
+    
+    def _build_partitions(self, ids: List[str], documents: List[str], metadatas: List[Dict]) -> None:
+        """
+        Copy each chunk type into its own collection, reusing the embeddings
+        just computed for the main collection. Documents whose type changed are
+        removed from their old partition.
+        """
+        # get() returns rows in storage order, not in the order of ids
+        stored = self.collection.get(ids=ids, include=['embeddings'])
+        embeddings = dict(zip(stored['ids'], stored['embeddings']))
+        by_type: Dict[str, List[int]] = {}
+        for i, metadata in enumerate(metadatas):
+            by_type.setdefault(str(metadata.get('type', 'unknown')), []).append(i)
+        partition_ids = {self._partition_name(t): {ids[i] for i in rows} for t, rows in by_type.items()}
+        for name, partition in self._all_partitions().items():
+            moved = [doc_id for doc_id in ids if doc_id not in partition_ids.get(name, ())]
+            self._delete_from_partition(partition, moved)
+        for chunk_type, rows in by_type.items():
+            partition = self.client.get_or_create_collection(
+                name=self._partition_name(chunk_type), **self._collection_kwargs)
+            partition.upsert(
+                ids=[ids[i] for i in rows],
+                documents=[documents[i] for i in rows],
+                metadatas=[metadatas[i] for i in rows],
+                embeddings=[embeddings[ids[i]] for i in rows]
+            )
+            # newest dated chunk, the reference point for "recent" windows
+            keys = [metadatas[i]['date_key'] for i in rows if 'date_key' in metadatas[i]]
+            latest = max(keys + [(partition.metadata or {}).get('latest_date_key', 0)]) if keys else None
+            if latest:
+                partition.modify(metadata={**(partition.metadata or {}), 'latest_date_key': latest})
+            self._partitions[chunk_type] = partition
+            self._partition_misses.pop(chunk_type, None)
+            print(f"[INFO] Partition '{chunk_type}': {partition.count()} documents")
+    
+    def search(self, query: str, top_k: int = 5, filter_dict: Optional[Dict] = None,
+               query_embedding=None, chunk_types: Optional[List[str]] = None,
+               within_days: Optional[int] = None) -> List[Dict]:
         """
         Search for relevant documents.
         
@@ -76,28 +274,141 @@ class ChromaDBRetriever:
             query: Search query
             top_k: Number of results to return
             filter_dict: Optional filter for metadata
+            query_embedding: Precomputed embedding of the query from the same model
+                as the collection (all-MiniLM-L6-v2 by default); skips embedding the
+                query text again
+            chunk_types: Only search chunks of these metadata types
+            within_days: With chunk_types, only chunks dated at most this many days
+                before the newest chunk of their type
             
         Returns:
-            List of relevant documents with metadata
+            List of relevant documents with metadata. With hybrid search each
+            document also carries its reciprocal-rank-fusion score as 'rrf_score'.
+        """
+        if query_embedding is not None:
+            query_kwargs = {'query_embeddings': [np.asarray(query_embedding, dtype=np.float32).ravel().tolist()]}
+        else:
+            query_kwargs = {'query_texts': [query]}
+        
+        # BM25 filtering supports chunk types and dates, not arbitrary where-filters
+        hybrid = self.sparse_index is not None and len(self.sparse_index) > 0 and filter_dict is None
+        n_candidates = max(top_k, self.hybrid_candidates) if hybrid else top_k
+        
+        # Hybrid candidates only need ids and distances; text is fetched for the fused top_k
+        query_kwargs['include'] = ['distances'] if hybrid else ['documents', 'metadatas', 'distances']
+        
+        dense = []
+        if chunk_types:
+            dense = self._search_types(chunk_types, n_candidates, filter_dict, within_days, query_kwargs)
+            if not dense:
+                print(f"[INFO] No {chunk_types} chunks matched, searching the full collection")
+                chunk_types, within_days = None, None
+        if not chunk_types:
+            dense = self._query(self.collection, n_candidates, filter_dict, query_kwargs)
+        
+        if not hybrid:
+            return dense[:top_k]
+        sparse = self.sparse_index.search(query, n_candidates, chunk_types=chunk_types, within_days=within_days)
+        return self._fuse(dense, sparse, top_k)
+    
+    def _fuse(self, dense: List[Dict], sparse: List, top_k: int) -> List[Dict]:
+        """
+        Reciprocal-rank fusion of the dense results and the BM25 (id, score) list:
+        score(d) = sum over rankings of 1 / (rrf_k + rank).
+        """
+        scores: Dict[str, float] = {}
+        for rank, doc in enumerate(dense):
+            scores[doc['id']] = scores.get(doc['id'], 0.0) + 1.0 / (self.rrf_k + rank + 1)
+        for rank, (doc_id, _) in enumerate(sparse):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (self.rrf_k + rank + 1)
+        best = sorted(scores, key=lambda doc_id: -scores[doc_id])[:top_k]
+        
+        # One lookup for the text and metadata of the fused results
+        distances = {doc['id']: doc['distance'] for doc in dense}
+        stored = self.collection.get(ids=best, include=['documents', 'metadatas'])
+        docs = {
+            doc_id: {
+                'id': doc_id,
+                'text': stored['documents'][i],
+                'metadata': stored['metadatas'][i] or {},
+                'distance': distances.get(doc_id)
+            }
+            for i, doc_id in enumerate(stored['ids'])
+        }
+        return [{**docs[doc_id], 'rrf_score': scores[doc_id]} for doc_id in best if doc_id in docs]
+    
+    def _search_types(self, chunk_types: List[str], top_k: int, filter_dict: Optional[Dict],
+                      within_days: Optional[int], query_kwargs: Dict) -> List[Dict]:
+        """
+        Search only the given chunk types: one query per existing type partition,
+        merged by distance. Types without a partition have no chunks in a
+        partitioned index. Falls back to a type filter on the main collection for
+        indexes built without partitions.
         """
-        results = self.collection.query(
-            query_texts=[query],
-            n_results=top_k,
-            where=filter_dict
+        partitions = [self._get_partition(t) for t in chunk_types] if self.partition_by_type else []
+        partitions = [partition for partition in partitions if partition is not None]
+        if not partitions:
+            where = _and_filters(filter_dict, self._type_filter(chunk_types, within_days))
+            return self._query(self.collection, top_k, where, query_kwargs)
+        
+        merged = []
+        for partition in partitions:
+            where = filter_dict
+            latest = (partition.metadata or {}).get('latest_date_key')
+            if within_days is not None and latest:
+                where = _and_filters(where, {'date_key': {'$gte': shift_date_key(latest, within_days)}})
+            merged.extend(self._query(partition, top_k, where, query_kwargs))
+        merged.sort(key=lambda doc: doc['distance'] if doc['distance'] is not None else float('inf'))
+        return merged[:top_k]
+    
+    def _type_filter(self, chunk_types: List[str], within_days: Optional[int]) -> Dict:
+        """Where-filter for chunk types on the main collection, each with its own recency window."""
+        if within_days is None:
+            return {'type': {'$in': list(chunk_types)}}
+        metadata = self.collection.metadata or {}
+        conditions = []
+        for chunk_type in chunk_types:
+            latest = metadata.get(f"latest_date_key{PARTITION_SEPARATOR}{chunk_type}")
+            condition = {'type': chunk_type}
+            if latest:
+                condition = {'$and': [condition, {'date_key': {'$gte': shift_date_key(latest, within_days)}}]}
+            conditions.append(condition)
+        return conditions[0] if len(conditions) == 1 else {'$or': conditions}
+    
+    def _query(self, collection, top_k: int, where: Optional[Dict], query_kwargs: Dict) -> List[Dict]:
+        n_results = min(top_k, collection.count())
+        if n_results == 0:
+            return []
+        results = collection.query(
+            n_results=n_results,
+            where=where,
+            **query_kwargs
         )
         
         # Format results
         formatted_results = []
-        if results['documents'] and results['documents'][0]:
-            for i, doc in enumerate(results['documents'][0]):
+        if results['ids'] and results['ids'][0]:
+            for i, doc_id in enumerate(results['ids'][0]):
                 formatted_results.append({
-                    'text': doc,
-                    'metadata': results['metadatas'][0][i] if results['metadatas'] and results['metadatas'][0] else {},
-                    'distance': results['distances'][0][i] if results['distances'] and results['distances'][0] else None
+                    'id': doc_id,
+                    'text': results['documents'][0][i] if results.get('documents') else None,
+                    'metadata': results['metadatas'][0][i] if results.get('metadatas') and results['metadatas'][0] else {},
+                    'distance': results['distances'][0][i] if results.get('distances') and results['distances'][0] else None
                 })
         
         return formatted_results
     
+    def get_corpus_version(self) -> str:
+        """
+        Identify the current contents of the index.
+        Changes whenever the index is rebuilt or documents are added.
+        
+        Returns:
+            Version string
+        """
+        metadata = self.collection.metadata or {}
+        return f"{metadata.get('corpus_version', 'unversioned')}:{self.collection.count()}"
+    
     def get_collection_stats(self) -> Dict:
         """
         Get statistics about the collection.
@@ -108,9 +419,17 @@ class ChromaDBRetriever:
         count = self.collection.count()
         return {
             'total_documents': count,
-            'collection_name': self.collection_name
+            'collection_name': self.collection_name,
+            'bm25_documents': len(self.sparse_index) if self.sparse_index is not None else None
         }
 
+def _and_filters(*filters: Optional[Dict]) -> Optional[Dict]:
+    """Combine Chroma where-filters with $and, skipping empty ones."""
+    filters = [f for f in filters if f]
+    if not filters:
+        return None
+    return filters[0] if len(filters) == 1 else {'$and': filters}
+
 def build_chroma_index(jsonl_file_path: str, collection_name: str = "nog_corpus") -> ChromaDBRetriever:
     """
     Build ChromaDB index from JSONL file.
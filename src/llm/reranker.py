@@ -0,0 +1,104 @@
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from src.llm.answer_cache import normalize_query
+
+DEFAULT_MODEL = 'cross-encoder/ms-marco-MiniLM-L-6-v2'
+
+
+class CrossEncoderReranker:
+    """
+    Rescores retrieved chunks with a small cross-encoder on CPU.
+
+    All uncached (query, chunk) pairs of a call are scored in one batched
+    predict(). Scores are kept in an LRU keyed on (query hash, chunk id), so a
+    repeated question only scores chunks it has not seen before.
+    """
+
+    def __init__(self, model=None, model_name: str = DEFAULT_MODEL, max_cache_entries: int = 10000,
+                 batch_size: int = 32):
+        """
+        Args:
+            model: Object with the CrossEncoder predict(pairs) API, defaults to model_name loaded on first use
+            model_name: Hugging Face cross-encoder to load
+            max_cache_entries: Number of (query, chunk) scores kept
+            batch_size: Pairs per forward pass inside predict()
+        """
+        self._model = model
+        self.model_name = model_name
+        self.max_cache_entries = max_cache_entries
+        self.batch_size = batch_size
+        self.stats = {"scored": 0, "cached": 0, "batches": 0}
+        self._scores: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        # server worker threads share the LRU; the model runs outside the lock
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config=None) -> Optional['CrossEncoderReranker']:
+        """Reranker configured under retrieval.rerank, or None when disabled."""
+        if config is None:
+            from src.config import get_config
+            config = get_config()
+        settings = config.get('retrieval', 'rerank', {})
+        if not settings.get('enabled', False):
+            return None
+        return cls(model_name=settings.get('model', DEFAULT_MODEL),
+                   max_cache_entries=settings.get('max_cache_entries', 10000))
+
+    @property
+    def model(self):
+        """Cross-encoder, loaded lazily on CPU."""
+        if self._model is None:
+            from sentence_transformers import CrossEncoder
+            self._model = CrossEncoder(self.model_name, device='cpu')
+        return self._model
+
+    @staticmethod
+    def _chunk_key(doc: Dict) -> str:
+        # the text checksum keeps scores from going stale when an id is upserted with new text
+        return f"{doc.get('id', '')}:{zlib.crc32(doc['text'].encode()):08x}"
+
+    def rerank(self, query: str, docs: List[Dict], top_k: int) -> List[Dict]:
+        """
+        Order docs by cross-encoder relevance.
+
+        Args:
+            query: User query
+            docs: Candidates from ChromaDBRetriever.search
+            top_k: Number of documents to keep
+
+        Returns:
+            Best top_k documents, each with a 'rerank_score'
+        """
+        if not docs:
+            return []
+        query_hash = hashlib.sha1(normalize_query(query).encode()).hexdigest()
+        keys = [(query_hash, self._chunk_key(doc)) for doc in docs]
+
+        found: Dict[Tuple[str, str], float] = {}
+        pending = {}
+        with self._lock:
+            for key, doc in zip(keys, docs):
+                if key in self._scores:
+                    self._scores.move_to_end(key)
+                    found[key] = self._scores[key]
+                    self.stats["cached"] += 1
+                elif key not in pending:
+                    pending[key] = doc['text']
+        if pending:
+            scores = self.model.predict([(query, text) for text in pending.values()],
+                                        batch_size=self.batch_size, show_progress_bar=False)
+            with self._lock:
+                self.stats["batches"] += 1
+                self.stats["scored"] += len(pending)
+                for key, score in zip(pending, scores):
+                    found[key] = self._scores[key] = float(score)
+                while len(self._scores) > self.max_cache_entries:
+                    self._scores.popitem(last=False)
+
+        scored = [{**doc, 'rerank_score': found[key]} for key, doc in zip(keys, docs)]
+        scored.sort(key=lambda doc: -doc['rerank_score'])
+        return scored[:top_k]
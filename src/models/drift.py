@@ -0,0 +1,259 @@
+import datetime
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.features.feature_matrix import FeatureMatrix
+
+
+def population_stability_index(expected: np.ndarray, actual: np.ndarray, bins: int = 10) -> float:
+    """
+    PSI of a sample against a reference sample, on the reference's quantile bins.
+
+    Args:
+        expected: Reference values (e.g. the training snapshot quantiles)
+        actual: Recent values
+        bins: Number of quantile bins
+
+    Returns:
+        PSI, NaN when either sample has no finite values. Below 0.1 is usually
+        read as stable, above 0.25 as a significant shift
+    """
+    expected = expected[np.isfinite(expected)]
+    actual = actual[np.isfinite(actual)]
+    if not len(expected) or not len(actual):
+        return float('nan')
+    edges = np.unique(np.quantile(expected, np.linspace(0, 1, bins + 1))[1:-1])
+    expected_share = np.bincount(np.searchsorted(edges, expected, side='right'),
+                                 minlength=len(edges) + 1) / len(expected)
+    actual_share = np.bincount(np.searchsorted(edges, actual, side='right'),
+                               minlength=len(edges) + 1) / len(actual)
+    # Empty bins would make the log infinite
+    expected_share = np.clip(expected_share, 1e-4, None)
+    actual_share = np.clip(actual_share, 1e-4, None)
+    return float(np.sum((actual_share - expected_share) * np.log(actual_share / expected_share)))
+
+
+def ks_statistic(expected: np.ndarray, actual: np.ndarray) -> float:
+    """
+    Two-sample Kolmogorov-Smirnov statistic: the largest gap between the two
+    empirical CDFs. NaN when either sample has no finite values.
+    """
+    expected = np.sort(expected[np.isfinite(expected)])
+    actual = np.sort(actual[np.isfinite(actual)])
+    if not len(expected) or not len(actual):
+        return float('nan')
+    grid = np.concatenate([expected, actual])
+    gap = np.searchsorted(expected, grid, side='right') / len(expected) - \
+        np.searchsorted(actual, grid, side='right') / len(actual)
+    return float(np.abs(gap).max())
+
+
+def horizon_mae(predictions: np.ndarray, actuals: np.ndarray, max_horizon: int = 5) -> float:
+    """
+    MAE of predictions made on each row against the actuals 1..max_horizon rows later.
+
+    Live forecasts reuse the latest row's prediction for every day of the
+    coming week, so this is the backtest error comparable to their live error;
+    the same-row test MAE is far smaller.
+
+    Args:
+        predictions: Model output per row, chronological
+        actuals: Realized target per row
+        max_horizon: Longest forecast horizon in rows
+
+    Returns:
+        Mean absolute error over all horizons, NaN when there are too few rows
+    """
+    predictions = np.asarray(predictions, dtype=np.float64)
+    actuals = np.asarray(actuals, dtype=np.float64)
+    errors = [np.abs(predictions[:-h] - actuals[h:]) for h in range(1, max_horizon + 1) if h < len(actuals)]
+    return float(np.concatenate(errors).mean()) if errors else float('nan')
+
+
+class TrainingSnapshot:
+    """
+    What the saved model was trained on, kept for drift checks.
+
+    Holds per-feature quantiles of the reference rows rather than the rows
+    themselves, so the snapshot stays a few KB regardless of history length.
+    Stored as a single .npz next to the model.
+    """
+
+    def __init__(self, feature_columns: List[str], quantiles: np.ndarray, model_version: str,
+                 trained_at: str, train_end: str, baseline_mae: float):
+        """
+        Args:
+            feature_columns: Feature names, one per quantiles column
+            quantiles: float64 array of shape (n_quantiles, n_features)
+            model_version: Version of the model trained on these rows
+            trained_at: ISO timestamp of the training run
+            train_end: Last date of the training data
+            baseline_mae: horizon_mae of the model on the held-out test split
+        """
+        self.feature_columns = list(feature_columns)
+        self.quantiles = np.asarray(quantiles, dtype=np.float64)
+        self.model_version = model_version
+        self.trained_at = trained_at
+        self.train_end = train_end
+        self.baseline_mae = float(baseline_mae)
+
+    @classmethod
+    def from_matrix(cls, matrix: FeatureMatrix, model_version: str, baseline_mae: float,
+                    reference_rows: Optional[int] = 63, n_quantiles: int = 101) -> 'TrainingSnapshot':
+        """
+        Snapshot the last reference_rows rows of the training matrix (all rows when None).
+        Use the same number of rows as the recent window of the drift check: a
+        short slice of a trending feature always looks shifted against a long
+        history, so comparing windows of equal length only flags real moves.
+        """
+        reference = matrix.values if reference_rows is None else matrix.values[-reference_rows:]
+        with np.errstate(all='ignore'):
+            quantiles = np.nanquantile(reference.astype(np.float64), np.linspace(0, 1, n_quantiles), axis=0)
+        train_end = str(pd.Timestamp(matrix.dates[-1]).date()) if matrix.dates is not None else ''
+        return cls(matrix.feature_columns, quantiles, model_version,
+                   datetime.datetime.now().isoformat(), train_end, baseline_mae)
+
+    def save(self, path: str) -> None:
+        """Write the snapshot as an .npz, atomically."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, feature_columns=np.array(self.feature_columns), quantiles=self.quantiles,
+                 model_version=self.model_version, trained_at=self.trained_at,
+                 train_end=self.train_end, baseline_mae=self.baseline_mae)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'TrainingSnapshot':
+        with np.load(path) as data:
+            return cls([str(c) for c in data['feature_columns']], data['quantiles'],
+                       str(data['model_version']), str(data['trained_at']),
+                       str(data['train_end']),
+                       # older snapshots only have the same-row test MAE, which is no baseline
+                       float(data['baseline_mae']) if 'baseline_mae' in data.files else float('nan'))
+
+
+def feature_drift(snapshot: TrainingSnapshot, matrix: FeatureMatrix, recent_rows: int = 63,
+                  bins: int = 5) -> pd.DataFrame:
+    """
+    PSI and KS of the last recent_rows rows of every snapshot feature.
+
+    Returns:
+        DataFrame with feature, psi and ks, most drifted first. Features the
+        matrix no longer has get NaN scores
+    """
+    columns = {name: j for j, name in enumerate(matrix.feature_columns)}
+    recent = matrix.values[-recent_rows:].astype(np.float64)
+    rows = []
+    for j, name in enumerate(snapshot.feature_columns):
+        if name in columns:
+            values = recent[:, columns[name]]
+            rows.append((name, population_stability_index(snapshot.quantiles[:, j], values, bins),
+                         ks_statistic(snapshot.quantiles[:, j], values)))
+        else:
+            rows.append((name, np.nan, np.nan))
+    drift = pd.DataFrame(rows, columns=['feature', 'psi', 'ks'])
+    return drift.sort_values('psi', ascending=False, na_position='last').reset_index(drop=True)
+
+
+def error_drift(scored: pd.DataFrame, window: int = 20) -> Dict:
+    """
+    Live error level and trend of the model's last `window` scored predictions.
+
+    Args:
+        scored: scoring.score_predictions output for one model version
+
+    Returns:
+        Dictionary with n, live_mae, older_mae and recent_mae (MAE of the
+        older and newer half of the window) and error_trend (recent_mae over
+        older_mae; NaN with fewer than 4 predictions)
+    """
+    recent = scored.sort_values(['target_date', 'run_date'])['abs_error'].to_numpy()[-window:]
+    if not len(recent):
+        return {'n': 0, 'live_mae': float('nan'), 'older_mae': float('nan'),
+                'recent_mae': float('nan'), 'error_trend': float('nan')}
+    half = len(recent) // 2
+    older_mae = float(recent[:half].mean()) if half >= 2 else float('nan')
+    recent_mae = float(recent[half:].mean())
+    trend = recent_mae / older_mae if older_mae > 0 else float('nan')
+    return {'n': int(len(recent)), 'live_mae': float(recent.mean()), 'older_mae': older_mae,
+            'recent_mae': recent_mae, 'error_trend': trend}
+
+
+def detect_drift(snapshot: TrainingSnapshot, matrix: FeatureMatrix, scored: Optional[pd.DataFrame] = None,
+                 settings: Optional[Dict] = None, min_predictions: int = 5,
+                 today: Optional[datetime.date] = None) -> Dict:
+    """
+    Decide whether the saved model is stale.
+
+    Retraining is due when any of these holds:
+      - the share of features whose recent PSI or KS crosses its threshold
+        reaches drifted_feature_share
+      - the live MAE exceeds error_ratio_threshold times the backtest MAE at
+        the same horizons (snapshot.baseline_mae)
+      - the live MAE of the newer half of the error window exceeds
+        error_trend_threshold times that of the older half, or the backtest
+        MAE when that is larger (a rise from unusually small errors is no decay)
+      - the model is older than max_model_age_days
+
+    Args:
+        snapshot: Snapshot saved when the model was trained
+        matrix: Current feature matrix
+        scored: Live residuals of the snapshot's model version
+        settings: monitoring.drift config
+        min_predictions: Scored predictions needed before the error checks apply
+        today: Date the model age is measured against, defaults to today
+
+    Returns:
+        Dictionary with retrain, the reasons, the drifted features and the
+        measured statistics
+    """
+    settings = settings or {}
+    today = today or datetime.date.today()
+    psi_threshold = settings.get('psi_threshold', 0.25)
+    ks_threshold = settings.get('ks_threshold', 0.3)
+    reasons = []
+
+    drift = feature_drift(snapshot, matrix, settings.get('recent_rows', 63), settings.get('bins', 5))
+    drifted = drift[(drift['psi'] > psi_threshold) | (drift['ks'] > ks_threshold)]
+    drifted_share = len(drifted) / max(len(drift), 1)
+    if len(drifted) and drifted_share >= settings.get('drifted_feature_share', 0.5):
+        top = ', '.join(f"{row.feature} (PSI {row.psi:.2f}, KS {row.ks:.2f})"
+                        for row in drifted.head(3).itertuples(index=False))
+        reasons.append(f"{len(drifted)} of {len(drift)} features drifted: {top}")
+
+    if scored is None:
+        scored = pd.DataFrame(columns=['target_date', 'run_date', 'abs_error'])
+    errors = error_drift(scored, settings.get('error_window', 20))
+    error_ratio = errors['live_mae'] / snapshot.baseline_mae if snapshot.baseline_mae > 0 else float('nan')
+    if errors['n'] >= min_predictions:
+        ratio_threshold = settings.get('error_ratio_threshold', 2.0)
+        if error_ratio > ratio_threshold:
+            reasons.append(f"Live MAE {errors['live_mae']:.3f} is {error_ratio:.1f}x the backtest MAE "
+                           f"{snapshot.baseline_mae:.3f} (threshold {ratio_threshold}x)")
+        trend_threshold = settings.get('error_trend_threshold', 1.5)
+        if snapshot.baseline_mae > 0 and errors['older_mae'] < snapshot.baseline_mae:
+            errors['error_trend'] = errors['recent_mae'] / snapshot.baseline_mae
+        if errors['error_trend'] > trend_threshold:
+            reasons.append(f"Live errors grew {errors['error_trend']:.1f}x over the last "
+                           f"{errors['n']} predictions (threshold {trend_threshold}x)")
+
+    model_age_days = (today - pd.Timestamp(snapshot.trained_at).date()).days
+    max_age = settings.get('max_model_age_days')
+    if max_age is not None and model_age_days > max_age:
+        reasons.append(f"Model is {model_age_days} days old (max {max_age})")
+
+    return {
+        'retrain': bool(reasons),
+        'reasons': reasons,
+        'model_version': snapshot.model_version,
+        'model_age_days': model_age_days,
+        'drifted_share': float(drifted_share),
+        'drifted_features': drifted['feature'].tolist(),
+        'live_mae': errors['live_mae'],
+        'error_ratio': float(error_ratio),
+        'error_trend': errors['error_trend'],
+        'scored_predictions': errors['n'],
+    }
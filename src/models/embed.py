@@ -1,16 +1,23 @@
 import os 
 import numpy as np
 import pandas as pd
-from openai import OpenAI
-from dotenv import load_dotenv
-from sentence_transformers import SentenceTransformer
 
-api_key = os.getenv("OPENAI_API_KEY")
+_client = None
 
-if not api_key:
-    raise ValueError("OPENAI_API_KEY not found in environment variables.")
-
-client = OpenAI(api_key=api_key)
+def get_client():
+    """
+    OpenAI client, created on first use so importing this module needs no API key.
+    Return:
+        OpenAI client
+    """
+    global _client
+    if _client is None:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY not found in environment variables.")
+        from openai import OpenAI
+        _client = OpenAI(api_key=api_key)
+    return _client
 
 def get_news_feature_to_embed():
     new_df = pd.read_csv('data/NOG_news_2years.csv')
@@ -18,6 +25,7 @@ def get_news_feature_to_embed():
     return content_list
 
 def embed_news():
+    from sentence_transformers import SentenceTransformer
     model = SentenceTransformer()
     content_list = get_news_feature_to_embed()
     embeddings = model.encode(content_list, show_progress_bar=True)
@@ -34,7 +42,7 @@ def embed_text(texts):
     """
     embeddings = []
     for text in texts:
-        response = client.embeddings.create(
+        response = get_client().embeddings.create(
             model = 'text-embedding-ada-002',
             input=text
         )
@@ -51,7 +59,7 @@ def embed_image(image_path):
     """
     with open(image_path, 'rb') as f:
         img_bytes = f.read()
-    response = client.embeddings.create(
+    response = get_client().embeddings.create(
         model='clip-vit-base-patch32',
         input=img_bytes
     ) 
@@ -0,0 +1,269 @@
+import datetime
+import json
+import os
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class HistoryStore:
+    """
+    Append-only history of predictions and model performance in SQLite.
+
+    Every run inserts its rows and never rewrites older ones, so a write costs
+    the same no matter how long the history is. Rows are indexed by run date,
+    ticker and model version, which keeps range queries (e.g. all forecasts
+    for a date range when scoring against actuals) and retention cheap.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: SQLite file, None keeps the history in memory
+        """
+        self.path = path
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path or ':memory:', check_same_thread=False)
+        self._db.executescript(
+            """CREATE TABLE IF NOT EXISTS predictions (
+                   run_date TEXT NOT NULL,
+                   ticker TEXT NOT NULL,
+                   model_version TEXT NOT NULL,
+                   target_date TEXT NOT NULL,
+                   horizon INTEGER NOT NULL,
+                   predicted_price REAL NOT NULL,
+                   lower REAL,
+                   upper REAL,
+                   confidence_level REAL,
+                   generated_at TEXT NOT NULL,
+                   PRIMARY KEY (run_date, ticker, model_version, target_date));
+               CREATE INDEX IF NOT EXISTS predictions_by_target ON predictions (ticker, target_date);
+               CREATE INDEX IF NOT EXISTS predictions_by_version ON predictions (model_version, run_date);
+               CREATE TABLE IF NOT EXISTS performance (
+                   run_date TEXT NOT NULL,
+                   ticker TEXT NOT NULL,
+                   model_version TEXT NOT NULL,
+                   mse REAL,
+                   mae REAL,
+                   r2 REAL,
+                   payload TEXT NOT NULL,
+                   PRIMARY KEY (run_date, ticker, model_version));
+               CREATE TABLE IF NOT EXISTS live_metrics (
+                   scored_on TEXT NOT NULL,
+                   model_version TEXT NOT NULL,
+                   window_size INTEGER NOT NULL,
+                   n INTEGER NOT NULL,
+                   first_target_date TEXT,
+                   last_target_date TEXT,
+                   mae REAL,
+                   bias REAL,
+                   coverage REAL,
+                   r2 REAL,
+                   PRIMARY KEY (scored_on, model_version, window_size));
+               CREATE TABLE IF NOT EXISTS retrain_decisions (
+                   checked_at TEXT NOT NULL,
+                   ticker TEXT NOT NULL,
+                   model_version TEXT,
+                   retrain INTEGER NOT NULL,
+                   reasons TEXT NOT NULL,
+                   payload TEXT NOT NULL,
+                   PRIMARY KEY (checked_at, ticker));"""
+        )
+        self._db.commit()
+
+    @classmethod
+    def from_config(cls, config=None) -> 'HistoryStore':
+        if config is None:
+            from src.config import get_config
+            config = get_config()
+        return cls(config.path('history_db_path'))
+
+    def add_predictions(self, predictions: List[Dict], ticker: str = 'NOG',
+                        model_version: str = 'unknown', run_date: Optional[str] = None) -> int:
+        """
+        Record one run's predictions. Re-running the same day with the same model
+        replaces that run's rows instead of duplicating them.
+
+        Args:
+            predictions: Prediction dicts from generate_weekly_predictions
+            ticker: Ticker the predictions are for
+            model_version: Identifier of the model that made them
+            run_date: Date the predictions were made, defaults to their prediction_date
+
+        Returns:
+            Number of rows written
+        """
+        generated_at = datetime.datetime.now().isoformat()
+        rows = []
+        for pred in predictions:
+            made_on = run_date or pred.get('prediction_date') or datetime.date.today().isoformat()
+            interval = pred.get('confidence_interval') or {}
+            rows.append((made_on, ticker, model_version, pred['date'],
+                         int(np.busday_count(made_on, pred['date'])), float(pred['predicted_price']),
+                         interval.get('lower'), interval.get('upper'), interval.get('confidence_level'),
+                         generated_at))
+        self._db.executemany("INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        self._db.commit()
+        return len(rows)
+
+    def add_performance(self, performance: Dict, ticker: str = 'NOG', model_version: str = 'unknown',
+                        run_date: Optional[str] = None) -> None:
+        """
+        Record the test metrics of one training run.
+
+        Args:
+            performance: Output of train_weekly_model
+            ticker: Ticker the model predicts
+            model_version: Identifier of the trained model
+            run_date: Training date, defaults to the performance's training_date
+        """
+        run_date = run_date or performance.get('training_date') or datetime.datetime.now().isoformat()
+        metrics = performance.get('metrics', {})
+        self._db.execute("INSERT OR REPLACE INTO performance VALUES (?, ?, ?, ?, ?, ?, ?)",
+                         (run_date, ticker, model_version, metrics.get('MSE'), metrics.get('MAE'),
+                          metrics.get('R2'), json.dumps(performance, default=str)))
+        self._db.commit()
+
+    def predictions(self, start: Optional[str] = None, end: Optional[str] = None,
+                    ticker: Optional[str] = None, model_version: Optional[str] = None) -> pd.DataFrame:
+        """
+        Stored predictions whose target date falls in [start, end].
+
+        Args:
+            start: First target date (YYYY-MM-DD), open when None
+            end: Last target date, open when None
+            ticker: Only this ticker
+            model_version: Only this model version
+
+        Returns:
+            DataFrame with one row per prediction, ordered by target date and run date
+        """
+        clauses, params = [], []
+        for column, op, value in (('target_date', '>=', start), ('target_date', '<=', end),
+                                  ('ticker', '=', ticker), ('model_version', '=', model_version)):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(str(value))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        df = pd.read_sql_query(f"SELECT * FROM predictions {where} ORDER BY target_date, run_date",
+                               self._db, params=params)
+        for column in ('run_date', 'target_date'):
+            df[column] = pd.to_datetime(df[column])
+        return df
+
+    def predictions_version(self) -> Tuple[int, Optional[str]]:
+        """
+        Cheap fingerprint of the predictions table: row count and the newest
+        generated_at. Changes on appended runs and on same-day reruns that
+        replace rows, without loading the table.
+        """
+        count, latest = self._db.execute("SELECT COUNT(*), MAX(generated_at) FROM predictions").fetchone()
+        return int(count), latest
+
+    def performance(self, ticker: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Training results, oldest first.
+
+        Args:
+            ticker: Only this ticker
+            limit: Return only the most recent runs
+
+        Returns:
+            List of the performance dicts passed to add_performance
+        """
+        query = "SELECT payload FROM performance"
+        params = []
+        if ticker is not None:
+            query += " WHERE ticker = ?"
+            params.append(ticker)
+        query += " ORDER BY run_date DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(int(limit))
+        rows = self._db.execute(query, params).fetchall()
+        return [json.loads(payload) for (payload,) in reversed(rows)]
+
+    def add_live_metrics(self, summary: pd.DataFrame, scored_on: str, window: int) -> int:
+        """
+        Record live forecast-vs-actual metrics per model version.
+
+        Args:
+            summary: Output of scoring.summarize_live_metrics
+            scored_on: Date of the scoring run
+            window: Rolling window the metrics were computed over
+
+        Returns:
+            Number of rows written
+        """
+        rows = [(scored_on, str(r.model_version), int(window), int(r.n),
+                 pd.Timestamp(r.first_target_date).strftime('%Y-%m-%d'),
+                 pd.Timestamp(r.last_target_date).strftime('%Y-%m-%d'),
+                 *(None if pd.isna(v) else float(v) for v in (r.mae, r.bias, r.coverage, r.r2)))
+                for r in summary.itertuples(index=False)]
+        self._db.executemany("INSERT OR REPLACE INTO live_metrics VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        self._db.commit()
+        return len(rows)
+
+    def live_metrics(self, model_version: Optional[str] = None) -> pd.DataFrame:
+        """Recorded live metrics, ordered by scoring date."""
+        query, params = "SELECT * FROM live_metrics", []
+        if model_version is not None:
+            query += " WHERE model_version = ?"
+            params.append(model_version)
+        return pd.read_sql_query(query + " ORDER BY scored_on, model_version", self._db, params=params)
+
+    def add_retrain_decision(self, decision: Dict, ticker: str = 'NOG',
+                             checked_at: Optional[str] = None) -> None:
+        """
+        Record whether a run retrained the model and why.
+
+        Args:
+            decision: Output of drift.detect_drift (retrain, reasons, statistics)
+            ticker: Ticker the model predicts
+            checked_at: Time of the check, defaults to now
+        """
+        checked_at = checked_at or datetime.datetime.now().isoformat()
+        self._db.execute("INSERT OR REPLACE INTO retrain_decisions VALUES (?, ?, ?, ?, ?, ?)",
+                         (checked_at, ticker, decision.get('model_version'), int(bool(decision['retrain'])),
+                          json.dumps(decision.get('reasons', [])), json.dumps(decision, default=str)))
+        self._db.commit()
+
+    def retrain_decisions(self, ticker: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
+        """Recorded retrain decisions, oldest first."""
+        query, params = "SELECT checked_at, payload FROM retrain_decisions", []
+        if ticker is not None:
+            query += " WHERE ticker = ?"
+            params.append(ticker)
+        query += " ORDER BY checked_at DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(int(limit))
+        rows = self._db.execute(query, params).fetchall()
+        return [dict(json.loads(payload), checked_at=checked_at) for checked_at, payload in reversed(rows)]
+
+    def drop_before(self, cutoff: str, tables=('predictions', 'performance')) -> int:
+        """
+        Retention: delete every run made before the cutoff date.
+
+        Args:
+            cutoff: First run date to keep (YYYY-MM-DD)
+            tables: Tables to prune, "predictions" and/or "performance"
+
+        Returns:
+            Number of rows deleted
+        """
+        deleted = 0
+        for table in tables:
+            if table not in ('predictions', 'performance'):
+                raise ValueError(f"Unknown history table '{table}'")
+            deleted += self._db.execute(f"DELETE FROM {table} WHERE run_date < ?", (str(cutoff),)).rowcount
+        self._db.commit()
+        return deleted
+
+    def close(self) -> None:
+        self._db.close()
@@ -0,0 +1,335 @@
+"""
+The weekly pipeline as separate stages for the Airflow DAG:
+
+    refresh_prices, refresh_macro, refresh_news  (independent, run in parallel)
+        -> build_features -> train -> predict -> score
+
+Stages hand each other file paths, never data. Every derived stage records a
+fingerprint of its inputs in a manifest and is skipped when the fingerprint
+and its outputs are unchanged, so a failed or empty price fetch costs neither
+a feature rebuild nor a retrain. New features only retrain the model when the
+drift check finds it stale.
+"""
+import datetime
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from src.config import PipelineConfig, get_config
+from src.utils.artifact_store import ArtifactStore
+
+logger = logging.getLogger(__name__)
+
+
+def file_fingerprint(path: str) -> str:
+    """SHA-1 of a file's contents."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def fingerprint(*parts) -> str:
+    """SHA-1 of JSON-serializable stage inputs."""
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class StageManifest:
+    """
+    Input fingerprint and outputs of every stage's last successful run, kept in
+    one JSON file next to the stage artifacts.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        try:
+            with open(path, 'r') as f:
+                self.stages = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.stages = {}
+
+    def is_current(self, stage: str, key: str) -> bool:
+        """True when the stage last ran on the same inputs and its outputs still exist."""
+        entry = self.stages.get(stage)
+        return bool(entry and entry['fingerprint'] == key
+                    and all(os.path.exists(p) for p in entry['outputs']))
+
+    def record(self, stage: str, key: str, outputs: List[str]) -> None:
+        self.stages[stage] = {
+            'fingerprint': key,
+            'outputs': outputs,
+            'completed': datetime.datetime.now().isoformat(),
+        }
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.stages, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def _modified_today(path: str) -> bool:
+    return (os.path.exists(path) and
+            datetime.date.fromtimestamp(os.path.getmtime(path)) == datetime.date.today())
+
+
+def refresh_prices(config: Optional[PipelineConfig] = None) -> Dict:
+    """
+    Append new Yahoo Finance rows to the price CSV.
+    Skipped offline or when the CSV already ends on the last business day. A
+    failed fetch leaves the CSV untouched and does not fail the stage.
+
+    Returns:
+        Dictionary with the CSV path and whether it changed
+    """
+    from src.data.data_pipeline import append_yahoo_data
+
+    config = config or get_config()
+    stock_csv = config.path('stock_csv')
+    result = {'stage': 'prices', 'path': stock_csv, 'updated': False}
+    last_date = pd.to_datetime(pd.read_csv(stock_csv, usecols=['Date'])['Date'].iloc[-1]).date()
+    last_business_day = (pd.Timestamp.today().normalize() - pd.offsets.BDay(1)).date()
+    if config.offline or last_date >= last_business_day:
+        logger.info(f"Prices up to date ({last_date}), skipping fetch")
+        return result
+    try:
+        stock_df, _ = append_yahoo_data(config.ticker, stock_csv)
+        result['updated'] = pd.to_datetime(stock_df['Date'].iloc[-1]).date() > last_date
+        logger.info(f"Price CSV now ends on {pd.to_datetime(stock_df['Date'].iloc[-1]).date()}")
+    except Exception as e:
+        logger.warning(f"Price fetch failed, keeping saved prices: {e}")
+        result['error'] = str(e)
+    return result
+
+
+def refresh_macro(config: Optional[PipelineConfig] = None) -> Dict:
+    """
+    Refresh the FRED macro cache, at most once a day. A failed fetch keeps the cache.
+
+    Returns:
+        Dictionary with the cache path and whether it changed
+    """
+    from src.data.data_pipeline import load_macro_data
+
+    config = config or get_config()
+    cache_path = config.path('macro_cache_path')
+    result = {'stage': 'macro', 'path': cache_path, 'updated': False}
+    if config.offline or _modified_today(cache_path):
+        logger.info("Macro cache up to date, skipping fetch")
+        return result
+    try:
+        load_macro_data(config.start_date, datetime.date.today(), config=config)
+        result['updated'] = True
+    except Exception as e:
+        logger.warning(f"Macro fetch failed, keeping cached indicators: {e}")
+        result['error'] = str(e)
+    return result
+
+
+def refresh_news(config: Optional[PipelineConfig] = None) -> Dict:
+    """
+    Fetch recent news and rebuild the news chunks, at most once a day.
+    A failed fetch keeps the saved articles.
+
+    Returns:
+        Dictionary with the news CSV path and whether it changed
+    """
+    config = config or get_config()
+    news_csv = config.path('news_csv')
+    result = {'stage': 'news', 'path': news_csv, 'updated': False}
+    if config.offline or _modified_today(news_csv):
+        logger.info("News up to date, skipping fetch")
+        return result
+    try:
+        from src.data.news_ingest import run_news_data_pipeline
+        run_news_data_pipeline(config=config)
+        result['updated'] = True
+    except Exception as e:
+        logger.warning(f"News fetch failed, keeping saved articles: {e}")
+        result['error'] = str(e)
+    return result
+
+
+def build_features(config: Optional[PipelineConfig] = None) -> Dict:
+    """
+    Compute the processed feature frame from the saved prices and macro cache
+    and write it to paths.features_path. Skipped when neither input changed.
+
+    Returns:
+        Dictionary with the feature frame path and whether the stage was skipped
+    """
+    from src.data.data_pipeline import get_data_from_csv, preprocess_data, read_macro_cache
+
+    config = config or get_config()
+    stock_csv, macro_path = config.path('stock_csv'), config.path('macro_cache_path')
+    features_path = config.path('features_path')
+    manifest = StageManifest(config.path('stage_manifest_path'))
+    key = fingerprint(file_fingerprint(stock_csv), file_fingerprint(macro_path), config.start_date)
+    if manifest.is_current('features', key):
+        logger.info("Inputs unchanged, reusing features")
+        return {'stage': 'features', 'path': features_path, 'skipped': True}
+
+    enddate = pd.to_datetime(pd.read_csv(stock_csv, usecols=['Date'])['Date'].iloc[-1]).date()
+    stock_df = get_data_from_csv(stock_csv, config.start_date, enddate)
+    df = preprocess_data(stock_df, read_macro_cache(macro_path, config.start_date, enddate))
+    os.makedirs(os.path.dirname(features_path), exist_ok=True)
+    df.to_pickle(features_path)
+    manifest.record('features', key, [features_path])
+    logger.info(f"Features with shape {df.shape} saved to {features_path}")
+    return {'stage': 'features', 'path': features_path, 'skipped': False, 'rows': len(df)}
+
+
+def train(config: Optional[PipelineConfig] = None, features_path: Optional[str] = None,
+          force: bool = False) -> Dict:
+    """
+    Train and save the XGBoost model on the feature frame, but only when it is
+    stale: skipped when the features are unchanged, and on new features when
+    the drift check (WeeklyPredictionPipeline.check_drift) finds neither
+    feature drift nor degrading live errors. Changed model parameters always
+    retrain.
+
+    Args:
+        config: Pipeline config, defaults to get_config()
+        features_path: Feature frame written by build_features
+        force: Retrain regardless of drift
+
+    Returns:
+        Dictionary with the model path, whether the stage was skipped, the
+        retrain decision and a reference to the training results artifact
+    """
+    from src.models.weekly_predict import WeeklyPredictionPipeline
+
+    config = config or get_config()
+    features_path = features_path or config.path('features_path')
+    pipeline = WeeklyPredictionPipeline(config=config)
+    manifest = StageManifest(config.path('stage_manifest_path'))
+    store = ArtifactStore.from_config(config)
+    key = fingerprint(file_fingerprint(features_path), config.model_parameters)
+    if not force and manifest.is_current('train', key):
+        logger.info("Features unchanged, keeping the saved model")
+        return {'stage': 'train', 'path': pipeline.model_path, 'skipped': True,
+                'artifact': store.latest('model_performance')}
+
+    matrix = pipeline.prepare_features(pd.read_pickle(features_path))
+    parameters_key = fingerprint(config.model_parameters)
+    if force:
+        decision = {'retrain': True, 'reasons': ["Retraining requested"]}
+    elif manifest.stages.get('model', {}).get('fingerprint', parameters_key) != parameters_key:
+        decision = {'retrain': True, 'reasons': ["Model parameters changed"]}
+        pipeline.history.add_retrain_decision(decision, ticker=config.ticker)
+    else:
+        decision = pipeline.check_drift(matrix)
+    if not decision['retrain']:
+        manifest.record('train', key, [pipeline.model_path])
+        return {'stage': 'train', 'path': pipeline.model_path, 'skipped': True, 'decision': decision,
+                'artifact': store.latest('model_performance')}
+
+    performance = pipeline.retrain_model(matrix, decision['reasons'])
+    manifest.record('model', parameters_key, [pipeline.model_path, pipeline.snapshot_path])
+    manifest.record('train', key, [pipeline.model_path])
+    artifact = store.put('model_performance', performance)
+    return {'stage': 'train', 'path': pipeline.model_path, 'skipped': False, 'decision': decision,
+            'artifact': artifact}
+
+
+def predict(config: Optional[PipelineConfig] = None, features_path: Optional[str] = None,
+            prediction_days: int = 5) -> Dict:
+    """
+    Predict the coming days with the saved model and save the predictions.
+    Skipped when features, model and prediction date are unchanged.
+
+    Returns:
+        Dictionary with the predictions path, whether the stage was skipped and a
+        reference to the predictions artifact
+    """
+    from src.models.weekly_predict import WeeklyPredictionPipeline
+
+    config = config or get_config()
+    features_path = features_path or config.path('features_path')
+    pipeline = WeeklyPredictionPipeline(config=config)
+    manifest = StageManifest(config.path('stage_manifest_path'))
+    store = ArtifactStore.from_config(config)
+    key = fingerprint(file_fingerprint(features_path), file_fingerprint(pipeline.model_path),
+                      datetime.date.today(), prediction_days)
+    if manifest.is_current('predict', key) and store.latest('predictions'):
+        logger.info("Predictions for today are up to date")
+        return {'stage': 'predict', 'path': pipeline.predictions_path, 'skipped': True,
+                'artifact': store.latest('predictions')}
+
+    if not pipeline.load_model():
+        raise FileNotFoundError(f"No model at {pipeline.model_path}, run the train stage first")
+    matrix = pipeline.prepare_features(pd.read_pickle(features_path))
+    predictions = pipeline.generate_weekly_predictions(matrix, prediction_days)
+    pipeline.save_predictions(predictions)
+    manifest.record('predict', key, [pipeline.predictions_path])
+    history = pipeline.get_performance_history()
+    artifact = store.put('predictions', {
+        'predictions': predictions,
+        'data_points': len(matrix),
+        'model_metrics': history[-1].get('metrics', {}) if history else {},
+    })
+    return {'stage': 'predict', 'path': pipeline.predictions_path, 'skipped': False, 'artifact': artifact}
+
+
+def score(config: Optional[PipelineConfig] = None) -> Dict:
+    """
+    Score the stored predictions against the realized closes in the price CSV,
+    record the live metrics and check the monitoring.alerts thresholds.
+    Skipped when neither the prices nor the prediction history changed.
+
+    Returns:
+        Dictionary with whether the stage was skipped, the fired alerts and a
+        reference to the scored predictions artifact
+    """
+    from src.models.history_store import HistoryStore
+    from src.models.scoring import run_scoring
+
+    config = config or get_config()
+    monitoring = config.settings.get('monitoring', {})
+    settings = monitoring.get('scoring', {})
+    history_path = config.path('history_db_path')
+    stock_csv = config.path('stock_csv')
+    store = ArtifactStore.from_config(config)
+    manifest = StageManifest(config.path('stage_manifest_path'))
+    history = HistoryStore(history_path)
+    key = fingerprint(file_fingerprint(stock_csv), history.predictions_version(), settings, monitoring.get('alerts'))
+    if manifest.is_current('score', key) and store.latest('live_scores'):
+        logger.info("Prices and predictions unchanged, keeping live scores")
+        return {'stage': 'score', 'skipped': True, 'alerts': [], 'artifact': store.latest('live_scores')}
+
+    result = run_scoring(history, pd.read_csv(stock_csv), window=settings.get('window', 20),
+                         lookback_days=settings.get('lookback_days', 365),
+                         alerts=monitoring.get('alerts', {}),
+                         min_predictions=settings.get('min_predictions', 5))
+    for alert in result['alerts']:
+        logger.warning(f"Forecast alert: {alert['message']}")
+    artifact = store.put('live_scores', result['scored'])
+    manifest.record('score', key, [history_path])
+    return {'stage': 'score', 'skipped': False, 'alerts': result['alerts'], 'artifact': artifact,
+            'scored_predictions': len(result['scored'])}
+
+
+def run_staged_pipeline(config: Optional[PipelineConfig] = None, prediction_days: int = 5) -> Dict:
+    """
+    Run all stages in order in this process (what the DAG does across tasks).
+
+    Returns:
+        Dictionary with the result of every stage
+    """
+    config = config or get_config()
+    results = {}
+    for stage in (refresh_prices, refresh_macro, refresh_news, build_features, train):
+        result = stage(config)
+        results[result['stage']] = result
+    results['predict'] = predict(config, prediction_days=prediction_days)
+    results['score'] = score(config)
+    return results
+
+
+if __name__ == "__main__":
+    for name, result in run_staged_pipeline().items():
+        print(f"[INFO] {name}: {result}")
@@ -0,0 +1,138 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def score_predictions(predictions: pd.DataFrame, prices: pd.DataFrame) -> pd.DataFrame:
+    """
+    Join stored predictions with the realized closes of their target dates.
+
+    Args:
+        predictions: HistoryStore.predictions() frame
+        prices: Price frame with Date and Close columns
+
+    Returns:
+        One row per prediction whose target date has a close, with actual,
+        error (predicted - actual), abs_error and covered (actual inside the interval)
+    """
+    actuals = pd.DataFrame({
+        'target_date': pd.to_datetime(prices['Date'], format='mixed').dt.normalize(),
+        'actual': prices['Close'].to_numpy(dtype=np.float64),
+    }).drop_duplicates('target_date', keep='last')
+    scored = predictions.assign(target_date=pd.to_datetime(predictions['target_date']).dt.normalize())
+    scored = scored.merge(actuals, on='target_date', how='inner', validate='many_to_one')
+    scored['error'] = scored['predicted_price'] - scored['actual']
+    scored['abs_error'] = scored['error'].abs()
+    scored['covered'] = (scored['lower'] <= scored['actual']) & (scored['actual'] <= scored['upper'])
+    return scored.sort_values(['model_version', 'target_date', 'run_date']).reset_index(drop=True)
+
+
+def rolling_live_metrics(scored: pd.DataFrame, window: int = 20) -> pd.DataFrame:
+    """
+    Rolling live metrics per model version over its last `window` scored predictions.
+
+    Args:
+        scored: Output of score_predictions
+        window: Number of predictions per rolling window
+
+    Returns:
+        scored with rolling_mae, rolling_bias and rolling_coverage columns added
+    """
+    scored = scored.sort_values(['model_version', 'target_date', 'run_date']).reset_index(drop=True)
+    rolling = scored.groupby('model_version', sort=False)[['abs_error', 'error', 'covered']] \
+        .rolling(window, min_periods=1).mean().reset_index(level=0, drop=True)
+    scored['rolling_mae'] = rolling['abs_error']
+    scored['rolling_bias'] = rolling['error']
+    scored['rolling_coverage'] = rolling['covered']
+    return scored
+
+
+def summarize_live_metrics(scored: pd.DataFrame, window: int = 20) -> pd.DataFrame:
+    """
+    Current live metrics per model version over its last `window` scored predictions.
+
+    Returns:
+        DataFrame with model_version, n, first/last target date, mae, bias,
+        coverage and r2 (on the actual closes of the window)
+    """
+    columns = ['model_version', 'n', 'first_target_date', 'last_target_date', 'mae', 'bias', 'coverage', 'r2']
+    if scored.empty:
+        return pd.DataFrame(columns=columns)
+    recent = scored.sort_values(['model_version', 'target_date', 'run_date']) \
+        .groupby('model_version', sort=False).tail(window)
+    recent = recent.assign(squared_error=recent['error'] ** 2)
+    grouped = recent.groupby('model_version')
+    summary = grouped.agg(n=('error', 'size'), first_target_date=('target_date', 'min'),
+                          last_target_date=('target_date', 'max'), mae=('abs_error', 'mean'),
+                          bias=('error', 'mean'), coverage=('covered', 'mean'),
+                          sse=('squared_error', 'sum'))
+    # R^2 against the window's mean close; undefined when the closes do not vary
+    sst = grouped['actual'].agg(lambda actual: float(((actual - actual.mean()) ** 2).sum()))
+    summary['r2'] = np.where(sst > 0, 1 - summary['sse'] / sst.where(sst > 0, 1.0), np.nan)
+    return summary.drop(columns='sse').reset_index()[columns]
+
+
+def evaluate_alerts(summary: pd.DataFrame, alerts: Dict, min_predictions: int = 5) -> List[Dict]:
+    """
+    Check live metrics against the monitoring.alerts thresholds.
+
+    Args:
+        summary: Output of summarize_live_metrics
+        alerts: monitoring.alerts config (mae_threshold, r2_threshold, coverage_threshold)
+        min_predictions: Versions with fewer scored predictions are not checked
+
+    Returns:
+        One dict per crossed threshold with model_version, metric, value, threshold and message
+    """
+    checks = (('mae', alerts.get('mae_threshold'), np.greater),
+              ('r2', alerts.get('r2_threshold'), np.less),
+              ('coverage', alerts.get('coverage_threshold'), np.less))
+    fired = []
+    for row in summary.itertuples(index=False):
+        if row.n < min_predictions:
+            continue
+        for metric, threshold, crossed in checks:
+            value = getattr(row, metric)
+            if threshold is None or value is None or np.isnan(value) or not crossed(value, threshold):
+                continue
+            direction = 'above' if crossed is np.greater else 'below'
+            fired.append({
+                'model_version': row.model_version,
+                'metric': metric,
+                'value': float(value),
+                'threshold': float(threshold),
+                'message': f"Live {metric.upper()} {value:.3f} is {direction} {threshold} "
+                           f"for model {row.model_version} over {row.n} predictions",
+            })
+    return fired
+
+
+def run_scoring(history, prices: pd.DataFrame, window: int = 20, lookback_days: Optional[int] = 365,
+                alerts: Optional[Dict] = None, min_predictions: int = 5,
+                as_of: Optional[pd.Timestamp] = None) -> Dict:
+    """
+    Score the prediction history against realized closes and persist the live metrics.
+
+    Args:
+        history: HistoryStore with the predictions
+        prices: Price frame with Date and Close
+        window: Predictions per rolling window
+        lookback_days: Only score predictions targeting the last lookback_days
+        alerts: monitoring.alerts thresholds, None skips alerting
+        min_predictions: Versions with fewer scored predictions are not alerted on
+        as_of: Scoring date recorded with the metrics, defaults to today
+
+    Returns:
+        Dictionary with the scored rows (with rolling metrics), the summary per
+        model version and the fired alerts
+    """
+    as_of = pd.Timestamp(as_of or pd.Timestamp.today()).normalize()
+    last_close = pd.to_datetime(prices['Date'], format='mixed').max()
+    start = None if lookback_days is None else (last_close - pd.Timedelta(days=lookback_days)).strftime('%Y-%m-%d')
+    predictions = history.predictions(start=start, end=last_close.strftime('%Y-%m-%d'))
+    scored = rolling_live_metrics(score_predictions(predictions, prices), window)
+    summary = summarize_live_metrics(scored, window)
+    history.add_live_metrics(summary, scored_on=as_of.strftime('%Y-%m-%d'), window=window)
+    fired = evaluate_alerts(summary, alerts, min_predictions) if alerts else []
+    return {'scored': scored, 'summary': summary, 'alerts': fired}
@@ -0,0 +1,253 @@
+import json
+import os
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config import PipelineConfig, get_config
+from src.features.feature_matrix import FeatureMatrix
+from src.utils.sentiment_lexicon import NEGATIVE_WORDS, POSITIVE_WORDS
+
+COLUMNS = ('date', 'close', 'forecast', 'sentiment', 'news_count')
+
+
+def score_sentiment(texts) -> np.ndarray:
+    """
+    Lexicon sentiment of news texts.
+
+    Args:
+        texts: Iterable of article texts
+
+    Returns:
+        float array in [-1, 1]: (positive - negative) / (positive + negative) word hits,
+            0 for texts without any hit
+    """
+    texts = pd.Series(list(texts), dtype=object).fillna('').astype(str).str.lower()
+    positive = sum(texts.str.contains(word, regex=False).to_numpy(dtype=np.int64) for word in POSITIVE_WORDS)
+    negative = sum(texts.str.contains(word, regex=False).to_numpy(dtype=np.int64) for word in NEGATIVE_WORDS)
+    hits = np.asarray(positive + negative, dtype=np.float64)
+    return np.divide(positive - negative, hits, out=np.zeros_like(hits), where=hits > 0)
+
+
+def daily_sentiment(trading_dates, news_dates, scores, halflife_days: float = 5.0):
+    """
+    Aggregate article sentiment onto trading days.
+
+    Articles count on the first trading day on or after their publication date,
+    so weekend news lands on Monday. Each day gets the average article score
+    with older articles down-weighted by an exponential decay, which carries
+    sentiment across days without news.
+
+    Args:
+        trading_dates: Sorted datetime64 array of trading days
+        news_dates: Publication date per article
+        scores: Sentiment score per article
+        halflife_days: Trading days after which an article's weight halves
+
+    Returns:
+        Tuple of (sentiment, news_count) arrays, one value per trading day
+    """
+    trading_dates = np.asarray(trading_dates, dtype='datetime64[D]')
+    n_days = len(trading_dates)
+    news_dates = pd.to_datetime(pd.Series(news_dates), format='mixed', errors='coerce')
+    news_dates = news_dates.dt.tz_localize(None) if news_dates.dt.tz is not None else news_dates
+    news_dates = news_dates.to_numpy(dtype='datetime64[D]')
+    scores = np.asarray(scores, dtype=np.float64)
+
+    day = np.searchsorted(trading_dates, news_dates, side='left')
+    keep = ~np.isnat(news_dates) & (day < n_days)
+    counts = np.bincount(day[keep], minlength=n_days).astype(np.float64)
+    sums = np.bincount(day[keep], weights=scores[keep], minlength=n_days)
+
+    # ratio of the decayed score sum to the decayed article count
+    decayed_sums = pd.Series(sums).ewm(halflife=halflife_days).mean().to_numpy()
+    decayed_counts = pd.Series(counts).ewm(halflife=halflife_days).mean().to_numpy()
+    sentiment = np.divide(decayed_sums, decayed_counts, out=np.zeros(n_days), where=decayed_counts > 0)
+    return sentiment, counts.astype(np.int64)
+
+
+def walk_forward_forecasts(matrix: FeatureMatrix, params: Optional[Dict] = None,
+                           min_train_size: int = 250, refit_every: int = 21,
+                           start: Optional[int] = None) -> np.ndarray:
+    """
+    Out-of-sample XGBoost forecasts for every row.
+
+    The model is refit every refit_every rows on all rows before the block and
+    predicts the whole block in one batched call, so no row is forecast by a
+    model that saw it.
+
+    Args:
+        matrix: Features and Close target in chronological order
+        params: XGBoost parameters passed to train_model
+        min_train_size: Rows of history before the first forecast
+        refit_every: Rows forecast by each fitted model
+        start: First row to forecast, defaults to min_train_size
+
+    Returns:
+        float64 array with a forecast per row, NaN for the warm-up rows
+    """
+    from src.models.xgb import train_model
+
+    n_rows = len(matrix)
+    forecasts = np.full(n_rows, np.nan)
+    start = max(min_train_size, start if start is not None else 0)
+    for block_start in range(start, n_rows, refit_every):
+        block_stop = min(block_start + refit_every, n_rows)
+        model = train_model(matrix.values[:block_start], matrix.target[:block_start], params,
+                            feature_names=matrix.feature_columns)
+        forecasts[block_start:block_stop] = model.predict(matrix.values[block_start:block_stop])
+    return forecasts
+
+
+def forecast_settings(params: Optional[Dict], min_train_size: int, refit_every: int) -> str:
+    """
+    Canonical JSON of the walk-forward settings, stored with the table so that
+    forecasts fit under other settings are never reused.
+    """
+    return json.dumps({'params': params or {}, 'min_train_size': int(min_train_size),
+                       'refit_every': int(refit_every)}, sort_keys=True, default=str)
+
+
+class SignalTable:
+    """
+    Per trading day close, forecast and news sentiment as flat columns.
+
+    This is the precomputed input of the RL environment: episodes read the
+    columns directly and never call the price model. Stored as a single .npz.
+    """
+
+    def __init__(self, date: np.ndarray, close: np.ndarray, forecast: np.ndarray,
+                 sentiment: np.ndarray, news_count: Optional[np.ndarray] = None,
+                 settings: str = ''):
+        """
+        Args:
+            settings: forecast_settings of the walk-forward fits, '' when unknown
+        """
+        self.date = np.asarray(date, dtype='datetime64[D]')
+        self.close = np.asarray(close, dtype=np.float64)
+        self.forecast = np.asarray(forecast, dtype=np.float64)
+        self.sentiment = np.asarray(sentiment, dtype=np.float64)
+        self.news_count = (np.zeros(len(self.date), dtype=np.int64) if news_count is None
+                           else np.asarray(news_count, dtype=np.int64))
+        if len({len(getattr(self, column)) for column in COLUMNS}) != 1:
+            raise ValueError("all signal columns must have the same length")
+        self.settings = settings
+
+    def __len__(self) -> int:
+        return len(self.date)
+
+    def forecast_rows(self) -> 'SignalTable':
+        """Rows that have a forecast, i.e. without the walk-forward warm-up."""
+        rows = np.flatnonzero(np.isfinite(self.forecast))
+        return SignalTable(*(getattr(self, column)[rows] for column in COLUMNS), settings=self.settings)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({column: getattr(self, column) for column in COLUMNS})
+
+    def save(self, path: str) -> None:
+        """Write the table as an uncompressed .npz, atomically."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, settings=self.settings, **{column: getattr(self, column) for column in COLUMNS})
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'SignalTable':
+        with np.load(path) as data:
+            # tables saved before settings were stored are never reused
+            settings = str(data['settings']) if 'settings' in data.files else ''
+            return cls(*(data[column] for column in COLUMNS), settings=settings)
+
+
+def build_signal_table(df: pd.DataFrame, news: Optional[pd.DataFrame] = None,
+                       params: Optional[Dict] = None, previous: Optional[SignalTable] = None,
+                       min_train_size: int = 250, refit_every: int = 21,
+                       halflife_days: float = 5.0) -> SignalTable:
+    """
+    Compute the signal table for a processed price frame.
+
+    Args:
+        df: Output of run_data_pipeline, one ticker, sorted by date
+        news: Articles with a 'date' column and 'content' (or 'title'/'description') text
+        params: XGBoost parameters for the walk-forward fits
+        previous: Earlier table; when it was fit with the same params, min_train_size
+            and refit_every, forecasts of the dates it already covers are reused
+            and only newer rows are fit
+        min_train_size: Rows of history before the first forecast
+        refit_every: Rows forecast by each fitted model
+        halflife_days: Decay of the daily news sentiment
+
+    Returns:
+        SignalTable
+    """
+    matrix = FeatureMatrix.from_frame(df, target_column='Close')
+    dates = matrix.dates.astype('datetime64[D]')
+
+    settings = forecast_settings(params, min_train_size, refit_every)
+    start, reused = None, None
+    if previous is not None and len(previous) and len(previous) <= len(dates) \
+            and previous.settings == settings and np.array_equal(previous.date, dates[:len(previous)]):
+        start, reused = len(previous), previous.forecast
+    forecasts = walk_forward_forecasts(matrix, params, min_train_size, refit_every, start=start)
+    if reused is not None:
+        forecasts[:len(reused)] = reused
+
+    if news is not None and len(news):
+        if 'content' in news.columns:
+            texts = news['content']
+        else:
+            texts = news.get('title', pd.Series('', index=news.index)).fillna('').astype(str) + ' ' + \
+                news.get('description', pd.Series('', index=news.index)).fillna('').astype(str)
+        sentiment, news_count = daily_sentiment(dates, news['date'], score_sentiment(texts), halflife_days)
+    else:
+        sentiment, news_count = np.zeros(len(dates)), np.zeros(len(dates), dtype=np.int64)
+    return SignalTable(dates, matrix.target, forecasts, sentiment, news_count, settings=settings)
+
+
+def run_signal_pipeline(config: Optional[PipelineConfig] = None, df: Optional[pd.DataFrame] = None,
+                        rebuild: bool = False) -> SignalTable:
+    """
+    Build the signal table from the saved price and news data and save it to
+    paths.signal_table_path. An existing table is extended rather than rebuilt.
+
+    Args:
+        config: Pipeline config, defaults to get_config()
+        df: Processed price frame, defaults to run_data_pipeline on the saved CSV
+        rebuild: Ignore the existing table and refit every block
+
+    Returns:
+        SignalTable
+    """
+    config = config or get_config()
+    settings = config.settings.get('signals', {})
+    if df is None:
+        from src.data.data_pipeline import run_data_pipeline
+        df = run_data_pipeline(ticker=config.ticker, csvflag=True, config=config)
+
+    news = None
+    news_path = config.path('news_csv')
+    if os.path.exists(news_path):
+        news = pd.read_csv(news_path)
+        if 'date' not in news.columns:
+            print(f"[WARNING] {news_path} has no 'date' column, using neutral sentiment")
+            news = None
+
+    table_path = config.path('signal_table_path')
+    previous = None
+    if not rebuild and os.path.exists(table_path):
+        previous = SignalTable.load(table_path)
+
+    params = config.model_parameters
+    params.pop('early_stopping_rounds', None)
+    table = build_signal_table(df, news, params=params, previous=previous,
+                               min_train_size=settings.get('min_train_size', 250),
+                               refit_every=settings.get('refit_every', 21),
+                               halflife_days=settings.get('sentiment_halflife_days', 5.0))
+    table.save(table_path)
+    print(f"[INFO] Signal table with {len(table)} days saved to {table_path}")
+    return table
+
+
+if __name__ == "__main__":
+    run_signal_pipeline()
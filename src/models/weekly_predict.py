@@ -1,5 +1,4 @@
 import pandas as pd 
-import joblib
 import datetime
 import numpy as np
 import os
@@ -9,10 +8,13 @@ from typing import Dict, List, Tuple, Optional
 from pathlib import Path
 
 # Import your existing modules
+from src.config import PipelineConfig, get_config
 from src.data.data_pipeline import run_data_pipeline
+from src.models.drift import TrainingSnapshot, detect_drift, horizon_mae
+from src.features.feature_matrix import FeatureMatrix
+from src.models.history_store import HistoryStore
 from src.models.xgb import train_model, evaluate_model, predict
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+from src.utils.profiling import PipelineProfiler
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -24,30 +26,68 @@ class WeeklyPredictionPipeline:
     Intelligently updates data on a weekly basis.
     """
     
-    def __init__(self, model_path: str = 'saved_models/xgb_model.pkl', 
-                 predictions_path: str = 'data/weekly_predictions.json',
-                 performance_path: str = 'data/model_performance.json',
-                 data_update_tracker_path: str = 'data/data_update_tracker.json'):
+    def __init__(self, model_path: Optional[str] = None, 
+                 predictions_path: Optional[str] = None,
+                 performance_path: Optional[str] = None,
+                 data_update_tracker_path: Optional[str] = None,
+                 config: Optional[PipelineConfig] = None,
+                 history_path: Optional[str] = None):
         """
         Initialize the weekly prediction pipeline.
         
         Args:
             model_path: Path to save/load the XGBoost model
             predictions_path: Path to save weekly predictions
-            performance_path: Path to save model performance metrics
+            performance_path: Legacy performance JSON, imported into the history store once
             data_update_tracker_path: Path to track data update schedule
+            config: Pipeline config used for paths that are not given, defaults to get_config()
+            history_path: SQLite prediction and performance history
         """
-        self.model_path = model_path
-        self.predictions_path = predictions_path
-        self.performance_path = performance_path
-        self.data_update_tracker_path = data_update_tracker_path
+        self.config = config or get_config()
+        self.model_path = model_path or self.config.path('model_path')
+        self.predictions_path = predictions_path or self.config.path('predictions_path')
+        self.performance_path = performance_path or self.config.path('performance_path')
+        self.data_update_tracker_path = data_update_tracker_path or self.config.path('data_update_tracker_path')
+        self.history_path = history_path or self.config.path('history_db_path')
+        self.metrics_path = os.path.join(os.path.dirname(self.performance_path), 'pipeline_metrics.json')
+        self.snapshot_path = os.path.join(os.path.dirname(self.model_path), 'training_snapshot.npz')
         
         # Ensure directories exist
-        os.makedirs(os.path.dirname(model_path), exist_ok=True)
-        os.makedirs(os.path.dirname(predictions_path), exist_ok=True)
+        os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
+        os.makedirs(os.path.dirname(self.predictions_path), exist_ok=True)
         
         self.model = None
+        self.model_version = None
         self.feature_columns = None
+        self._history = None
+
+    @property
+    def history(self) -> HistoryStore:
+        """Prediction and performance history, opened on first use."""
+        if self._history is None:
+            self._history = HistoryStore(self.history_path)
+            self._import_legacy_performance()
+        return self._history
+
+    def _import_legacy_performance(self) -> None:
+        """Move entries of the old performance JSON into an empty history store."""
+        if self._history.performance(limit=1) or not os.path.exists(self.performance_path):
+            return
+        try:
+            with open(self.performance_path, 'r') as f:
+                entries = json.load(f)
+        except json.JSONDecodeError:
+            logger.warning("Corrupted performance file found, not importing it")
+            return
+        for entry in entries:
+            self._history.add_performance(entry, ticker=self.config.ticker)
+        logger.info(f"Imported {len(entries)} performance entries from {self.performance_path}")
+
+    def _set_model_version(self) -> None:
+        """Identify the saved model by a hash of its file."""
+        import hashlib
+        with open(self.model_path, 'rb') as f:
+            self.model_version = hashlib.sha1(f.read()).hexdigest()[:12]
         
     def should_update_data(self) -> bool:
         """
@@ -112,7 +152,7 @@ class WeeklyPredictionPipeline:
         logger.info(f"Fetching data (update_csv={update_csv})...")
         
         try:
-            df = run_data_pipeline(csvflag=not update_csv)
+            df = run_data_pipeline(ticker=self.config.ticker, csvflag=not update_csv, config=self.config)
             logger.info(f"Successfully fetched data with shape: {df.shape}")
             return df
             
@@ -120,7 +160,7 @@ class WeeklyPredictionPipeline:
             logger.error(f"Error fetching data: {e}")
             raise
     
-    def prepare_features(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+    def prepare_features(self, df: pd.DataFrame) -> FeatureMatrix:
         """
         Prepare features and target for modeling.
         
@@ -128,27 +168,19 @@ class WeeklyPredictionPipeline:
             df: Raw data DataFrame
             
         Returns:
-            Tuple of (features, target)
+            FeatureMatrix holding the features as one float32 buffer plus the target
         """
+        matrix = FeatureMatrix.from_frame(df, target_column='Close')
         # Store feature columns for later use
-        self.feature_columns = [col for col in df.columns if col not in ['Date', 'Close']]
-        
-        features = df[self.feature_columns].copy()
-        target = df['Close'].copy()
-        
-        # Handle any missing values
-        features = features.fillna(method='ffill').fillna(method='bfill')
-        
-        return features, target
+        self.feature_columns = matrix.feature_columns
+        return matrix
     
-    def train_weekly_model(self, features: pd.DataFrame, target: pd.Series, 
-                          test_size: float = 0.2) -> Dict:
+    def train_weekly_model(self, matrix: FeatureMatrix, test_size: float = 0.2) -> Dict:
         """
         Train the XGBoost model with latest data.
         
         Args:
-            features: Feature DataFrame
-            target: Target Series
+            matrix: Feature matrix with target
             test_size: Proportion of data for testing
             
         Returns:
@@ -156,10 +188,8 @@ class WeeklyPredictionPipeline:
         """
         logger.info("Training weekly model...")
         
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            features, target, test_size=test_size, random_state=42, shuffle=False
-        )
+        # Split data (views into the same buffer, no copies)
+        train, test = matrix.split(test_size=test_size)
         
         # Train model with optimized parameters
         model_params = {
@@ -169,13 +199,15 @@ class WeeklyPredictionPipeline:
             "max_depth": 6,
             "subsample": 0.8,
             "colsample_bytree": 0.8,
-            "random_state": 42
+            "random_state": 42,
+            "tree_method": "hist"
         }
         
-        self.model = train_model(X_train, y_train, model_params)
+        self.model = train_model(train.values, train.target, model_params,
+                                 feature_names=matrix.feature_columns)
         
         # Evaluate model
-        metrics = evaluate_model(self.model, X_test, y_test)
+        metrics = evaluate_model(self.model, test.values, test.target)
         
         # Convert numpy values to Python floats for JSON serialization
         metrics = {k: float(v) for k, v in metrics.items()}
@@ -191,9 +223,9 @@ class WeeklyPredictionPipeline:
             "training_date": datetime.datetime.now().isoformat(),
             "metrics": metrics,
             "feature_importance": feature_importance,
-            "data_shape": features.shape,
-            "train_size": len(X_train),
-            "test_size": len(X_test)
+            "data_shape": matrix.shape,
+            "train_size": len(train),
+            "test_size": len(test)
         }
         
         logger.info(f"Model training completed. R²: {metrics['R2']:.4f}")
@@ -202,28 +234,98 @@ class WeeklyPredictionPipeline:
     def save_model(self) -> None:
         """Save the trained model."""
         if self.model is not None:
+            import joblib
             joblib.dump(self.model, self.model_path)
+            self._set_model_version()
             logger.info(f"Model saved to {self.model_path}")
         else:
             logger.warning("No model to save")
     
+    def save_training_snapshot(self, matrix: FeatureMatrix, performance: Dict) -> None:
+        """Save the feature distribution the current model was trained on, for drift checks."""
+        settings = self.config.get('monitoring', 'drift', {})
+        # Baseline for the live error: the test split scored at the live forecast horizons
+        test = matrix.rows(start=-performance['test_size'])
+        baseline_mae = horizon_mae(self.model.predict(test.values), test.target,
+                                   self.config.get('prediction', 'days_ahead', 5))
+        snapshot = TrainingSnapshot.from_matrix(matrix, self.model_version or 'unknown', baseline_mae,
+                                                reference_rows=settings.get('recent_rows', 63))
+        snapshot.save(self.snapshot_path)
+        logger.info(f"Training snapshot saved to {self.snapshot_path}")
+
+    def retrain_model(self, matrix: FeatureMatrix, reasons: Optional[List[str]] = None) -> Dict:
+        """
+        Train, then save the model, its training snapshot and its performance.
+
+        Args:
+            matrix: Feature matrix with target
+            reasons: Why the model is retrained, recorded with the performance
+
+        Returns:
+            Dictionary with training results and metrics
+        """
+        performance = self.train_weekly_model(matrix)
+        performance['retrain_reasons'] = list(reasons or [])
+        self.save_model()
+        self.save_training_snapshot(matrix, performance)
+        self.save_performance(performance)
+        return performance
+
+    def check_drift(self, matrix: FeatureMatrix) -> Dict:
+        """
+        Decide whether the saved model needs retraining and record the decision.
+
+        Compares the latest feature rows with the training snapshot and the live
+        errors of the saved model with its test error (see drift.detect_drift).
+
+        Args:
+            matrix: Current feature matrix with target and dates
+
+        Returns:
+            Dictionary with retrain, the reasons and the drift statistics
+        """
+        from src.models.scoring import score_predictions
+
+        if not os.path.exists(self.model_path):
+            decision = {'retrain': True, 'reasons': ["No saved model"]}
+        elif not os.path.exists(self.snapshot_path):
+            decision = {'retrain': True, 'reasons': ["No training snapshot for the saved model"]}
+        else:
+            snapshot = TrainingSnapshot.load(self.snapshot_path)
+            scored = None
+            if matrix.dates is not None and matrix.target is not None:
+                prices = pd.DataFrame({'Date': matrix.dates, 'Close': matrix.target})
+                scored = score_predictions(self.history.predictions(ticker=self.config.ticker,
+                                                                    model_version=snapshot.model_version), prices)
+            scoring = self.config.get('monitoring', 'scoring', {})
+            decision = detect_drift(snapshot, matrix, scored, self.config.get('monitoring', 'drift', {}),
+                                    min_predictions=scoring.get('min_predictions', 5))
+        self.history.add_retrain_decision(decision, ticker=self.config.ticker)
+        if decision['retrain']:
+            logger.info(f"Retraining: {'; '.join(decision['reasons'])}")
+        else:
+            logger.info("No drift detected, keeping the saved model")
+        return decision
+
     def load_model(self) -> bool:
         """Load the saved model."""
+        import joblib
         try:
             self.model = joblib.load(self.model_path)
+            self._set_model_version()
             logger.info(f"Model loaded from {self.model_path}")
             return True
         except FileNotFoundError:
             logger.warning(f"No saved model found at {self.model_path}")
             return False
     
-    def generate_weekly_predictions(self, features: pd.DataFrame, 
+    def generate_weekly_predictions(self, matrix: FeatureMatrix, 
                                   prediction_days: int = 5) -> List[Dict]:
         """
         Generate predictions for the upcoming week.
         
         Args:
-            features: Latest feature data
+            matrix: Latest feature data
             prediction_days: Number of days to predict ahead
             
         Returns:
@@ -235,7 +337,7 @@ class WeeklyPredictionPipeline:
         logger.info(f"Generating predictions for next {prediction_days} days...")
         
         # Use the most recent data for predictions
-        latest_features = features.tail(1)
+        latest_features = matrix.rows(start=-1).to_frame()
         
         predictions = []
         current_date = datetime.datetime.now()
@@ -253,7 +355,7 @@ class WeeklyPredictionPipeline:
                 "date": next_date.strftime("%Y-%m-%d"),
                 "predicted_price": float(pred),
                 "prediction_date": current_date.strftime("%Y-%m-%d"),
-                "model_version": self.model_path,
+                "model_version": self.model_version or self.model_path,
                 "confidence_interval": self._calculate_confidence_interval(float(pred))
             }
             
@@ -284,7 +386,7 @@ class WeeklyPredictionPipeline:
         }
     
     def save_predictions(self, predictions: List[Dict]) -> None:
-        """Save weekly predictions to JSON file."""
+        """Save weekly predictions to JSON file and append them to the history."""
         prediction_data = {
             "generated_date": datetime.datetime.now().isoformat(),
             "predictions": predictions
@@ -292,73 +394,86 @@ class WeeklyPredictionPipeline:
         
         with open(self.predictions_path, 'w') as f:
             json.dump(prediction_data, f, indent=2)
+        self.history.add_predictions(predictions, ticker=self.config.ticker,
+                                     model_version=self.model_version or 'unknown')
+        self.apply_retention()
         
         logger.info(f"Predictions saved to {self.predictions_path}")
     
+    def apply_retention(self) -> None:
+        """Drop history older than monitoring.retention allows."""
+        retention = self.config.get('monitoring', 'retention', {})
+        today = datetime.date.today()
+        for table, key in (('predictions', 'prediction_history_weeks'),
+                           ('performance', 'performance_history_weeks')):
+            weeks = retention.get(key)
+            if weeks:
+                cutoff = today - datetime.timedelta(weeks=weeks)
+                self.history.drop_before(cutoff.isoformat(), tables=(table,))
+    
     def save_performance(self, performance_data: Dict) -> None:
-        """Save model performance metrics."""
-        # Load existing performance data if available
-        existing_data = []
-        if os.path.exists(self.performance_path):
-            try:
-                with open(self.performance_path, 'r') as f:
-                    existing_data = json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                logger.warning("Corrupted performance file found, starting fresh")
-                existing_data = []
-        
-        # Add new performance data
-        existing_data.append(performance_data)
-        
-        # Keep only last 52 weeks (1 year) of performance data
-        if len(existing_data) > 52:
-            existing_data = existing_data[-52:]
-        
-        with open(self.performance_path, 'w') as f:
-            json.dump(existing_data, f, indent=2)
-        
-        logger.info(f"Performance data saved to {self.performance_path}")
+        """Append model performance metrics to the history."""
+        self.history.add_performance(performance_data, ticker=self.config.ticker,
+                                     model_version=self.model_version or 'unknown')
+        logger.info(f"Performance data saved to {self.history_path}")
     
     def run_weekly_pipeline(self, update_data: bool = False, 
-                           retrain: bool = True, 
+                           retrain: Optional[bool] = None, 
                            prediction_days: int = 5) -> Dict:
         """
         Run the complete weekly prediction pipeline.
         
         Args:
             force_data_update: Force data update regardless of schedule
-            retrain: Whether to retrain the model
+            retrain: True always retrains, False reuses the saved model, None
+                (default) retrains only when check_drift finds the model stale
             prediction_days: Number of days to predict ahead
             
         Returns:
             Dictionary with pipeline results
         """
         logger.info("Starting weekly prediction pipeline...")
+        profiler = PipelineProfiler()
+        performance_data = {}
+        decision = {}
         
         try:
             # 1. Fetch latest data
-            df = self.fetch_latest_data(update_csv=update_data)
+            with profiler.stage("fetch") as stage:
+                df = self.fetch_latest_data(update_csv=update_data)
+                stage["rows"] = len(df)
             
             # 2. Prepare features
-            features, target = self.prepare_features(df)
+            with profiler.stage("features", rows=len(df)):
+                matrix = self.prepare_features(df)
             
             # 3. Train or load model
-            if retrain:
-                performance_data = self.train_weekly_model(features, target)
-                self.save_model()
-                self.save_performance(performance_data)
-            else:
-                if not self.load_model():
-                    logger.warning("No saved model found, training new model...")
-                    performance_data = self.train_weekly_model(features, target)
-                    self.save_model()
-                    self.save_performance(performance_data)
+            with profiler.stage("train", rows=len(matrix)) as stage:
+                if retrain is None:
+                    decision = self.check_drift(matrix)
+                    retrain = decision['retrain']
+                elif retrain:
+                    decision = {'retrain': True, 'reasons': ["Retraining requested"]}
+                if retrain:
+                    performance_data = self.retrain_model(matrix, decision['reasons'])
+                else:
+                    stage["stage"] = "load"
+                    if not self.load_model():
+                        logger.warning("No saved model found, training new model...")
+                        stage["stage"] = "train"
+                        decision = {'retrain': True, 'reasons': ["No saved model"]}
+                        performance_data = self.retrain_model(matrix, decision['reasons'])
+                    else:
+                        history = self.get_performance_history(limit=1)
+                        performance_data = history[-1] if history else {}
             
             # 4. Generate predictions
-            predictions = self.generate_weekly_predictions(features, prediction_days)
+            with profiler.stage("predict", rows=prediction_days):
+                predictions = self.generate_weekly_predictions(matrix, prediction_days)
             
             # 5. Save predictions
-            self.save_predictions(predictions)
+            with profiler.stage("save", rows=len(predictions)):
+                self.save_predictions(predictions)
             
             # 6. Prepare results
             results = {
@@ -366,8 +481,11 @@ class WeeklyPredictionPipeline:
                 "timestamp": datetime.datetime.now().isoformat(),
                 "predictions": predictions,
                 "model_metrics": performance_data.get("metrics", {}),
-                "data_points": len(features),
-                "data_updated": update_data
+                "data_points": len(matrix),
+                "data_updated": update_data,
+                "retrained": bool(decision.get('retrain')),
+                "retrain_decision": decision,
+                "stage_metrics": self.save_stage_metrics(profiler)
             }
             
             logger.info("Weekly prediction pipeline completed successfully")
@@ -378,9 +496,18 @@ class WeeklyPredictionPipeline:
             return {
                 "status": "error",
                 "timestamp": datetime.datetime.now().isoformat(),
-                "error": str(e)
+                "error": str(e),
+                "stage_metrics": self.save_stage_metrics(profiler)
             }
     
+    def save_stage_metrics(self, profiler: PipelineProfiler) -> Dict:
+        """Save per-stage timing and memory metrics next to the performance file."""
+        try:
+            return profiler.save(self.metrics_path)
+        except OSError as e:
+            logger.warning(f"Could not save pipeline metrics: {e}")
+            return profiler.summary()
+    
     def get_latest_predictions(self) -> Optional[List[Dict]]:
         """Get the latest saved predictions."""
         try:
@@ -391,14 +518,9 @@ class WeeklyPredictionPipeline:
             logger.warning("No predictions file found")
             return None
     
-    def get_performance_history(self) -> List[Dict]:
-        """Get historical performance data."""
-        try:
-            with open(self.performance_path, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            logger.warning("No performance file found")
-            return []
+    def get_performance_history(self, limit: Optional[int] = 52) -> List[Dict]:
+        """Get historical performance data, oldest first (the last year by default)."""
+        return self.history.performance(ticker=self.config.ticker, limit=limit)
     
     def get_data_update_status(self) -> Dict:
         """Get data update status and schedule."""
@@ -429,14 +551,16 @@ def main():
     """Main function to run the weekly prediction pipeline."""
     pipeline = WeeklyPredictionPipeline()
     
-    # Run the pipeline
-    results = pipeline.run_weekly_pipeline(update_data=False, retrain=True, prediction_days=5)
+    # Run the pipeline, retraining only when the saved model has drifted
+    results = pipeline.run_weekly_pipeline(update_data=False, prediction_days=5)
     
     if results["status"] == "success":
         print("\n=== Weekly Prediction Results ===")
-        print(f"Model R² Score: {results['model_metrics']['R2']:.4f}")
+        print(f"Model R² Score: {results['model_metrics'].get('R2', float('nan')):.4f}")
         print(f"Data Points Used: {results['data_points']}")
         print(f"Data Updated: {results['data_updated']}")
+        reasons = results['retrain_decision'].get('reasons') or ["no drift detected"]
+        print(f"Retrained: {results['retrained']} ({'; '.join(reasons)})")
         print("\nPredictions for next 5 business days:")
         
         for pred in results["predictions"]:
@@ -1,18 +1,16 @@
 import sys
-from src.data.data_pipeline import run_data_pipeline
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-import xgboost as xgb
 import pickle
 import os
+# xgboost, scikit-learn and the data pipeline are imported where they are used
+# so that importing this module (e.g. while Airflow parses the DAGs) stays cheap
 
 def get_data(flag):
     """
     Fetches and preprocess data from the data pipeline.
     """
+    from src.data.data_pipeline import run_data_pipeline
     df = run_data_pipeline(flag)
     features = df.drop(columns=['Date', 'Close'])
     target = df['Close']
@@ -22,21 +20,25 @@ def train_test_split_func():
     """
     Splits the data into training and testing sets.
     """
+    from sklearn.model_selection import train_test_split
     features, target = get_data()
     X_train, X_test, y_train, y_test = train_test_split(features, target, test_size=0.2, random_state=42)
     return X_train, X_test, y_train, y_test
 
-def train_model(X_train, y_train, params=None):
+def train_model(X_train, y_train, params=None, feature_names=None):
     """
     Train XGBoost model.
     Args:
-        X_train (pd.DataFrame): Training features.
-        X_test (pd.DataFrame): Testing features.
-        y_train (pd.Series): Training target.
-        y_test (pd.Series): Testing target.
+        X_train (pd.DataFrame or np.ndarray): Training features. A C-contiguous float32
+            array (see FeatureMatrix) is consumed by xgboost without another copy.
+        y_train (pd.Series or np.ndarray): Training target.
+        params (dict): Overrides for the default XGBoost parameters.
+        feature_names (list): Column names to attach when X_train is an array, so the
+            model can still be used with DataFrames later on.
     Returns:
         xgb_model (XGBRegressor): Trained XGBoost model.
     """
+    import xgboost as xgb
     default_params = {
         "objective": "reg:squarederror",
         "n_estimators": 100,
@@ -50,6 +52,8 @@ def train_model(X_train, y_train, params=None):
         default_params.update(params)
     model = xgb.XGBRegressor(**default_params)
     model.fit(X_train, y_train)
+    if feature_names is not None:
+        model.get_booster().feature_names = list(feature_names)
     return model
 
 def save_model(path='saved_models/xgb_model.pkl'):
@@ -99,6 +103,7 @@ def evaluate_model(model, X_test, y_test):
     Returns:
         mae (float): Mean Absolute Error of the predictions.
     """
+    from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
     preds = predict(model, X_test)
     mse = mean_squared_error(y_test, preds)
     mae = mean_absolute_error(y_test, preds)
@@ -1,8 +1,10 @@
-import numpy as np 
-import random
+import numpy as np
+
+from src.rl.discretizer import DEFAULT_STATE_BINS, StateDiscretizer
 
 class QLearningAgent:
-    def __init__(self, state_size, action_size=3, alpha=0.1, gamma=0.95, epsilon=0.1):
+    def __init__(self, state_size, action_size=3, alpha=0.1, gamma=0.95, epsilon=0.1,
+                 discretizer=None, seed=None):
         """
         Q-learning agent initialize class.
         Args:
@@ -12,54 +14,88 @@ class QLearningAgent:
             alpha (float): learning rate
             gamma (float): discount factor
             epsilon (float): exploration rate for epsilon greedy policy
+            discretizer (StateDiscretizer): maps states to Q-table rows, defaults to
+                DEFAULT_STATE_BINS for 3-dimensional states and 10 bins over [-1, 1] otherwise
+            seed (int): seed for exploration
         """
-        self.q_table = {}
+        if discretizer is None:
+            bins = DEFAULT_STATE_BINS if state_size == len(DEFAULT_STATE_BINS) else [(-1.0, 1.0, 10)] * state_size
+            discretizer = StateDiscretizer.uniform(bins)
+        if discretizer.state_size != state_size:
+            raise ValueError(f"discretizer has {discretizer.state_size} dimensions, state_size is {state_size}")
+        self.discretizer = discretizer
+        # one contiguous row of action values per discrete state
+        self.q_table = np.zeros((discretizer.n_states, action_size), dtype=np.float32)
+        self.visited = np.zeros(discretizer.n_states, dtype=bool)
         self.state_size = state_size
         self.action_size = action_size
         self.alpha = alpha
         self.gamma = gamma
         self.epsilon = epsilon
+        self.rng = np.random.default_rng(seed)
 
     def get_action(self, state):
         """
         Choose an action based on the epsilon-greedy policy.
-        Args: 
-            state (np.array): current state vector
+        Args:
+            state (np.array): current state vector, or a batch of shape (n, state_size)
         Returns:
-            int: Action index (0=Hold, 1=Buy, 2=Sell)
+            int: Action index (0=Hold, 1=Buy, 2=Sell), or an array of actions for a batch
         """
-        # convert state to tuple
-        state_key = tuple(np.round(state, 4))
-        # explore randomly with probability epsilon or if state not seen 
-        if random.random() < self.epsilon or state_key not in self.q_table:
-            return random.randint(0, self.action_size - 1)
-        # otherwise exploit best known action
-        return int(np.argmax(self.q_table[state_key]))
+        index = self.discretizer.index(state)
+        indices = np.atleast_1d(index)
+        greedy = np.argmax(self.q_table[indices], axis=1)
+        # explore randomly with probability epsilon or if state not seen
+        explore = (self.rng.random(indices.shape[0]) < self.epsilon) | ~self.visited[indices]
+        actions = np.where(explore, self.rng.integers(0, self.action_size, indices.shape[0]), greedy)
+        return int(actions[0]) if np.ndim(index) == 0 else actions
 
     def update_q_table(self, state, action, reward, next_state):
         """
         Update Q-values based on observed reward and next state.
         Args:
-            state (np.array): previous state vector
-            action (int): Action taken 
-            reward (float): Reward received after action
-            next_state (np.array): next state vector after action
+            state (np.array): previous state vector, or a batch of shape (n, state_size)
+            action (int): Action taken (array for a batch)
+            reward (float): Reward received after action (array for a batch)
+            next_state (np.array): next state vector after action (batch like state)
+        Note:
+            A batch is applied as one step: TD errors are computed from the current
+            table and updates to the same (state, action) are averaged, so a cell
+            visited by several environments moves by one alpha step, not one per visit.
         """
-        state_key = tuple(np.round(state, 4))
-        next_key = tuple(np.round(next_state, 4))
-
-        # Initialize Q-values for states if unseen 
-        if state_key not in self.q_table:
-            self.q_table[state_key] = np.zeros(self.action_size)
-        if next_key not in self.q_table:
-            self.q_table[next_key] = np.zeros(self.action_size)
+        s = np.atleast_1d(self.discretizer.index(state))
+        s_next = np.atleast_1d(self.discretizer.index(next_state))
+        action = np.broadcast_to(np.asarray(action, dtype=np.int64), s.shape)
+        reward = np.broadcast_to(np.asarray(reward, dtype=np.float32), s.shape)
 
         # Calculate TD target and error
-        best_next = np.max(self.q_table[next_key])
+        best_next = self.q_table[s_next].max(axis=1)
         td_target = reward + self.gamma * best_next
-        td_error = td_target - self.q_table[state_key][action]
+        td_error = td_target - self.q_table[s, action]
 
-        # Update Q-value for (state, action)
-        self.q_table[state_key][action] += self.alpha * td_error
-    
-    
\ No newline at end of file
+        # Update Q-value for (state, action) with the mean TD error of each cell
+        cells, inverse = np.unique(s * self.action_size + action, return_inverse=True)
+        mean_td_error = np.bincount(inverse, weights=td_error) / np.bincount(inverse)
+        self.q_table.reshape(-1)[cells] += (self.alpha * mean_td_error).astype(np.float32)
+        self.visited[s] = True
+        self.visited[s_next] = True
+
+    def save(self, path):
+        """
+        Save the Q-table as a .npy file.
+        Args:
+            path (str): destination, ".npy" is appended if missing
+        """
+        np.save(path, self.q_table)
+
+    def load(self, path):
+        """
+        Load a Q-table saved with save(); it must match this agent's discretizer.
+        Args:
+            path (str): .npy file
+        """
+        q_table = np.load(path)
+        if q_table.shape != self.q_table.shape:
+            raise ValueError(f"Q-table shape {q_table.shape} does not match {self.q_table.shape}")
+        self.q_table = np.ascontiguousarray(q_table, dtype=np.float32)
+        self.visited = np.any(self.q_table != 0, axis=1)
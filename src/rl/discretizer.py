@@ -0,0 +1,60 @@
+import numpy as np
+
+# (low, high, n_bins) per state dimension: current price, forecast - price, sentiment
+DEFAULT_STATE_BINS = (
+    (0.0, 80.0, 40),
+    (-4.0, 4.0, 16),
+    (-1.0, 1.0, 10),
+)
+
+
+class StateDiscretizer:
+    """
+    Maps continuous state vectors to integer indices into a Q-table.
+    Every dimension is cut at fixed bin edges; values below the first or above
+    the last edge fall into the outermost bins.
+    """
+
+    def __init__(self, edges):
+        """
+        Args:
+            edges (list of array-like): sorted inner bin edges per state dimension;
+                a dimension with k edges has k + 1 bins.
+        """
+        self.edges = [np.asarray(e, dtype=np.float64) for e in edges]
+        for e in self.edges:
+            if e.ndim != 1 or np.any(np.diff(e) <= 0):
+                raise ValueError("bin edges must be strictly increasing 1-D arrays")
+        self.shape = tuple(len(e) + 1 for e in self.edges)
+        self.n_states = int(np.prod(self.shape))
+
+    @classmethod
+    def uniform(cls, bins):
+        """
+        Equal-width bins.
+        Args:
+            bins (list of (low, high, n_bins)): per-dimension range and bin count.
+        Returns:
+            StateDiscretizer
+        """
+        return cls([np.linspace(low, high, n_bins + 1)[1:-1] for low, high, n_bins in bins])
+
+    @property
+    def state_size(self):
+        return len(self.edges)
+
+    def index(self, states):
+        """
+        Args:
+            states (np.ndarray): one state of shape (state_size,) or a batch of shape (n, state_size).
+        Returns:
+            int for a single state, np.ndarray of int64 for a batch.
+        """
+        states = np.asarray(states, dtype=np.float64)
+        single = states.ndim == 1
+        states = np.atleast_2d(states)
+        if states.shape[1] != self.state_size:
+            raise ValueError(f"expected states with {self.state_size} dimensions, got {states.shape[1]}")
+        digits = [np.searchsorted(e, states[:, d], side='right') for d, e in enumerate(self.edges)]
+        indices = np.ravel_multi_index(digits, self.shape)
+        return int(indices[0]) if single else indices
@@ -0,0 +1,191 @@
+import numpy as np
+
+from src.rl.reward import compute_reward_batch
+from src.rl.state_builder import build_state_batch
+
+HOLD, BUY, SELL = 0, 1, 2
+# one trading year per episode when several episodes run together
+DEFAULT_EPISODE_LENGTH = 252
+
+
+class HistoricalTradingEnv:
+    """
+    Replays NOG price history for n_envs independent episodes stepped in lockstep.
+
+    The state of episode k at step t is build_state(price, forecast, sentiment)
+    of its current day, and an action is rewarded with compute_reward on the move
+    to the next day. Everything is held as arrays over episodes, so one step()
+    covers all episodes at once.
+
+    With n_envs == 1 and scalar actions the env also follows the interface
+    simulate_trading() expects: current_price(), forecast(), sentiment(),
+    steps and step(action) -> (reward, next_state).
+    """
+
+    def __init__(self, prices, forecasts, sentiment=None, n_envs=1, episode_length=None, seed=None):
+        """
+        Args:
+            prices (array-like): closing price per day.
+            forecasts (array-like): model forecast available on each day.
+            sentiment (array-like): news sentiment per day, zeros when not given.
+            n_envs (int): number of episodes stepped together.
+            episode_length (int): steps per episode; shorter episodes than the history
+                start at random days. Defaults to the whole history for a single
+                episode, and to DEFAULT_EPISODE_LENGTH (at most half the history)
+                for n_envs > 1 so the episodes do not all replay the same days.
+            seed (int): seed for the episode start days.
+        """
+        self.prices = np.ascontiguousarray(prices, dtype=np.float64)
+        self.forecasts = np.ascontiguousarray(forecasts, dtype=np.float64)
+        self.sentiments = (np.zeros_like(self.prices) if sentiment is None
+                           else np.ascontiguousarray(sentiment, dtype=np.float64))
+        if not (self.prices.shape == self.forecasts.shape == self.sentiments.shape) or self.prices.ndim != 1:
+            raise ValueError("prices, forecasts and sentiment must be 1-D arrays of the same length")
+        max_steps = self.prices.shape[0] - 1
+        if max_steps < 1:
+            raise ValueError("need at least two days of history")
+        if episode_length is None:
+            episode_length = max_steps if n_envs == 1 else min(DEFAULT_EPISODE_LENGTH, max(1, max_steps // 2))
+        self.steps = episode_length
+        if not 1 <= self.steps <= max_steps:
+            raise ValueError(f"episode_length must be between 1 and {max_steps}")
+        self.n_envs = n_envs
+        self.rng = np.random.default_rng(seed)
+
+        # two state buffers used in turn: the state passed to step() stays valid
+        # while the next one is written
+        self._state_buffers = np.empty((2, n_envs, 3), dtype=np.float64)
+        self._current = 0
+        # per-step work buffers, so stepping allocates nothing
+        self._day = np.empty(n_envs, dtype=np.int64)
+        self._price = np.empty((2, n_envs), dtype=np.float64)
+        self._forecast = np.empty(n_envs, dtype=np.float64)
+        self._sentiment = np.empty(n_envs, dtype=np.float64)
+        self._mask = np.empty(n_envs, dtype=bool)
+        self.positions = np.zeros(n_envs, dtype=np.int8)
+        self.total_reward = np.zeros(n_envs, dtype=np.float64)
+        self.rewards = np.zeros((self.steps, n_envs), dtype=np.float64)
+        self.reset()
+
+    @classmethod
+    def from_frame(cls, df, forecasts, sentiment=None, price_column='Close', **kwargs):
+        """
+        Build the env from a processed feature frame (one ticker, sorted by date).
+        Args:
+            df (pd.DataFrame): frame with a price column.
+            forecasts (array-like): forecast per row of df.
+            sentiment (array-like or str): sentiment per row, or the name of a column of df.
+        """
+        if isinstance(sentiment, str):
+            sentiment = df[sentiment].to_numpy()
+        return cls(df[price_column].to_numpy(), forecasts, sentiment, **kwargs)
+
+    @classmethod
+    def from_signal_table(cls, table, **kwargs):
+        """
+        Build the env from a precomputed SignalTable, skipping the days without a forecast.
+        Args:
+            table (SignalTable): close, forecast and sentiment per trading day.
+        """
+        table = table.forecast_rows()
+        return cls(table.close, table.forecast, table.sentiment, **kwargs)
+
+    @classmethod
+    def from_feature_matrix(cls, matrix, model, sentiment=None, **kwargs):
+        """
+        Build the env from a FeatureMatrix, using the trained price model's
+        predictions as forecasts.
+        Args:
+            matrix (FeatureMatrix): features and closing prices, one ticker.
+            model: fitted regressor with predict(), e.g. the weekly XGBoost model.
+            sentiment (array-like): sentiment per row.
+        """
+        return cls(matrix.target, model.predict(matrix.values), sentiment, **kwargs)
+
+    def reset(self, start_indices=None):
+        """
+        Start new episodes.
+        Args:
+            start_indices (array-like): first day of each episode, random when not given.
+        Returns:
+            np.ndarray: states of shape (n_envs, 3).
+        """
+        max_start = self.prices.shape[0] - 1 - self.steps
+        if start_indices is not None:
+            self.start = np.asarray(start_indices, dtype=np.int64)
+            if self.start.shape != (self.n_envs,) or self.start.min() < 0 or self.start.max() > max_start:
+                raise ValueError(f"start_indices must be {self.n_envs} days in [0, {max_start}]")
+        elif max_start == 0:
+            self.start = np.zeros(self.n_envs, dtype=np.int64)
+        else:
+            self.start = self.rng.integers(0, max_start + 1, self.n_envs)
+        self.t = 0
+        self.positions[:] = 0
+        self.total_reward[:] = 0.0
+        self.rewards[:] = 0.0
+        self._day[:] = self.start
+        return self._observe(self._price[self._current])
+
+    def _observe(self, price):
+        np.take(self.prices, self._day, out=price)
+        np.take(self.forecasts, self._day, out=self._forecast)
+        np.take(self.sentiments, self._day, out=self._sentiment)
+        return build_state_batch(price, self._forecast, self._sentiment,
+                                 out=self._state_buffers[self._current])
+
+    @property
+    def done(self):
+        return self.t >= self.steps
+
+    @property
+    def day(self):
+        """Current day index of every episode."""
+        return self.start + self.t
+
+    def _scalar(self, values):
+        return float(values[0]) if self.n_envs == 1 else values
+
+    def current_price(self):
+        return self._scalar(self.prices[self.day])
+
+    def forecast(self):
+        return self._scalar(self.forecasts[self.day])
+
+    def sentiment(self):
+        return self._scalar(self.sentiments[self.day])
+
+    def state(self):
+        """Current states, shape (n_envs, 3)."""
+        return self._state_buffers[self._current]
+
+    def step(self, actions):
+        """
+        Apply one action per episode and move every episode one day forward.
+        Args:
+            actions (array-like): action per episode (0=Hold, 1=Buy, 2=Sell), or a
+                single int when n_envs == 1.
+        Returns:
+            tuple: rewards of shape (n_envs,) and next states of shape (n_envs, 3);
+                a float and a 1-D state for a scalar action.
+        """
+        if self.done:
+            raise RuntimeError("episode finished, call reset()")
+        scalar = np.ndim(actions) == 0
+        actions = np.broadcast_to(np.asarray(actions), (self.n_envs,))
+        self.positions.fill(0)
+        np.equal(actions, BUY, out=self._mask)
+        np.copyto(self.positions, 1, where=self._mask)
+        np.equal(actions, SELL, out=self._mask)
+        np.copyto(self.positions, -1, where=self._mask)
+
+        previous_price = self._price[self._current]
+        self.t += 1
+        self._day += 1
+        self._current ^= 1
+        next_states = self._observe(self._price[self._current])
+        rewards = compute_reward_batch(previous_price, self._price[self._current], actions,
+                                       out=self.rewards[self.t - 1], mask=self._mask)
+        self.total_reward += rewards
+        if scalar and self.n_envs == 1:
+            return float(rewards[0]), next_states[0]
+        return rewards, next_states
@@ -0,0 +1,166 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.rl.agent import QLearningAgent
+from src.rl.environment import DEFAULT_EPISODE_LENGTH, HistoricalTradingEnv
+from src.rl.run_rl_loop import train_agent
+
+TRADING_DAYS = 252
+
+# history shared with every worker process, set once by _init_worker
+_HISTORY = None
+
+
+def evaluate_rewards(rewards):
+    """
+    Performance metrics of a reward series.
+    Args:
+        rewards (np.ndarray): reward per step, shape (steps,) or (steps, n_episodes)
+    Returns:
+        dict: total_reward, annualized sharpe of the per-step rewards and
+            max_drawdown of the cumulative reward (all averaged over episodes)
+    """
+    rewards = np.asarray(rewards, dtype=np.float64).reshape(len(rewards), -1)
+    std = rewards.std(axis=0)
+    sharpe = np.divide(rewards.mean(axis=0), std, out=np.zeros_like(std), where=std > 0) * np.sqrt(TRADING_DAYS)
+    equity = np.cumsum(rewards, axis=0)
+    peak = np.maximum.accumulate(np.maximum(equity, 0.0), axis=0)
+    return {
+        "total_reward": float(equity[-1].mean()),
+        "sharpe": float(sharpe.mean()),
+        "max_drawdown": float((peak - equity).max(axis=0).mean()),
+    }
+
+
+def greedy_rewards(agent, prices, forecasts, sentiment=None):
+    """
+    Replay the given history once with the agent's greedy policy, without learning.
+    Returns:
+        np.ndarray: reward per step
+    """
+    env = HistoricalTradingEnv(prices, forecasts, sentiment)
+    epsilon, agent.epsilon = agent.epsilon, 0.0
+    try:
+        states = env.reset()
+        for t in range(env.steps):
+            _, states = env.step(agent.get_action(states))
+    finally:
+        agent.epsilon = epsilon
+    return env.rewards[:, 0].copy()
+
+
+def run_training(params, seed, prices, forecasts, sentiment=None, n_envs=32,
+                 episode_length=DEFAULT_EPISODE_LENGTH, n_epochs=10, eval_fraction=0.2,
+                 return_q_table=False):
+    """
+    Train one agent on the start of the history and score its greedy policy
+    on the held-out tail.
+    Args:
+        params (dict): QLearningAgent hyperparameters (alpha, gamma, epsilon)
+        seed (int): seeds both the episode starts and the agent's exploration
+        prices, forecasts, sentiment (np.ndarray): history to replay
+        n_envs (int): episodes trained in lockstep
+        episode_length (int): steps per training episode, capped at half the training
+            history so the episodes start on different days
+        n_epochs (int): training passes over all episodes
+        eval_fraction (float): share of the history held out at the end for evaluation;
+            0 scores the policy on the training history itself (in-sample)
+        return_q_table (bool): include the trained Q-table in the result
+    Returns:
+        dict: params, seed, train_reward and evaluate_rewards() metrics of the greedy policy
+    """
+    n_days = len(prices)
+    n_eval = max(2, int(round(n_days * eval_fraction))) if eval_fraction > 0 else 0
+    split = n_days - n_eval
+    if split < 2:
+        raise ValueError(f"{n_days} days cannot be split into training and evaluation "
+                         f"windows of at least 2 days (eval_fraction={eval_fraction})")
+    train = [None if column is None else column[:split] for column in (prices, forecasts, sentiment)]
+    # the evaluation replay starts on the last training day, so its first step
+    # is the move into the held-out window
+    held_out = [None if column is None else column[split - 1:] for column in (prices, forecasts, sentiment)]
+    evaluation = held_out if n_eval else train
+
+    env_seed, agent_seed = np.random.SeedSequence(seed).spawn(2)
+    if episode_length is not None:
+        episode_length = min(episode_length, max(1, (split - 1) // 2))
+    env = HistoricalTradingEnv(*train, n_envs=n_envs, episode_length=episode_length, seed=env_seed)
+    agent = QLearningAgent(state_size=3, seed=agent_seed, **params)
+    totals = train_agent(env, agent, n_epochs=n_epochs)
+
+    result = {**params, "seed": seed, "train_reward": float(totals[-1].mean()),
+              **evaluate_rewards(greedy_rewards(agent, *evaluation))}
+    if return_q_table:
+        result["q_table"] = agent.q_table
+    return result
+
+
+def _init_worker(prices, forecasts, sentiment):
+    global _HISTORY
+    _HISTORY = (prices, forecasts, sentiment)
+
+
+def _run_task(task):
+    params, seed, kwargs = task
+    return run_training(params, seed, *_HISTORY, **kwargs)
+
+
+def parameter_grid(**values):
+    """
+    Every combination of the given hyperparameter values.
+    Example: parameter_grid(alpha=[0.05, 0.1], epsilon=[0.1]) -> 2 dicts
+    """
+    keys = list(values)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(values[k] for k in keys))]
+
+
+def run_experiments(prices, forecasts, sentiment=None, configs=None, seeds=range(5), max_workers=None, **kwargs):
+    """
+    Train every (config, seed) pair in a process pool.
+
+    Each run is seeded only from its own seed, so results do not depend on the
+    number of workers or the order runs finish in.
+
+    Args:
+        prices, forecasts, sentiment (np.ndarray): history to replay, sent once per worker
+        configs (list of dict): hyperparameter sets, defaults to the agent defaults
+        seeds (iterable of int): seeds run for every config
+        max_workers (int): pool size, 1 runs everything in this process
+        **kwargs: passed to run_training (n_envs, episode_length, n_epochs, eval_fraction,
+            return_q_table)
+    Returns:
+        list of dict: one run_training() result per (config, seed), in input order
+    """
+    configs = configs or [{}]
+    tasks = [(params, seed, kwargs) for params in configs for seed in seeds]
+    history = (np.asarray(prices, dtype=np.float64), np.asarray(forecasts, dtype=np.float64),
+               None if sentiment is None else np.asarray(sentiment, dtype=np.float64))
+    if max_workers == 1:
+        return [run_training(params, seed, *history, **kw) for params, seed, kw in tasks]
+
+    print(f"[INFO] Running {len(tasks)} training runs ({len(configs)} configs x {len(tasks) // len(configs)} seeds)")
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=history) as pool:
+        return list(pool.map(_run_task, tasks))
+
+
+def summarize(results):
+    """
+    Aggregate run results per hyperparameter config.
+    Args:
+        results (list of dict): output of run_experiments
+    Returns:
+        pd.DataFrame: mean and std of every metric across seeds, one row per config
+    """
+    metrics = ["train_reward", "total_reward", "sharpe", "max_drawdown"]
+    frame = pd.DataFrame([{k: v for k, v in r.items() if k != "q_table"} for r in results])
+    params = [c for c in frame.columns if c not in metrics and c != "seed"]
+    if not params:
+        frame["config"] = "default"
+        params = ["config"]
+    summary = frame.groupby(params)[metrics].agg(["mean", "std"])
+    summary.columns = [f"{metric}_{stat}" for metric, stat in summary.columns]
+    summary["runs"] = frame.groupby(params).size()
+    return summary.reset_index()
@@ -1,3 +1,5 @@
+import numpy as np
+
 
 def compute_reward(previous_price, current_price, action):
     """
@@ -17,4 +19,32 @@ def compute_reward(previous_price, current_price, action):
     elif action == 2:   # Sell
         return previous_price - current_price
     else:               # Hold
-        return 0.0
\ No newline at end of file
+        return 0.0
+
+
+def compute_reward_batch(previous_price, current_price, action, out=None, mask=None):
+    """
+    Vectorized compute_reward over arrays of transitions.
+    Args:
+        previous_price (np.ndarray): prices before taking the actions
+        current_price (np.ndarray): prices after taking the actions
+        action (np.ndarray): actions taken (0=Hold, 1=Buy, 2=Sell)
+        out (np.ndarray): optional float buffer the rewards are written to
+        mask (np.ndarray): optional bool scratch buffer shaped like action; with
+            both buffers given nothing is allocated
+    Returns:
+        np.ndarray: reward per transition, element-wise equal to compute_reward
+    """
+    if out is None:
+        out = np.empty(np.broadcast(previous_price, current_price, action).shape)
+    if mask is None:
+        mask = np.empty(np.shape(action), dtype=bool)
+    # Hold (or any other action): zero reward
+    out.fill(0.0)
+    # Buy: profit if price increased
+    np.equal(action, 1, out=mask)
+    np.subtract(current_price, previous_price, out=out, where=mask)
+    # Sell: profit if price decreased
+    np.equal(action, 2, out=mask)
+    np.subtract(previous_price, current_price, out=out, where=mask)
+    return out
@@ -1,3 +1,5 @@
+import numpy as np
+
 from src.rl.agent import QLearningAgent
 from src.rl.state_builder import build_state
 from src.rl.reward import compute_reward
@@ -23,4 +25,26 @@ def simulate_trading(env, agent):
         # Accumulate reward and move to next state
         total_reward += reward
         state = next_state
-    return total_reward
\ No newline at end of file
+    return total_reward
+
+def train_agent(env, agent, n_epochs=1):
+    """
+    Train the agent on all episodes of a HistoricalTradingEnv stepped in lockstep.
+    Args:
+        env (HistoricalTradingEnv): batched replay environment
+        agent (QLearningAgent): RL agent instance
+        n_epochs (int): number of times every episode is reset and replayed
+    Returns:
+        np.ndarray: total reward of shape (n_epochs, env.n_envs)
+    """
+    totals = np.empty((n_epochs, env.n_envs))
+    for epoch in range(n_epochs):
+        states = env.reset()
+        for t in range(env.steps):
+            # one action, reward and Q-update per episode, all episodes at once
+            actions = agent.get_action(states)
+            rewards, next_states = env.step(actions)
+            agent.update_q_table(states, actions, rewards, next_states)
+            states = next_states
+        totals[epoch] = env.total_reward
+    return totals
@@ -17,3 +17,23 @@ def build_state(current_price, forecast_price, sentiment_score):
     return np.array([current_price, delta, sentiment_score])
 
 
+
+
+def build_state_batch(current_price, forecast_price, sentiment_score, out=None):
+    """
+    Vectorized build_state: one state row per element of the inputs.
+    Args:
+        current_price (np.ndarray): current stock prices
+        forecast_price (np.ndarray): forecasted prices
+        sentiment_score (np.ndarray): sentiment scores
+        out (np.ndarray): optional buffer of shape (n, 3) the states are written to
+    Returns:
+        np.ndarray: states of shape (n, 3), row i equal to build_state of element i
+    """
+    if out is None:
+        n = np.broadcast(current_price, forecast_price, sentiment_score).size
+        out = np.empty((n, 3), dtype=np.result_type(current_price, forecast_price, sentiment_score))
+    out[:, 0] = current_price
+    np.subtract(forecast_price, current_price, out=out[:, 1])
+    out[:, 2] = sentiment_score
+    return out
@@ -0,0 +1,78 @@
+import json
+import os
+import time
+from typing import Dict, Optional
+
+
+class ForecastSnapshot:
+    """
+    In-memory copy of data/weekly_predictions.json that reloads itself when the
+    weekly pipeline rewrites the file. Reads are served from memory; the file is
+    stat'ed at most once per check_interval seconds.
+    """
+
+    def __init__(self, path: str, check_interval: float = 5.0):
+        """
+        Args:
+            path: Predictions file written by WeeklyPredictionPipeline.save_predictions
+            check_interval: Minimum seconds between checks for a newer file
+        """
+        self.path = path
+        self.check_interval = check_interval
+        self.data: Optional[Dict] = None
+        self.loaded_at: Optional[float] = None
+        self.reloads = 0
+        self._signature = None
+        self._checked_at = float('-inf')
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Reload the file if it changed since the last load.
+
+        Args:
+            force: Check the file even if check_interval has not elapsed
+
+        Returns:
+            True when a new snapshot was loaded
+        """
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.check_interval:
+            return False
+        self._checked_at = now
+        signature = self._file_signature()
+        if signature is None or signature == self._signature:
+            return False
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            # caught the pipeline mid-write, keep serving the previous snapshot
+            return False
+        self.data = data
+        self._signature = signature
+        self.loaded_at = time.time()
+        self.reloads += 1
+        return True
+
+    def get(self) -> Optional[Dict]:
+        """
+        Current forecast, or None when the pipeline has not produced one yet.
+        """
+        self.refresh()
+        return self.data
+
+    def stats(self) -> Dict:
+        return {
+            "path": self.path,
+            "loaded": self.data is not None,
+            "generated_date": (self.data or {}).get("generated_date"),
+            "loaded_at": self.loaded_at,
+            "reloads": self.reloads,
+        }
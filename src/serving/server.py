@@ -0,0 +1,180 @@
+"""
+HTTP service for the NOG analysis and forecast system.
+
+    python -m src.serving.server --port 8080
+
+Endpoints:
+    POST /ask       {"query": "...", "top_k": 5} -> NOGAnalysisSystem.analyze_query response;
+                    retrieval runs on the worker pool, the answer streams from
+                    AsyncLLMClient on the event loop
+    GET  /forecast  latest weekly forecast, optional ?days=N
+    GET  /stats     system, cache and server statistics
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from aiohttp import web
+
+from src.config import get_config
+from src.llm.async_inference import AsyncLLMClient
+from src.serving.forecast_snapshot import ForecastSnapshot
+
+SYSTEM_KEY = web.AppKey('system', object)
+SNAPSHOT_KEY = web.AppKey('forecast_snapshot', ForecastSnapshot)
+EXECUTOR_KEY = web.AppKey('executor', ThreadPoolExecutor)
+LIMIT_KEY = web.AppKey('request_limit', asyncio.Semaphore)
+STATS_KEY = web.AppKey('server_stats', dict)
+LLM_KEY = web.AppKey('llm_client', AsyncLLMClient)
+
+
+async def _run_blocking(app: web.Application, func, *args):
+    """Run a blocking call on the app's worker pool."""
+    return await asyncio.get_running_loop().run_in_executor(app[EXECUTOR_KEY], func, *args)
+
+
+async def _answer(app: web.Application, query: str, top_k: int) -> dict:
+    """
+    Retrieve on the worker pool and generate with the async LLM client, so a
+    worker thread is never held for the length of an LLM call. Systems
+    without retrieve_context answer entirely on the pool.
+    """
+    system = app[SYSTEM_KEY]
+    if not hasattr(system, 'retrieve_context'):
+        return await _run_blocking(app, system.analyze_query, query, top_k)
+    context = await _run_blocking(app, system.retrieve_context, query, top_k)
+    if context['response'] is not None:
+        return context['response']
+    try:
+        answer = await app[LLM_KEY].generate_answer(query, context['context_texts'])
+    except Exception as e:
+        print(f"[ERROR] LLM inference failed: {e}")
+        answer = None
+    # writes the answer cache, keep file I/O off the event loop
+    return await _run_blocking(app, system.complete_response, context, answer)
+
+
+async def ask(request: web.Request) -> web.Response:
+    app = request.app
+    try:
+        body = await request.json()
+    except ValueError:
+        raise web.HTTPBadRequest(text='Request body must be JSON')
+    query = (body.get('query') or '').strip() if isinstance(body, dict) else ''
+    if not query:
+        raise web.HTTPBadRequest(text='"query" is required')
+    top_k = body.get('top_k', 5)
+    if not isinstance(top_k, int) or not 1 <= top_k <= 50:
+        raise web.HTTPBadRequest(text='"top_k" must be an integer between 1 and 50')
+
+    stats = app[STATS_KEY]
+    stats['ask_requests'] += 1
+    started = time.perf_counter()
+    async with app[LIMIT_KEY]:
+        stats['in_flight'] += 1
+        try:
+            response = await _answer(app, query, top_k)
+        except Exception as e:
+            stats['errors'] += 1
+            print(f"[ERROR] /ask failed: {e}")
+            raise web.HTTPInternalServerError(text='Analysis failed')
+        finally:
+            stats['in_flight'] -= 1
+    stats['ask_seconds_total'] += time.perf_counter() - started
+    return web.json_response(response)
+
+
+async def forecast(request: web.Request) -> web.Response:
+    data = request.app[SNAPSHOT_KEY].get()
+    if data is None:
+        raise web.HTTPNotFound(text='No forecast has been generated yet')
+    days = request.query.get('days')
+    if days is not None:
+        if not days.isdigit():
+            raise web.HTTPBadRequest(text='"days" must be a positive integer')
+        data = {**data, 'predictions': data.get('predictions', [])[:int(days)]}
+    return web.json_response(data)
+
+
+async def stats(request: web.Request) -> web.Response:
+    app = request.app
+    server_stats = dict(app[STATS_KEY])
+    server_stats['uptime_seconds'] = time.time() - server_stats.pop('started_at')
+    return web.json_response({
+        **await _run_blocking(app, app[SYSTEM_KEY].get_system_stats),
+        'forecast': app[SNAPSHOT_KEY].stats(),
+        'llm': dict(app[LLM_KEY].stats),
+        'server': server_stats,
+    })
+
+
+def create_app(system=None, config=None, max_concurrency: Optional[int] = None,
+               forecast_path: Optional[str] = None,
+               llm_client: Optional[AsyncLLMClient] = None) -> web.Application:
+    """
+    Build the aiohttp application. The analysis system (classifier, retriever,
+    embedding model) is created once at startup and shared by all requests.
+
+    Args:
+        system: Object with analyze_query/get_system_stats, defaults to NOGAnalysisSystem
+        config: PipelineConfig, defaults to get_config()
+        max_concurrency: Requests analyzed at once, defaults to serving.max_concurrency
+        forecast_path: Predictions file, defaults to paths.predictions_path
+        llm_client: Client generating /ask answers, defaults to AsyncLLMClient.from_config
+
+    Returns:
+        aiohttp Application
+    """
+    config = config or get_config()
+    settings = config.settings.get('serving', {})
+    max_concurrency = max_concurrency or settings.get('max_concurrency', 8)
+
+    app = web.Application()
+    app[LLM_KEY] = llm_client if llm_client is not None else AsyncLLMClient.from_config(config)
+    app[SNAPSHOT_KEY] = ForecastSnapshot(forecast_path or config.path('predictions_path'),
+                                         check_interval=settings.get('forecast_check_seconds', 5.0))
+    app[STATS_KEY] = {'started_at': time.time(), 'ask_requests': 0, 'in_flight': 0,
+                      'errors': 0, 'ask_seconds_total': 0.0}
+
+    async def on_startup(app: web.Application) -> None:
+        app[EXECUTOR_KEY] = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='nog-ask')
+        app[LIMIT_KEY] = asyncio.Semaphore(max_concurrency)
+        if system is None:
+            from src.llm.main import NOGAnalysisSystem
+            # concurrent /ask requests share batched query embeddings
+            app[SYSTEM_KEY] = await _run_blocking(app, lambda: NOGAnalysisSystem(batch_embeddings=True))
+        else:
+            app[SYSTEM_KEY] = system
+        app[SNAPSHOT_KEY].refresh(force=True)
+        print("[INFO] NOG service ready")
+
+    async def on_cleanup(app: web.Application) -> None:
+        app[EXECUTOR_KEY].shutdown(wait=False, cancel_futures=True)
+        scheduler = getattr(app[SYSTEM_KEY], 'embedding_scheduler', None)
+        if scheduler is not None:
+            scheduler.close()
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    app.router.add_post('/ask', ask)
+    app.router.add_get('/forecast', forecast)
+    app.router.add_get('/stats', stats)
+    return app
+
+
+def main():
+    config = get_config()
+    settings = config.settings.get('serving', {})
+    parser = argparse.ArgumentParser(description="Serve the NOG analysis and forecast system over HTTP")
+    parser.add_argument('--host', default=settings.get('host', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=settings.get('port', 8080))
+    parser.add_argument('--max-concurrency', type=int, default=None)
+    args = parser.parse_args()
+    web.run_app(create_app(config=config, max_concurrency=args.max_concurrency),
+                host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import datetime
+import io
+import json
+import logging
+import os
+import pickle
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_EXTENSIONS = {'json': '.json', 'parquet': '.parquet', 'pickle': '.pkl'}
+
+
+class ArtifactStore:
+    """
+    Versioned pipeline artifacts (JSON results, DataFrames) under one root.
+
+    Every put writes <root>/<name>/<version><ext> and returns a small reference
+    dict. Tasks pass the reference between each other (e.g. over Airflow XCom)
+    instead of the data itself. The root is a local directory or any fsspec URL
+    (s3://, gs://, memory://, ...); fsspec is only needed for URLs.
+    """
+
+    def __init__(self, root: str, keep_versions: Optional[int] = None):
+        """
+        Args:
+            root: Local directory or fsspec URL
+            keep_versions: Versions kept per artifact name, older ones are deleted on put
+        """
+        self.root = str(root).rstrip('/')
+        self.keep_versions = keep_versions
+        self.remote = '://' in self.root
+        if self.remote:
+            import fsspec
+            self.fs, _ = fsspec.core.url_to_fs(self.root)
+
+    @classmethod
+    def from_config(cls, config=None) -> 'ArtifactStore':
+        """Store at artifacts.uri, or paths.artifacts_root when no URI is configured."""
+        if config is None:
+            from src.config import get_config
+            config = get_config()
+        uri = config.get('artifacts', 'uri') or config.path('artifacts_root')
+        return cls(uri, keep_versions=config.get('artifacts', 'keep_versions'))
+
+    def _location(self, name: str, filename: str = '') -> str:
+        return f"{self.root}/{name}/{filename}" if filename else f"{self.root}/{name}"
+
+    def _write(self, path: str, payload: bytes) -> None:
+        if self.remote:
+            with self.fs.open(path, 'wb') as f:
+                f.write(payload)
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+    def _read(self, path: str) -> bytes:
+        if self.remote:
+            with self.fs.open(path, 'rb') as f:
+                return f.read()
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def _filenames(self, name: str) -> List[str]:
+        location = self._location(name)
+        if self.remote:
+            if not self.fs.exists(location):
+                return []
+            return sorted(os.path.basename(p.rstrip('/')) for p in self.fs.ls(location, detail=False))
+        if not os.path.isdir(location):
+            return []
+        return sorted(f for f in os.listdir(location) if not f.endswith('.tmp'))
+
+    def _delete(self, path: str) -> None:
+        if self.remote:
+            self.fs.rm(path)
+        else:
+            os.remove(path)
+
+    @staticmethod
+    def new_version() -> str:
+        """Version id that sorts chronologically."""
+        return datetime.datetime.now().strftime('%Y%m%dT%H%M%S%f')
+
+    def put(self, name: str, data: Any, version: Optional[str] = None) -> Dict:
+        """
+        Store a new version of an artifact.
+
+        Args:
+            name: Artifact name, e.g. "predictions"
+            data: DataFrame (Parquet when pyarrow is installed, pickle otherwise) or
+                anything JSON-serializable
+            version: Explicit version id, defaults to the current timestamp
+
+        Returns:
+            Reference dict with name, version, format, uri and size
+        """
+        import pandas as pd
+
+        if isinstance(data, pd.DataFrame):
+            buffer = io.BytesIO()
+            try:
+                data.to_parquet(buffer, index=False)
+                fmt = 'parquet'
+            except ImportError:
+                buffer = io.BytesIO(pickle.dumps(data))
+                fmt = 'pickle'
+            payload = buffer.getvalue()
+        else:
+            payload = json.dumps(data, indent=2, default=str).encode()
+            fmt = 'json'
+
+        version = version or self.new_version()
+        uri = self._location(name, version + _EXTENSIONS[fmt])
+        self._write(uri, payload)
+        logger.info(f"Artifact {name}@{version} written to {uri}")
+        if self.keep_versions:
+            self.prune(name, self.keep_versions)
+        return {'name': name, 'version': version, 'format': fmt, 'uri': uri, 'bytes': len(payload)}
+
+    def get(self, ref: Dict) -> Any:
+        """
+        Load the artifact a reference points to.
+        """
+        payload = self._read(ref['uri'])
+        if ref['format'] == 'json':
+            return json.loads(payload)
+        import pandas as pd
+        if ref['format'] == 'parquet':
+            return pd.read_parquet(io.BytesIO(payload))
+        return pickle.loads(payload)
+
+    def versions(self, name: str) -> List[Dict]:
+        """References to every stored version of an artifact, oldest first."""
+        refs = []
+        for filename in self._filenames(name):
+            version, ext = os.path.splitext(filename)
+            fmt = next((f for f, e in _EXTENSIONS.items() if e == ext), None)
+            if fmt is not None:
+                refs.append({'name': name, 'version': version, 'format': fmt,
+                             'uri': self._location(name, filename)})
+        return refs
+
+    def latest(self, name: str) -> Optional[Dict]:
+        """Reference to the newest version, or None."""
+        refs = self.versions(name)
+        return refs[-1] if refs else None
+
+    def prune(self, name: str, keep: int) -> int:
+        """
+        Delete all but the newest versions of an artifact.
+
+        Returns:
+            Number of versions deleted
+        """
+        stale = self.versions(name)[:-keep] if keep > 0 else self.versions(name)
+        for ref in stale:
+            self._delete(ref['uri'])
+        return len(stale)
@@ -0,0 +1,150 @@
+import datetime
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Peak resident set size of the current process in MB.
+
+    Returns:
+        Peak RSS, or None when it cannot be determined on this platform
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    if sys.platform == 'darwin':
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def io_counters() -> Optional[Dict]:
+    """
+    Bytes read and written by the current process so far.
+
+    Prefers the character counters (every read/write call, page cache hits
+    included: rchar/wchar in /proc, read_chars/write_chars in psutil). Only
+    where psutil has no such counters are its read_bytes/write_bytes used,
+    which on Linux count storage-layer I/O only; 'counter' says which.
+
+    Returns:
+        Dictionary with 'read' and 'write' byte counts and 'counter'
+        ('chars' or 'bytes'), or None if unavailable
+    """
+    try:
+        with open('/proc/self/io', 'r') as f:
+            fields = dict(line.split(':', 1) for line in f if ':' in line)
+        return {'read': int(fields['rchar']), 'write': int(fields['wchar']), 'counter': 'chars'}
+    except (OSError, KeyError, ValueError):
+        pass
+    try:
+        import psutil
+        counters = psutil.Process().io_counters()
+    except Exception:
+        return None
+    if hasattr(counters, 'read_chars'):
+        return {'read': counters.read_chars, 'write': counters.write_chars, 'counter': 'chars'}
+    return {'read': counters.read_bytes, 'write': counters.write_bytes, 'counter': 'bytes'}
+
+
+class PipelineProfiler:
+    """
+    Collects per-stage wall time, CPU time, peak RSS, rows processed and bytes
+    read/written for a pipeline run.
+    """
+
+    def __init__(self, pipeline_name: str = "weekly_prediction"):
+        """
+        Args:
+            pipeline_name: Name recorded in the emitted metrics
+        """
+        self.pipeline_name = pipeline_name
+        self.started_at = datetime.datetime.now().isoformat()
+        self.stages: List[Dict] = []
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Time a pipeline stage. The yielded record can be updated inside the
+        block, e.g. ``record['rows'] = len(df)``.
+
+        Args:
+            name: Stage name (fetch, features, train, predict, save, ...)
+            rows: Number of rows processed, if known up front
+
+        Yields:
+            The stage record
+        """
+        record = {"stage": name, "rows": rows, "status": "success"}
+        io_before = io_counters()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        except Exception:
+            record["status"] = "error"
+            raise
+        finally:
+            record["wall_seconds"] = time.perf_counter() - wall_start
+            record["cpu_seconds"] = time.process_time() - cpu_start
+            record["peak_rss_mb"] = peak_rss_mb()
+            io_after = io_counters()
+            if io_before is not None and io_after is not None:
+                record["bytes_read"] = io_after['read'] - io_before['read']
+                record["bytes_written"] = io_after['write'] - io_before['write']
+                record["io_counter"] = io_after['counter']
+            else:
+                record["bytes_read"] = None
+                record["bytes_written"] = None
+                record["io_counter"] = None
+            self.stages.append(record)
+            logger.info(f"Stage '{name}' finished in {record['wall_seconds']:.2f}s "
+                        f"(cpu {record['cpu_seconds']:.2f}s, rows={record['rows']})")
+
+    def summary(self) -> Dict:
+        """
+        Get the collected metrics as a JSON-serializable dictionary.
+
+        Returns:
+            Dictionary with run-level totals and the list of stage records
+        """
+        return {
+            "pipeline": self.pipeline_name,
+            "started_at": self.started_at,
+            "total_wall_seconds": sum(s["wall_seconds"] for s in self.stages),
+            "total_cpu_seconds": sum(s["cpu_seconds"] for s in self.stages),
+            "peak_rss_mb": peak_rss_mb(),
+            "stages": list(self.stages),
+        }
+
+    def save(self, path: str) -> Dict:
+        """
+        Write the metrics summary to a JSON file.
+
+        Args:
+            path: Output file path
+
+        Returns:
+            The summary that was written
+        """
+        summary = self.summary()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(summary, f, indent=2)
+        logger.info(f"Pipeline metrics saved to {path}")
+        return summary
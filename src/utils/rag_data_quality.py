@@ -4,21 +4,26 @@ import pandas as pd
 from typing import List, Dict, Tuple, Optional
 from datetime import datetime, timedelta
 import numpy as np
-from sentence_transformers import SentenceTransformer
 import nltk
 from nltk.tokenize import sent_tokenize, word_tokenize
 from nltk.corpus import stopwords
 import hashlib
+from src.config import get_config
+from src.utils.sentiment_lexicon import NEGATIVE_WORDS, POSITIVE_WORDS
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+def ensure_nltk_data():
+    """
+    Download the NLTK data the pipeline needs if it is missing.
+    Called when the pipeline is created rather than at import time.
+    """
+    try:
+        nltk.data.find('tokenizers/punkt')
+    except LookupError:
+        nltk.download('punkt')
+    try:
+        nltk.data.find('corpora/stopwords')
+    except LookupError:
+        nltk.download('stopwords')
 
 class RAGDataQualityPipeline:
     """
@@ -26,8 +31,17 @@ class RAGDataQualityPipeline:
     """
     
     def __init__(self):
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+        ensure_nltk_data()
+        self._embedding_model = None
         self.stop_words = set(stopwords.words('english'))
+    
+    @property
+    def embedding_model(self):
+        """Sentence transformer (all-MiniLM-L6-v2), loaded on first use."""
+        if self._embedding_model is None:
+            from sentence_transformers import SentenceTransformer
+            self._embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+        return self._embedding_model
         
     def clean_text(self, text: str) -> str:
         """
@@ -182,12 +196,9 @@ class RAGDataQualityPipeline:
         # Enhance existing metadata
         if source_type == 'news':
             # Add sentiment indicators
-            positive_words = ['growth', 'increase', 'positive', 'strong', 'profit', 'gain']
-            negative_words = ['decline', 'loss', 'decrease', 'negative', 'weak', 'risk']
-            
             text_lower = text.lower()
-            positive_count = sum(1 for word in positive_words if word in text_lower)
-            negative_count = sum(1 for word in negative_words if word in text_lower)
+            positive_count = sum(1 for word in POSITIVE_WORDS if word in text_lower)
+            negative_count = sum(1 for word in NEGATIVE_WORDS if word in text_lower)
             
             if positive_count > negative_count:
                 metadata['sentiment'] = 'positive'
@@ -415,22 +426,26 @@ class RAGDataQualityPipeline:
         return processed_chunks
     
     def build_high_quality_corpus(self, 
-                                news_file: str = 'data/chunks/enhanced_news_chunks.json',
-                                financials_file: str = 'data/chunks/enhanced_financial_chunks.json',
-                                output_file: str = 'data/chunks/high_quality_corpus.jsonl',
+                                news_file: Optional[str] = None,
+                                financials_file: Optional[str] = None,
+                                output_file: Optional[str] = None,
                                 target_size: int = 1000) -> List[Dict]:
         """
         Build a high-quality corpus for RAG training.
         
         Args:
-            news_file: Path to news chunks file
-            financials_file: Path to financial chunks file
-            output_file: Output file path
+            news_file: Path to news chunks file, defaults to paths.news_chunks_path
+            financials_file: Path to financial chunks file, defaults to paths.financial_chunks_path
+            output_file: Output file path, defaults to paths.corpus_path
             target_size: Target corpus size
             
         Returns:
             List of high-quality chunks
         """
+        config = get_config()
+        news_file = news_file or config.path('news_chunks_path')
+        financials_file = financials_file or config.path('financial_chunks_path')
+        output_file = output_file or config.path('corpus_path')
         print("[INFO] Building high-quality RAG corpus...")
         
         all_chunks = []
@@ -552,7 +567,7 @@ def main():
     
     if chunks:
         print(f"\n✅ Successfully created high-quality RAG corpus!")
-        print(f"📁 Output saved to: data/chunks/high_quality_corpus.jsonl")
+        print(f"📁 Output saved to: {get_config().path('corpus_path')}")
         print(f"🔧 Ready to use with your ChromaDB retriever!")
 
 if __name__ == "__main__":
@@ -0,0 +1,6 @@
+"""
+Word lists for lexicon sentiment, shared by the RAG corpus tagging
+(rag_data_quality) and the RL signal table so both score news the same way.
+"""
+POSITIVE_WORDS = ('growth', 'increase', 'positive', 'strong', 'profit', 'gain')
+NEGATIVE_WORDS = ('decline', 'loss', 'decrease', 'negative', 'weak', 'risk')
@@ -38,21 +38,21 @@ def test_weekly_pipeline():
         
         # Test feature preparation
         print("\n4. Testing feature preparation...")
-        features, target = pipeline.prepare_features(df)
-        print(f"   ✓ Features prepared. Shape: {features.shape}")
-        print(f"   ✓ Target prepared. Shape: {target.shape}")
+        matrix = pipeline.prepare_features(df)
+        print(f"   ✓ Features prepared. Shape: {matrix.shape}")
+        print(f"   ✓ Target prepared. Shape: {matrix.target.shape}")
         print(f"   ✓ Feature columns: {len(pipeline.feature_columns)}")
         
         # Test model training
         print("\n5. Testing model training...")
-        performance_data = pipeline.train_weekly_model(features, target)
+        performance_data = pipeline.train_weekly_model(matrix)
         print(f"   ✓ Model trained successfully")
         print(f"   ✓ R² Score: {performance_data['metrics']['R2']:.4f}")
         print(f"   ✓ MAE: {performance_data['metrics']['MAE']:.4f}")
         
         # Test prediction generation
         print("\n6. Testing prediction generation...")
-        predictions = pipeline.generate_weekly_predictions(features, prediction_days=5)
+        predictions = pipeline.generate_weekly_predictions(matrix, prediction_days=5)
         print(f"   ✓ Generated {len(predictions)} predictions")
         
         for i, pred in enumerate(predictions, 1):
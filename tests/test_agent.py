@@ -1,5 +1,7 @@
 import numpy as np 
+import pytest
 from src.rl.agent import QLearningAgent
+from src.rl.discretizer import StateDiscretizer
 
 def test_q_learning_agent_action_and_update():
     agent = QLearningAgent(state_size=3, action_size=3, epsilon=0)
@@ -12,11 +14,77 @@ def test_q_learning_agent_action_and_update():
 
     # Update Q-table with dummy reward
     agent.update_q_table(state, action, reward=10, next_state=next_state)
-    state_key = tuple(np.round(state, 4))
-    assert state_key in agent.q_table
-    assert agent.q_table[state_key][action] != 0
+    state_index = agent.discretizer.index(state)
+    assert agent.visited[state_index]
+    assert agent.q_table[state_index][action] != 0
+
+    # Seen state with epsilon=0: exploit the best known action
+    assert agent.get_action(state) == action
 
     print('Agent action and update test passed!')
 
+def test_q_table_is_bounded_and_contiguous():
+    agent = QLearningAgent(state_size=3)
+    rng = np.random.default_rng(0)
+    shape = agent.q_table.shape
+    for _ in range(1000):
+        agent.update_q_table(rng.normal(30, 5, 3), 1, 1.0, rng.normal(30, 5, 3))
+    assert agent.q_table.shape == shape
+    assert agent.q_table.dtype == np.float32 and agent.q_table.flags['C_CONTIGUOUS']
+
+def test_discretizer():
+    discretizer = StateDiscretizer([[0.0, 10.0], [-1.0, 0.0, 1.0]])
+    assert discretizer.shape == (3, 4) and discretizer.n_states == 12
+    assert discretizer.index([-5, -2]) == 0
+    assert discretizer.index([5, 0.5]) == 1 * 4 + 2
+    assert discretizer.index([50, 9]) == 11
+    np.testing.assert_array_equal(discretizer.index([[-5, -2], [50, 9]]), [0, 11])
+    with pytest.raises(ValueError):
+        StateDiscretizer([[1.0, 0.0]])
+
+def test_batch_matches_single_updates():
+    states = np.array([[25.0, 1.0, 0.2], [30.0, -1.0, -0.4], [41.0, 0.5, 0.9]])
+    next_states = states + np.array([0.5, -0.2, 0.1])
+    actions = np.array([1, 2, 0])
+    rewards = np.array([0.5, -1.0, 0.0])
+    batched = QLearningAgent(state_size=3, seed=0)
+    single = QLearningAgent(state_size=3, seed=0)
+    batched.update_q_table(states, actions, rewards, next_states)
+    # distinct states: one batched step equals applying the updates one by one from the same table
+    for s, a, r, n in zip(states, actions, rewards, next_states):
+        single.update_q_table(s, a, r, n)
+    np.testing.assert_allclose(batched.q_table, single.q_table)
+    assert batched.get_action(states).shape == (3,)
+
+def test_duplicate_states_take_one_alpha_step():
+    state = np.array([30.0, 0.5, 0.2])
+    next_state = np.array([31.0, 0.4, 0.1])
+    batched = QLearningAgent(state_size=3, alpha=0.5)
+    single = QLearningAgent(state_size=3, alpha=0.5)
+    # 32 environments in the same cell with the same transition move it once
+    batched.update_q_table(np.tile(state, (32, 1)), np.ones(32, dtype=int), np.full(32, 2.0),
+                           np.tile(next_state, (32, 1)))
+    single.update_q_table(state, 1, 2.0, next_state)
+    np.testing.assert_allclose(batched.q_table, single.q_table)
+    # different rewards in one cell average out
+    mixed = QLearningAgent(state_size=3, alpha=0.5)
+    mixed.update_q_table(np.tile(state, (2, 1)), [1, 1], [1.0, 3.0], np.tile(next_state, (2, 1)))
+    np.testing.assert_allclose(mixed.q_table, single.q_table)
+
+def test_save_and_load(tmp_path):
+    agent = QLearningAgent(state_size=3, epsilon=0)
+    agent.update_q_table(np.array([25.0, 1.0, 0.2]), 1, 5.0, np.array([26.0, 0.5, 0.1]))
+    agent.save(str(tmp_path / "q_table.npy"))
+    restored = QLearningAgent(state_size=3, epsilon=0)
+    restored.load(str(tmp_path / "q_table.npy"))
+    np.testing.assert_array_equal(restored.q_table, agent.q_table)
+    assert restored.get_action(np.array([25.0, 1.0, 0.2])) == 1
+
 if __name__=='__main__':
-    test_q_learning_agent_action_and_update()
\ No newline at end of file
+    import pathlib, tempfile
+    test_q_learning_agent_action_and_update()
+    test_q_table_is_bounded_and_contiguous()
+    test_discretizer()
+    test_batch_matches_single_updates()
+    test_duplicate_states_take_one_alpha_step()
+    test_save_and_load(pathlib.Path(tempfile.mkdtemp()))
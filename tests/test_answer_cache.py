@@ -0,0 +1,66 @@
+import numpy as np
+from src.llm.answer_cache import AnswerCache, normalize_query
+
+RESPONSE = {"query": "What is NOG's ROE?", "intent": "roe", "answer": "12%", "sources": [], "confidence": "high"}
+
+def test_normalize_query():
+    assert normalize_query("  What is   NOG's ROE?? ") == "what is nog's roe"
+
+def test_exact_hit_and_intent_isolation():
+    cache = AnswerCache()
+    assert cache.get("What is NOG's ROE?", "roe", "v1") == (None, None)
+    cache.put("What is NOG's ROE?", "roe", "v1", RESPONSE)
+    response, level = cache.get("what is nog's roe", "roe", "v1")
+    assert level == "exact" and response["answer"] == "12%"
+    assert cache.get("What is NOG's ROE?", "news", "v1") == (None, None)
+    assert cache.stats == {"exact_hits": 1, "semantic_hits": 0, "misses": 2}
+
+def test_semantic_hit_respects_threshold_and_intent():
+    cache = AnswerCache(semantic_threshold=0.95)
+    base = np.array([1.0, 0.0, 0.0])
+    cache.put("What is NOG's ROE?", "roe", "v1", RESPONSE, query_embedding=base)
+    close = np.array([0.99, 0.05, 0.0])
+    far = np.array([0.5, 0.5, 0.5])
+    assert cache.get("Show me the return on equity", "roe", "v1", close)[1] == "semantic"
+    assert cache.get("Show me the return on equity", "news", "v1", close) == (None, None)
+    assert cache.get("Something else", "roe", "v1", far) == (None, None)
+
+def test_top_k_is_part_of_the_key():
+    cache = AnswerCache(semantic_threshold=0.95)
+    cache.put("What is NOG's ROE?", "roe", "v1", RESPONSE, query_embedding=np.ones(3), top_k=5)
+    assert cache.get("What is NOG's ROE?", "roe", "v1", np.ones(3), top_k=10) == (None, None)
+    assert cache.get("Show me the ROE", "roe", "v1", np.ones(3), top_k=10) == (None, None)
+    assert cache.get("What is NOG's ROE?", "roe", "v1", top_k=5)[1] == "exact"
+    assert cache.get("Show me the ROE", "roe", "v1", np.ones(3), top_k=5)[1] == "semantic"
+
+def test_new_corpus_version_invalidates(tmp_path):
+    cache = AnswerCache(path=str(tmp_path / "cache.sqlite"))
+    cache.put("q", "roe", "v1", RESPONSE, query_embedding=np.ones(4))
+    assert cache.get("q", "roe", "v2", np.ones(4)) == (None, None)
+    assert cache.get("q", "roe", "v1") == (None, None)
+
+def test_persists_across_instances(tmp_path):
+    path = str(tmp_path / "nested" / "cache.sqlite")
+    AnswerCache(path=path).put("q", "roe", "v1", RESPONSE, query_embedding=np.ones(4))
+    reopened = AnswerCache(path=path)
+    assert reopened.get("q", "roe", "v1")[1] == "exact"
+    assert reopened.get("other q", "roe", "v1", np.ones(4))[1] == "semantic"
+
+def test_bounded_size():
+    cache = AnswerCache(max_entries=2, max_semantic_entries=3)
+    for i in range(5):
+        cache.put(f"q{i}", "roe", "v1", RESPONSE, query_embedding=np.eye(5)[i])
+    assert len(cache._lru) == 2
+    assert len(cache._semantic_keys) <= 3
+    assert cache.get("q0", "roe", "v1") == (None, None)
+    assert cache.get("q4", "roe", "v1")[1] == "exact"
+
+if __name__=='__main__':
+    import pathlib, tempfile
+    test_normalize_query()
+    test_exact_hit_and_intent_isolation()
+    test_semantic_hit_respects_threshold_and_intent()
+    test_top_k_is_part_of_the_key()
+    test_new_corpus_version_invalidates(pathlib.Path(tempfile.mkdtemp()))
+    test_persists_across_instances(pathlib.Path(tempfile.mkdtemp()))
+    test_bounded_size()
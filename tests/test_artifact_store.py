@@ -0,0 +1,34 @@
+import json
+import pandas as pd
+from src.utils.artifact_store import ArtifactStore
+
+def test_put_and_get_versions(tmp_path):
+    store = ArtifactStore(str(tmp_path / 'artifacts'), keep_versions=2)
+    refs = [store.put('predictions', {'run': i, 'predictions': [{'price': 10.0 + i}]}, version=f"v{i}")
+            for i in range(3)]
+    # the reference is small no matter how large the artifact is
+    assert len(json.dumps(refs[-1])) < 200
+    assert store.get(refs[-1]) == {'run': 2, 'predictions': [{'price': 12.0}]}
+    assert [r['version'] for r in store.versions('predictions')] == ['v1', 'v2']
+    assert store.latest('predictions')['version'] == 'v2'
+    assert store.latest('missing') is None
+
+def test_frames_round_trip(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    df = pd.DataFrame({'date': pd.date_range('2024-01-01', periods=3), 'mae': [0.1, 0.2, 0.3]})
+    ref = store.put('scores', df)
+    assert ref['format'] in ('parquet', 'pickle')
+    pd.testing.assert_frame_equal(store.get(ref), df)
+
+def test_fsspec_url_root():
+    store = ArtifactStore('memory://nog-artifacts-test')
+    ref = store.put('results', {'status': 'success'})
+    assert ref['uri'].startswith('memory://')
+    assert store.get(store.latest('results')) == {'status': 'success'}
+    assert store.prune('results', keep=0) == 1 and store.versions('results') == []
+
+if __name__=='__main__':
+    import pathlib, tempfile
+    test_put_and_get_versions(pathlib.Path(tempfile.mkdtemp()))
+    test_frames_round_trip(pathlib.Path(tempfile.mkdtemp()))
+    test_fsspec_url_root()
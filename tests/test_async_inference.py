@@ -0,0 +1,79 @@
+import asyncio
+import pytest
+from src.llm.async_inference import AsyncLLMClient, EchoBackend
+
+class FlakyBackend(EchoBackend):
+    """Fails the first `failures` attempts before streaming."""
+    retryable_exceptions = (ConnectionError,)
+
+    def __init__(self, failures, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+        self.attempts = 0
+
+    async def stream(self, prompt):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise ConnectionError("connection reset")
+        async for token in super().stream(prompt):
+            yield token
+
+class CountingBackend(EchoBackend):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.active = 0
+        self.peak = 0
+
+    async def stream(self, prompt):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            async for token in super().stream(prompt):
+                yield token
+        finally:
+            self.active -= 1
+
+def test_streams_tokens():
+    client = AsyncLLMClient(backend=EchoBackend())
+
+    async def run():
+        return [token async for token in client.stream_answer("What is NOG's ROE?", ["context"])]
+
+    tokens = asyncio.run(run())
+    assert len(tokens) > 1
+    assert ''.join(tokens) == "Echo: What is NOG's ROE?"
+    assert client.stats["last_time_to_first_token"] is not None
+
+def test_concurrency_is_bounded():
+    backend = CountingBackend(token_delay=0.01)
+    client = AsyncLLMClient(backend=backend, max_concurrency=3)
+    requests = [{"question": f"q{i}", "context_texts": []} for i in range(10)]
+    answers = asyncio.run(client.generate_many(requests))
+    assert answers == [f"Echo: q{i}" for i in range(10)]
+    assert backend.peak == 3
+    assert client.stats["in_flight"] == 0
+
+def test_retries_then_succeeds():
+    backend = FlakyBackend(failures=2, reply="ok")
+    client = AsyncLLMClient(backend=backend, max_retries=3, backoff_base=0.001)
+    assert asyncio.run(client.generate_answer("q", [])) == "ok"
+    assert backend.attempts == 3
+    assert client.stats["retries"] == 2
+
+def test_gives_up_after_max_retries():
+    client = AsyncLLMClient(backend=FlakyBackend(failures=5), max_retries=1, backoff_base=0.001)
+    with pytest.raises(ConnectionError):
+        asyncio.run(client.generate_answer("q", []))
+    assert client.stats["failures"] == 1
+
+def test_timeout_waiting_for_tokens():
+    client = AsyncLLMClient(backend=EchoBackend(token_delay=0.2), timeout=0.01, max_retries=0)
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(client.generate_answer("q", []))
+
+if __name__=='__main__':
+    test_streams_tokens()
+    test_concurrency_is_bounded()
+    test_retries_then_succeeds()
+    test_gives_up_after_max_retries()
+    test_timeout_waiting_for_tokens()
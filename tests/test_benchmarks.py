@@ -0,0 +1,25 @@
+from benchmarks import fixtures
+from benchmarks.run_benchmarks import compare_results, run_benchmarks
+
+def test_fixtures_are_deterministic():
+    assert fixtures.synthetic_ohlcv(50).equals(fixtures.synthetic_ohlcv(50))
+    assert fixtures.synthetic_corpus(8) == fixtures.synthetic_corpus(8)
+    encoder = fixtures.HashingEncoder()
+    assert encoder.encode(["NOG revenue", "NOG revenue"]).shape == (2, fixtures.EMBEDDING_DIM)
+
+def test_run_and_compare_benchmarks():
+    report = run_benchmarks(only=['compute_technical_indicators'], repeat=1, sizes={'rows': [120]})
+    [record] = report["results"]
+    assert record["status"] == "ok" and record["size"] == 120
+    comparison = compare_results(report, report)
+    assert comparison[0]["speedup"] == 1.0
+
+def test_classify_query_benchmark_runs_on_fixtures():
+    # the hashing encoder stands in for the model, no torch needed
+    [record] = run_benchmarks(only=['classify_query'], repeat=1, sizes={'queries': [20]})["results"]
+    assert record["status"] == "ok"
+
+if __name__=='__main__':
+    test_fixtures_are_deterministic()
+    test_run_and_compare_benchmarks()
+    test_classify_query_benchmark_runs_on_fixtures()
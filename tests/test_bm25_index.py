@@ -0,0 +1,88 @@
+import math
+from collections import Counter
+import pytest
+from src.llm.bm25_index import BM25Index, tokenize
+
+DOCS = {
+    "a": ("Filing type 10-Q submitted by NOG on 2024-11-05. Accession 0001104659-24-115432.", {"type": "sec_filing", "date_key": 20241105}),
+    "b": ("Net income for Q3 2024 was $120.5M, revenue grew on higher oil production.", {"type": "financials", "date_key": 20241105}),
+    "c": ("NOG announced an acquisition in the Permian basin with Vital Energy.", {"type": "news", "date_key": 20240612}),
+    "d": ("Crude oil prices rose as OPEC extended production cuts.", {"type": "news", "date_key": 20241020}),
+    "e": ("Quarterly dividend raised to $0.42 per share, net income up.", {"type": "news", "date_key": 20241101}),
+}
+
+def build(path, **kwargs):
+    index = BM25Index(str(path), **kwargs)
+    ids = list(DOCS)
+    index.upsert(ids, [DOCS[i][0] for i in ids], [DOCS[i][1] for i in ids])
+    return index
+
+def brute_force(query, k1=1.5, b=0.75):
+    docs = {i: Counter(tokenize(text)) for i, (text, _) in DOCS.items()}
+    avgdl = sum(sum(c.values()) for c in docs.values()) / len(docs)
+    scores = {}
+    for i, counts in docs.items():
+        dl = sum(counts.values())
+        score = 0.0
+        for term in set(tokenize(query)):
+            df = sum(term in c for c in docs.values())
+            if counts[term]:
+                idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+                score += idf * counts[term] * (k1 + 1) / (counts[term] + k1 * (1 - b + b * dl / avgdl))
+        if score > 0:
+            scores[i] = score
+    return sorted(scores.items(), key=lambda item: -item[1])
+
+def test_tokenize_keeps_identifiers():
+    tokens = tokenize("10-Q accession 0001104659-24-115432")
+    assert "10-q" in tokens and "0001104659-24-115432" in tokens and "115432" in tokens
+
+def test_scores_match_bm25(tmp_path):
+    index = build(tmp_path)
+    for query in ["net income Q3 2024", "NOG acquisition", "oil production"]:
+        got = index.search(query, top_k=5)
+        expected = brute_force(query)
+        assert [doc_id for doc_id, _ in got] == [doc_id for doc_id, _ in expected]
+        assert [s for _, s in got] == pytest.approx([s for _, s in expected], rel=1e-5)
+
+def test_exact_identifiers_rank_first(tmp_path):
+    index = build(tmp_path)
+    assert index.search("0001104659-24-115432", top_k=1)[0][0] == "a"
+    assert index.search("Q3 2024 10-Q net income", top_k=2)[0][0] in ("a", "b")
+
+def test_filters(tmp_path):
+    index = build(tmp_path)
+    assert {d for d, _ in index.search("NOG oil net income", chunk_types=["news"])} <= {"c", "d", "e"}
+    recent = {d for d, _ in index.search("NOG oil net income", chunk_types=["news"], within_days=30)}
+    assert recent == {"d", "e"}
+    assert index.search("oil", chunk_types=["price"]) == []
+
+def test_upsert_replaces_and_persists(tmp_path):
+    index = build(tmp_path)
+    index.upsert(["c"], ["Hedging program update for natural gas."], [{"type": "news", "date_key": 20241102}])
+    assert len(index) == 5
+    assert "c" not in {d for d, _ in index.search("acquisition Permian")}
+    reopened = BM25Index(str(tmp_path))
+    assert len(reopened) == 5
+    assert reopened.search("hedging", top_k=1)[0][0] == "c"
+    reopened.delete(["c"])
+    assert BM25Index(str(tmp_path)).search("hedging") == []
+
+def test_merge_keeps_results(tmp_path):
+    index = BM25Index(str(tmp_path), max_segments=2)
+    for doc_id, (text, metadata) in DOCS.items():
+        index.upsert([doc_id], [text], [metadata])
+    assert len(index.segments) <= 2
+    assert [d for d, _ in index.search("net income oil", top_k=5)] == [d for d, _ in brute_force("net income oil")]
+    index.merge()
+    assert len(index.segments) == 1
+    assert len(BM25Index(str(tmp_path))) == 5
+
+if __name__=='__main__':
+    import pathlib, tempfile
+    test_tokenize_keeps_identifiers()
+    test_scores_match_bm25(pathlib.Path(tempfile.mkdtemp()))
+    test_exact_identifiers_rank_first(pathlib.Path(tempfile.mkdtemp()))
+    test_filters(pathlib.Path(tempfile.mkdtemp()))
+    test_upsert_replaces_and_persists(pathlib.Path(tempfile.mkdtemp()))
+    test_merge_keeps_results(pathlib.Path(tempfile.mkdtemp()))
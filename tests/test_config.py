@@ -0,0 +1,48 @@
+import os
+from benchmarks.fixtures import write_fixture_data_root
+from src.config import PROJECT_ROOT, PipelineConfig
+
+def test_paths_resolve_against_project_root():
+    config = PipelineConfig.load()
+    assert config.path('stock_csv') == str(PROJECT_ROOT / 'data' / 'NOG.csv')
+    assert config.path('model_path') == str(PROJECT_ROOT / 'saved_models' / 'xgb_model.pkl')
+
+def test_data_and_model_roots_are_rebased(tmp_path, monkeypatch):
+    monkeypatch.setenv('NOG_DATA_ROOT', str(tmp_path / 'data'))
+    monkeypatch.setenv('NOG_OFFLINE', '1')
+    config = PipelineConfig.load(model_root=str(tmp_path / 'models'))
+    assert config.offline
+    assert config.path('news_chunks_path') == str(tmp_path / 'data' / 'chunks' / 'enhanced_news_chunks.json')
+    assert config.path('chroma_path') == str(tmp_path / 'data' / 'chroma_db')
+    assert config.path('model_path') == str(tmp_path / 'models' / 'xgb_model.pkl')
+
+def test_offline_data_pipeline_runs_on_fixture_root(tmp_path):
+    from src.data.data_pipeline import run_data_pipeline
+    write_fixture_data_root(str(tmp_path), n_rows=300)
+    config = PipelineConfig.load(data_root=str(tmp_path), offline=True)
+    df = run_data_pipeline(csvflag=False, config=config)
+    assert len(df) > 0
+    assert {'RSI_14', 'VWAP', 'Crude_Oil', 'Fed_Funds_Rate'} <= set(df.columns)
+
+def test_incremental_macro_fetch_extends_the_cache(tmp_path, monkeypatch):
+    import pandas as pd
+    from benchmarks.fixtures import synthetic_macro
+    from src.data import data_pipeline
+    write_fixture_data_root(str(tmp_path), n_rows=300)
+    config = PipelineConfig.load(data_root=str(tmp_path), offline=False)
+    cached = pd.read_csv(config.path('macro_cache_path'))
+    last = pd.to_datetime(cached['Date']).max()
+    monkeypatch.setattr(data_pipeline, 'macroeconomic_indicators',
+                        lambda start, end: synthetic_macro(start, end, seed=1))
+    fetched = data_pipeline.load_macro_data(last - pd.Timedelta(days=6), last + pd.Timedelta(days=10), config=config)
+    merged = data_pipeline.read_macro_cache(config.path('macro_cache_path'), '1900-01-01', '2100-01-01')
+    assert len(merged) == len(cached) + (fetched['Date'] > last).sum()
+    assert merged['Date'].is_unique and merged['Date'].is_monotonic_increasing
+    # refetched days take the new values
+    assert merged['Crude_Oil'].iloc[-1] == fetched['Crude_Oil'].iloc[-1]
+    assert (merged.set_index('Date').loc[fetched['Date'], 'Crude_Oil'].to_numpy() == fetched['Crude_Oil'].to_numpy()).all()
+
+if __name__=='__main__':
+    import pathlib, tempfile
+    test_paths_resolve_against_project_root()
+    test_offline_data_pipeline_runs_on_fixture_root(pathlib.Path(tempfile.mkdtemp()))
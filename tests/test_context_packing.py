@@ -0,0 +1,44 @@
+from src.llm.context_packing import count_tokens, pack_context, split_sentences, truncate_to_tokens
+from src.llm.llm_inference import build_prompt
+
+SEC = ("Northern Oil and Gas reported total revenue of $560.1M for the quarter. "
+       "Production averaged 120,000 barrels of oil equivalent per day. "
+       "The company raised its full year capital guidance. "
+       "Management expects continued growth in the Permian basin.")
+NEWS = "NOG announced a new acquisition in the Williston basin. The deal closes in Q3."
+
+def test_split_and_truncate_on_sentence_boundaries():
+    sentences = split_sentences(SEC)
+    assert len(sentences) == 4
+    first_two = count_tokens(sentences[0]) + count_tokens(sentences[1])
+    truncated = truncate_to_tokens(SEC, first_two + 2)
+    assert truncated == ' '.join(sentences[:2])
+
+def test_respects_budget_and_order():
+    texts = [NEWS, SEC, "Crude oil prices rose five percent this week."]
+    packed = pack_context(texts, max_tokens=40, min_chunk_tokens=5)
+    assert packed[0] == NEWS
+    assert sum(count_tokens(t) for t in packed) + count_tokens('\n\n') * (len(packed) - 1) <= 40
+    for text in packed[1:]:
+        assert text.endswith('.')
+
+def test_scores_reorder_chunks():
+    packed = pack_context([NEWS, SEC], max_tokens=1000, scores=[0.1, 0.9])
+    assert packed == [SEC, NEWS]
+
+def test_dedupes_overlapping_chunks():
+    overlapping = SEC.split('. ', 1)[1]
+    packed = pack_context([SEC, overlapping, NEWS], max_tokens=1000)
+    assert packed == [SEC, NEWS]
+
+def test_build_prompt_packs_context():
+    prompt = build_prompt("What was revenue?", [SEC] * 20, max_context_tokens=60)
+    assert prompt.count("Northern Oil and Gas reported") == 1
+    assert prompt.endswith("Question: What was revenue?\nAnswer:")
+
+if __name__=='__main__':
+    test_split_and_truncate_on_sentence_boundaries()
+    test_respects_budget_and_order()
+    test_scores_reorder_chunks()
+    test_dedupes_overlapping_chunks()
+    test_build_prompt_packs_context()
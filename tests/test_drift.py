@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+from src.features.feature_matrix import FeatureMatrix
+from src.models.drift import (population_stability_index, ks_statistic, horizon_mae, TrainingSnapshot,
+                              error_drift, detect_drift)
+
+def make_matrix(n_rows=300, shift_after=None, shift=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.normal(size=(n_rows, 4)).astype(np.float32)
+    if shift_after is not None:
+        values[shift_after:] += shift
+    return FeatureMatrix(values, ['a', 'b', 'c', 'd'], target=np.full(n_rows, 20.0),
+                         dates=pd.bdate_range('2024-01-01', periods=n_rows).values)
+
+def make_scored(errors):
+    dates = pd.bdate_range('2025-01-06', periods=len(errors))
+    return pd.DataFrame({'target_date': dates, 'run_date': dates - pd.offsets.BDay(1),
+                         'abs_error': np.abs(errors)})
+
+def test_psi_and_ks():
+    rng = np.random.default_rng(1)
+    reference = rng.normal(size=5000)
+    assert population_stability_index(reference, rng.normal(size=5000)) < 0.02
+    assert population_stability_index(reference, rng.normal(loc=1.0, size=5000)) > 0.25
+    assert ks_statistic(reference, reference) == 0.0
+    assert ks_statistic(np.arange(10.0), np.arange(10.0) + 100) == 1.0
+    assert np.isnan(ks_statistic(reference, np.array([np.nan])))
+
+def test_snapshot_round_trip(tmp_path):
+    snapshot = TrainingSnapshot.from_matrix(make_matrix(), model_version='abc', baseline_mae=0.4)
+    snapshot.save(str(tmp_path / 'snapshot.npz'))
+    loaded = TrainingSnapshot.load(str(tmp_path / 'snapshot.npz'))
+    assert loaded.feature_columns == ['a', 'b', 'c', 'd'] and loaded.model_version == 'abc'
+    assert loaded.quantiles.shape == (101, 4) and loaded.baseline_mae == 0.4
+    np.testing.assert_array_equal(loaded.quantiles, snapshot.quantiles)
+
+def test_retrain_only_when_stale():
+    snapshot = TrainingSnapshot.from_matrix(make_matrix(), model_version='abc', baseline_mae=0.5)
+    today = pd.Timestamp(snapshot.trained_at).date()
+
+    stable = detect_drift(snapshot, make_matrix(), make_scored(np.full(20, 0.5)), today=today)
+    assert stable['retrain'] is False and stable['reasons'] == []
+
+    shifted = detect_drift(snapshot, make_matrix(n_rows=400, shift_after=300, shift=2.0), today=today)
+    assert shifted['retrain'] and 'features drifted' in shifted['reasons'][0]
+    assert set(shifted['drifted_features']) == {'a', 'b', 'c', 'd'}
+
+    worse = detect_drift(snapshot, make_matrix(), make_scored(np.full(20, 1.5)), today=today)
+    assert worse['retrain'] and 'backtest MAE' in worse['reasons'][0]
+
+    growing = detect_drift(snapshot, make_matrix(), make_scored(np.r_[np.full(10, 0.3), np.full(10, 0.8)]),
+                           today=today)
+    assert growing['retrain'] and 'grew' in growing['reasons'][0]
+    # too few live predictions to judge the errors
+    assert not detect_drift(snapshot, make_matrix(), make_scored(np.full(3, 5.0)), today=today)['retrain']
+
+    old = detect_drift(snapshot, make_matrix(), settings={'max_model_age_days': 30},
+                       today=today + pd.Timedelta(days=45))
+    assert old['retrain'] and 'days old' in old['reasons'][0]
+
+def test_error_trend_needs_enough_predictions():
+    assert np.isnan(error_drift(make_scored(np.ones(3)))['error_trend'])
+    assert error_drift(make_scored(np.r_[np.ones(4), np.full(4, 2.0)]))['error_trend'] == 2.0
+
+def test_horizon_mae():
+    predictions = np.array([1.0, 2.0, 3.0, 4.0])
+    # each prediction against the actuals one and two rows later
+    assert horizon_mae(predictions, predictions, max_horizon=2) == np.mean([1, 1, 1, 2, 2])
+    assert np.isnan(horizon_mae(predictions[:1], predictions[:1]))
+
+def make_pipeline(tmp_path):
+    from benchmarks.fixtures import write_fixture_data_root
+    from src.config import PipelineConfig
+    from src.models.weekly_predict import WeeklyPredictionPipeline
+    write_fixture_data_root(str(tmp_path / 'data'), n_rows=300)
+    config = PipelineConfig.load(data_root=str(tmp_path / 'data'), model_root=str(tmp_path / 'models'),
+                                 offline=True)
+    return WeeklyPredictionPipeline(config=config)
+
+def test_unchanged_model_with_normal_live_errors_is_kept(tmp_path):
+    pipeline = make_pipeline(tmp_path)
+    matrix = pipeline.prepare_features(pipeline.fetch_latest_data())
+    n = len(matrix)
+    pipeline.retrain_model(matrix)
+    # four weekly runs of forecasts on held-out test rows stand in for normal live errors
+    for run in range(n - 26, n - 6, 5):
+        pred = float(pipeline.model.predict(matrix.values[run:run + 1])[0])
+        dates = pd.to_datetime(matrix.dates[run + 1:run + 6]).strftime('%Y-%m-%d')
+        pipeline.history.add_predictions([{"date": d, "predicted_price": pred,
+                                           "confidence_interval": pipeline._calculate_confidence_interval(pred)}
+                                          for d in dates],
+                                         model_version=pipeline.model_version,
+                                         run_date=str(pd.Timestamp(matrix.dates[run]).date()))
+    decision = pipeline.check_drift(matrix)
+    assert decision['scored_predictions'] >= 5
+    assert decision['error_ratio'] < 2.0
+    assert decision['retrain'] is False, decision['reasons']
+
+def test_weekly_pipeline_records_retrain_decisions(tmp_path):
+    from src.models.weekly_predict import WeeklyPredictionPipeline
+    pipeline = make_pipeline(tmp_path)
+    first = pipeline.run_weekly_pipeline(prediction_days=3)
+    assert first['status'] == 'success' and first['retrained']
+    second = WeeklyPredictionPipeline(config=pipeline.config).run_weekly_pipeline(prediction_days=3)
+    assert second['status'] == 'success' and not second['retrained']
+    assert 'R2' in second['model_metrics']
+    decisions = pipeline.history.retrain_decisions()
+    assert [d['retrain'] for d in decisions] == [True, False]
+    assert decisions[0]['reasons'] == ["No saved model"]
+    assert pipeline.get_performance_history()[-1]['retrain_reasons'] == ["No saved model"]
+
+if __name__=='__main__':
+    import pathlib, tempfile
+    test_psi_and_ks()
+    test_snapshot_round_trip(pathlib.Path(tempfile.mkdtemp()))
+    test_retrain_only_when_stale()
+    test_error_trend_needs_enough_predictions()
+    test_horizon_mae()
+    test_unchanged_model_with_normal_live_errors_is_kept(pathlib.Path(tempfile.mkdtemp()))
+    test_weekly_pipeline_records_retrain_decisions(pathlib.Path(tempfile.mkdtemp()))
@@ -0,0 +1,89 @@
+import threading
+import numpy as np
+import pytest
+from benchmarks.fixtures import HashingEncoder
+from src.llm.embedding_scheduler import EmbeddingScheduler
+
+class CountingEncoder(HashingEncoder):
+    def __init__(self, fail=False):
+        super().__init__()
+        self.calls = []
+        self.fail = fail
+
+    def encode(self, sentences, **kwargs):
+        self.calls.append(list(sentences))
+        if self.fail:
+            raise RuntimeError("encoder down")
+        return super().encode(sentences, **kwargs)
+
+def encode_concurrently(scheduler, texts):
+    results = [None] * len(texts)
+    barrier = threading.Barrier(len(texts))
+
+    def worker(i):
+        barrier.wait()
+        results[i] = scheduler.encode(texts[i], timeout=5)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(texts))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+def test_batches_concurrent_requests():
+    encoder = CountingEncoder()
+    scheduler = EmbeddingScheduler(encoder, max_batch_size=64, max_wait_ms=50)
+    texts = [f"What is NOG's revenue in Q{i % 4 + 1}?" for i in range(16)]
+    results = encode_concurrently(scheduler, texts)
+    scheduler.close()
+    reference = HashingEncoder()
+    for text, vector in zip(texts, results):
+        np.testing.assert_allclose(vector, reference.encode(text))
+    # 16 callers, far fewer forward passes, duplicates encoded once
+    assert len(encoder.calls) < 16
+    assert all(len(batch) == len(set(batch)) for batch in encoder.calls)
+    assert scheduler.stats["requests"] == 16
+    assert scheduler.stats["encoded"] <= 16
+
+def test_respects_max_batch_size():
+    encoder = CountingEncoder()
+    scheduler = EmbeddingScheduler(encoder, max_batch_size=4, max_wait_ms=50)
+    encode_concurrently(scheduler, [f"q{i}" for i in range(12)])
+    scheduler.close()
+    assert max(len(batch) for batch in encoder.calls) <= 4
+
+def test_encoder_errors_reach_callers():
+    scheduler = EmbeddingScheduler(CountingEncoder(fail=True), max_wait_ms=1)
+    with pytest.raises(RuntimeError):
+        scheduler.encode("q", timeout=5)
+    scheduler.close()
+    with pytest.raises(RuntimeError):
+        scheduler.submit("q")
+
+def test_submits_racing_close_always_resolve():
+    scheduler = EmbeddingScheduler(CountingEncoder(), max_wait_ms=1)
+    futures = []
+
+    def worker():
+        for i in range(200):
+            try:
+                futures.append(scheduler.submit(f"q{i}"))
+            except RuntimeError:
+                return
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    scheduler.close()
+    for t in threads:
+        t.join()
+    # every accepted text was queued ahead of the stop marker
+    assert all(f.result(timeout=5) is not None for f in futures)
+    assert scheduler.stats["requests"] == len(futures)
+
+if __name__=='__main__':
+    test_batches_concurrent_requests()
+    test_respects_max_batch_size()
+    test_encoder_errors_reach_callers()
+    test_submits_racing_close_always_resolve()
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.rl.agent import QLearningAgent
+from src.rl.environment import HistoricalTradingEnv
+from src.rl.reward import compute_reward
+from src.rl.run_rl_loop import simulate_trading, train_agent
+from src.rl.state_builder import build_state
+
+def make_history(n_days=300, seed=0):
+    rng = np.random.default_rng(seed)
+    prices = 30 + np.cumsum(rng.normal(0, 0.5, n_days))
+    forecasts = prices + rng.normal(0, 1.0, n_days)
+    sentiment = rng.uniform(-1, 1, n_days)
+    return prices, forecasts, sentiment
+
+def test_batch_steps_match_scalar_reward_and_state():
+    prices, forecasts, sentiment = make_history()
+    env = HistoricalTradingEnv(prices, forecasts, sentiment, n_envs=4, episode_length=50, seed=1)
+    starts = np.array([0, 10, 100, 249])
+    states = env.reset(starts)
+    rng = np.random.default_rng(2)
+    for t in range(env.steps):
+        for k, day in enumerate(starts + t):
+            np.testing.assert_array_equal(states[k], build_state(prices[day], forecasts[day], sentiment[day]))
+        actions = rng.integers(0, 3, 4)
+        rewards, states = env.step(actions)
+        for k, day in enumerate(starts + t):
+            assert rewards[k] == compute_reward(prices[day], prices[day + 1], actions[k])
+    assert env.done
+    np.testing.assert_allclose(env.total_reward, env.rewards.sum(axis=0))
+    with pytest.raises(RuntimeError):
+        env.step(np.zeros(4, dtype=int))
+
+def test_default_multi_env_episodes_start_on_different_days():
+    prices, forecasts, sentiment = make_history(n_days=1000)
+    env = HistoricalTradingEnv(prices, forecasts, sentiment, n_envs=32, seed=0)
+    assert env.steps == 252
+    assert len(np.unique(env.start)) > 1
+    # short histories still leave room for random starts
+    short = HistoricalTradingEnv(*make_history(n_days=100), n_envs=8, seed=0)
+    assert short.steps == 49 and len(np.unique(short.start)) > 1
+
+def test_single_env_follows_simulate_trading_interface():
+    prices, forecasts, sentiment = make_history(n_days=60)
+    env = HistoricalTradingEnv(prices, forecasts, sentiment)
+    assert env.steps == 59 and env.current_price() == prices[0]
+    total = simulate_trading(env, QLearningAgent(state_size=3, seed=0))
+    assert isinstance(total, float)
+    assert total == pytest.approx(env.total_reward[0])
+
+def test_from_frame_and_random_starts():
+    prices, forecasts, sentiment = make_history(n_days=100)
+    df = pd.DataFrame({'Close': prices, 'sentiment': sentiment})
+    env = HistoricalTradingEnv.from_frame(df, forecasts, 'sentiment', n_envs=8, episode_length=20, seed=3)
+    assert env.start.min() >= 0 and env.start.max() <= 100 - 1 - 20
+    np.testing.assert_array_equal(env.state()[:, 2], sentiment[env.start])
+    with pytest.raises(ValueError):
+        HistoricalTradingEnv(prices, forecasts[:-1])
+    with pytest.raises(ValueError):
+        HistoricalTradingEnv(prices, forecasts, episode_length=100)
+
+def test_train_agent_runs_all_episodes():
+    prices, forecasts, sentiment = make_history(n_days=1000)
+    env = HistoricalTradingEnv(prices, forecasts, sentiment, n_envs=16, episode_length=250, seed=0)
+    agent = QLearningAgent(state_size=3, seed=0)
+    totals = train_agent(env, agent, n_epochs=3)
+    assert totals.shape == (3, 16)
+    assert agent.visited.any()
+    np.testing.assert_allclose(totals[-1], env.total_reward)
+
+if __name__=='__main__':
+    test_batch_steps_match_scalar_reward_and_state()
+    test_default_multi_env_episodes_start_on_different_days()
+    test_single_env_follows_simulate_trading_interface()
+    test_from_frame_and_random_starts()
+    test_train_agent_runs_all_episodes()
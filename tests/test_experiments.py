@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from src.rl.experiments import evaluate_rewards, parameter_grid, run_experiments, run_training, summarize
+
+def make_history(n_days=200, seed=0):
+    rng = np.random.default_rng(seed)
+    prices = 30 + np.cumsum(rng.normal(0, 0.5, n_days))
+    return prices, prices + rng.normal(0, 1.0, n_days), rng.uniform(-1, 1, n_days)
+
+def test_evaluate_rewards():
+    metrics = evaluate_rewards(np.array([1.0, -3.0, 2.0, 1.0]))
+    assert metrics["total_reward"] == 1.0
+    assert metrics["max_drawdown"] == 3.0
+    assert metrics["sharpe"] == pytest.approx(0.25 / np.std([1.0, -3.0, 2.0, 1.0]) * np.sqrt(252))
+    assert evaluate_rewards(np.zeros(5))["sharpe"] == 0.0
+
+def test_runs_are_deterministic_across_workers():
+    history = make_history()
+    configs = parameter_grid(alpha=[0.05, 0.2], epsilon=[0.1])
+    kwargs = dict(configs=configs, seeds=[0, 1, 2], n_envs=8, episode_length=50, n_epochs=2)
+    serial = run_experiments(*history, max_workers=1, **kwargs)
+    parallel = run_experiments(*history, max_workers=2, **kwargs)
+    assert len(serial) == 6
+    assert serial == parallel
+    assert serial[0] != serial[1]
+
+    summary = summarize(serial)
+    assert list(summary["alpha"]) == [0.05, 0.2]
+    assert list(summary["runs"]) == [3, 3]
+    assert {"sharpe_mean", "total_reward_std", "max_drawdown_mean"} <= set(summary.columns)
+
+def test_q_tables_are_returned_on_request():
+    [result] = run_experiments(*make_history(), seeds=[0], max_workers=1, n_envs=4, n_epochs=1,
+                               return_q_table=True)
+    assert result["q_table"].dtype == np.float32
+    assert np.isfinite(result["q_table"]).all()
+    assert summarize([result])["runs"][0] == 1
+
+def test_policy_is_scored_on_held_out_tail(monkeypatch):
+    from src.rl import experiments
+    prices, forecasts, sentiment = make_history()
+    replayed = []
+    greedy = experiments.greedy_rewards
+    monkeypatch.setattr(experiments, 'greedy_rewards',
+                        lambda agent, *history: replayed.append(history[0]) or greedy(agent, *history))
+    kwargs = dict(n_envs=4, episode_length=50, n_epochs=2)
+    result = run_training({}, 0, prices, forecasts, sentiment, eval_fraction=0.25, **kwargs)
+    # the replay starts on the last training day
+    np.testing.assert_array_equal(replayed[-1], prices[149:])
+
+    # training never sees the tail
+    changed = prices.copy()
+    changed[150:] += 10.0
+    other = run_training({}, 0, changed, forecasts, sentiment, eval_fraction=0.25, **kwargs)
+    assert other["train_reward"] == result["train_reward"]
+    assert other["total_reward"] != result["total_reward"]
+
+    run_training({}, 0, prices, forecasts, sentiment, eval_fraction=0, **kwargs)
+    np.testing.assert_array_equal(replayed[-1], prices)
+    with pytest.raises(ValueError):
+        run_training({}, 0, prices[:3], forecasts[:3], sentiment[:3], eval_fraction=0.1, **kwargs)
+
+def test_default_training_stays_finite():
+    # the defaults: 32 episodes of a trading year over a longer history
+    result = run_training({}, 0, *make_history(n_days=1500), n_epochs=5, return_q_table=True)
+    assert np.isfinite(result["q_table"]).all()
+    assert np.abs(result["q_table"]).max() < 100
+    assert np.isfinite([result["sharpe"], result["total_reward"], result["max_drawdown"]]).all()
+
+if __name__=='__main__':
+    test_evaluate_rewards()
+    test_runs_are_deterministic_across_workers()
+    test_q_tables_are_returned_on_request()
+    test_default_training_stays_finite()
@@ -0,0 +1,79 @@
+import tracemalloc
+import numpy as np
+import pandas as pd
+from src.features.feature_matrix import FeatureMatrix
+
+def make_frame(n=50, tickers=None):
+    dates = pd.date_range('2024-01-01', periods=n)
+    if tickers:
+        dates = np.repeat(dates, len(tickers))
+    df = pd.DataFrame({'Date': dates})
+    if tickers:
+        df['Ticker'] = tickers * n
+    df['Close'] = np.arange(len(df), dtype=float)
+    df['ma_10'] = np.arange(len(df), dtype=float) * 2
+    df['RSI_14'] = np.linspace(0, 100, len(df))
+    return df
+
+def test_from_frame_builds_contiguous_float32_buffer():
+    df = make_frame()
+    df.loc[[0, 1], 'ma_10'] = np.nan
+    df.loc[10, 'RSI_14'] = np.nan
+
+    matrix = FeatureMatrix.from_frame(df)
+    assert matrix.feature_columns == ['ma_10', 'RSI_14']
+    assert matrix.values.dtype == np.float32 and matrix.values.flags['C_CONTIGUOUS']
+    # same result as the old ffill/bfill on the copied frame
+    expected = df[['ma_10', 'RSI_14']].ffill().bfill().to_numpy(dtype=np.float32)
+    np.testing.assert_array_equal(matrix.values, expected)
+    np.testing.assert_array_equal(matrix.target, df['Close'].to_numpy())
+
+def test_split_returns_views_matching_train_test_split():
+    matrix = FeatureMatrix.from_frame(make_frame(51))
+    train, test = matrix.split(test_size=0.2)
+    assert (len(train), len(test)) == (40, 11)
+    assert np.shares_memory(train.values, matrix.values)
+    assert np.shares_memory(test.values, matrix.values)
+    assert test.target[0] == 40
+
+def test_multi_ticker_fill_and_split_respect_boundaries():
+    df = make_frame(10, tickers=['NOG', 'XOM'])
+    df.loc[df['Ticker'] == 'XOM', 'ma_10'] = np.nan
+    df.loc[1, 'ma_10'] = 5.0  # first XOM row gets a value, the rest must not borrow NOG's
+    matrix = FeatureMatrix.from_frame(df)
+    xom = matrix.values[matrix.tickers == 'XOM', 0]
+    assert np.all(xom == 5.0)
+
+    train, test = matrix.split(test_size=0.25)
+    assert len(train) % 2 == 0
+    assert train.dates[-1] < test.dates[0]
+
+def test_from_frame_peak_memory_stays_near_the_buffer():
+    rng = np.random.default_rng(0)
+    n_rows, n_features = 5000, 40
+    df = pd.DataFrame(rng.normal(size=(n_rows, n_features)), columns=[f"f{j}" for j in range(n_features)])
+    df.iloc[::7, 3] = np.nan
+    df.insert(0, 'Date', pd.bdate_range('2000-01-03', periods=n_rows))
+    df['Close'] = rng.normal(size=n_rows)
+    buffer_bytes = n_rows * n_features * np.dtype(np.float32).itemsize
+
+    tracemalloc.start()
+    try:
+        matrix = FeatureMatrix.from_frame(df)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        df.drop(columns=['Date', 'Close']).ffill().bfill().to_numpy(dtype=np.float32)
+        pandas_peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert matrix.values.nbytes == buffer_bytes
+    # the buffer plus small per-column temporaries, where the pandas route makes
+    # several float64 copies of the frame
+    assert peak < 1.5 * buffer_bytes
+    assert pandas_peak > 2 * peak
+
+if __name__=='__main__':
+    test_from_frame_builds_contiguous_float32_buffer()
+    test_split_returns_views_matching_train_test_split()
+    test_multi_ticker_fill_and_split_respect_boundaries()
+    test_from_frame_peak_memory_stays_near_the_buffer()
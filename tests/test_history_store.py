@@ -0,0 +1,59 @@
+import json
+from src.models.history_store import HistoryStore
+
+def make_predictions(run_date, dates, price=20.0):
+    return [{"date": d, "predicted_price": price + i, "prediction_date": run_date,
+             "confidence_interval": {"lower": price + i - 0.4, "upper": price + i + 0.4, "confidence_level": 0.95}}
+            for i, d in enumerate(dates)]
+
+def test_predictions_are_appended_and_range_queried(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.sqlite"))
+    store.add_predictions(make_predictions("2025-01-03", ["2025-01-06", "2025-01-07"]), model_version="a")
+    store.add_predictions(make_predictions("2025-01-10", ["2025-01-13", "2025-01-14"]), model_version="b")
+    # re-running a day replaces its rows instead of duplicating them
+    store.add_predictions(make_predictions("2025-01-10", ["2025-01-13", "2025-01-14"], price=21.0), model_version="b")
+
+    df = store.predictions(start="2025-01-07", end="2025-01-13")
+    assert list(df["target_date"].dt.strftime("%Y-%m-%d")) == ["2025-01-07", "2025-01-13"]
+    assert list(df["horizon"]) == [2, 1]
+    assert df["predicted_price"].iloc[-1] == 21.0
+    assert len(store.predictions(model_version="a")) == 2
+
+    # the store survives reopening
+    assert len(HistoryStore(str(tmp_path / "history.sqlite")).predictions()) == 4
+
+    # a same-day rerun keeps the row count but not the version
+    version = store.predictions_version()
+    assert version[0] == 4
+    store.add_predictions(make_predictions("2025-01-10", ["2025-01-13", "2025-01-14"], price=22.0), model_version="b")
+    assert store.predictions_version()[0] == 4 and store.predictions_version() != version
+
+    assert store.drop_before("2025-01-05") == 2
+    assert set(store.predictions()["model_version"]) == {"b"}
+
+def test_performance_history_keeps_payloads():
+    store = HistoryStore()
+    for week in range(3):
+        store.add_performance({"training_date": f"2025-01-0{week + 1}T09:00:00",
+                               "metrics": {"MSE": 1.0, "MAE": 0.5 + week, "R2": 0.9}})
+    history = store.performance()
+    assert [h["metrics"]["MAE"] for h in history] == [0.5, 1.5, 2.5]
+    assert [h["metrics"]["MAE"] for h in store.performance(limit=2)] == [1.5, 2.5]
+
+def test_pipeline_imports_legacy_performance_file(tmp_path):
+    from src.models.weekly_predict import WeeklyPredictionPipeline
+    legacy = tmp_path / "model_performance.json"
+    legacy.write_text(json.dumps([{"training_date": "2024-06-01T09:00:00", "metrics": {"R2": 0.8}}]))
+    pipeline = WeeklyPredictionPipeline(model_path=str(tmp_path / "model.pkl"),
+                                        predictions_path=str(tmp_path / "predictions.json"),
+                                        performance_path=str(legacy),
+                                        history_path=str(tmp_path / "history.sqlite"))
+    assert pipeline.get_performance_history() == [{"training_date": "2024-06-01T09:00:00", "metrics": {"R2": 0.8}}]
+    pipeline.save_performance({"training_date": "2024-06-08T09:00:00", "metrics": {"R2": 0.85}})
+    assert len(pipeline.get_performance_history()) == 2
+
+if __name__=='__main__':
+    import pathlib, tempfile
+    test_predictions_are_appended_and_range_queried(pathlib.Path(tempfile.mkdtemp()))
+    test_performance_history_keeps_payloads()
+    test_pipeline_imports_legacy_performance_file(pathlib.Path(tempfile.mkdtemp()))
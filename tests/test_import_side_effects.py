@@ -0,0 +1,20 @@
+import pytest
+from benchmarks.startup import measure_import
+
+@pytest.mark.parametrize('module', [
+    'src.models.weekly_predict',
+    'src.models.pipeline_stages',
+    'src.models.embed',
+    'src.llm.llm_inference',
+    'src.llm.query_classifier',
+])
+def test_import_is_cheap_and_network_free(module):
+    # fresh interpreter, no OPENAI_API_KEY: the import must succeed without
+    # loading network clients, plotting or model libraries
+    result = measure_import(module, repeat=1)
+    assert result['heavy_modules_loaded'] == []
+
+if __name__=='__main__':
+    for module in ['src.models.weekly_predict', 'src.models.pipeline_stages', 'src.models.embed', 'src.llm.llm_inference',
+                   'src.llm.query_classifier']:
+        test_import_is_cheap_and_network_free(module)
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+from src.features import indicator_kernels
+from src.features.indicator_kernels import INDICATOR_COLUMNS, allocate_indicator_buffer, compute_indicators
+from src.features.feature_engineering import calculate_rsi, compute_technical_indicators
+
+def reference_indicators(close, volume):
+    # the pandas implementation the kernels replace
+    df = pd.DataFrame({'Close': close, 'Volume': volume})
+    df['ma_10'] = df['Close'].rolling(window=10).mean()
+    df['m_50'] = df['Close'].rolling(window=50).mean()
+    df['daily_change'] = df['Close'] / df['Close'].shift(1) - 1
+    df['volatility_10'] = df['Close'].rolling(window=10).std()
+    df['RSI_14'] = calculate_rsi(df['Close'], window=14)
+    mavg = df['Close'].rolling(20).mean()
+    mstd = df['Close'].rolling(20).std(ddof=0)
+    df['bb_high'] = mavg + 2 * mstd
+    df['bb_low'] = mavg - 2 * mstd
+    df['Momentum_10'] = df['Close'] - df['Close'].shift(10)
+    df['Cumulative_Price_Volume'] = (df['Close'] * df['Volume']).cumsum()
+    df['Cumulative_Volume'] = df['Volume'].cumsum()
+    df['VWAP'] = df['Cumulative_Price_Volume'] / df['Cumulative_Volume']
+    return df
+
+def synthetic_prices(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 30 + np.cumsum(rng.normal(0, 0.5, n))
+    volume = rng.integers(100_000, 2_000_000, n).astype(float)
+    return close, volume
+
+def assert_matches_reference(values, close, volume):
+    expected = reference_indicators(close, volume)
+    for name, row in zip(INDICATOR_COLUMNS, values):
+        np.testing.assert_allclose(row, expected[name].to_numpy(), rtol=1e-7, atol=1e-9, err_msg=name)
+
+def test_kernels_match_pandas():
+    close, volume = synthetic_prices()
+    assert_matches_reference(compute_indicators(close, volume), close, volume)
+    # both code paths are checked regardless of whether numba is installed
+    assert_matches_reference(indicator_kernels._numpy_kernel(close, volume, allocate_indicator_buffer(len(close))), close, volume)
+    fused = indicator_kernels._fused_kernel
+    assert_matches_reference(fused(close, volume, allocate_indicator_buffer(len(close))), close, volume)
+
+def test_kernels_handle_missing_values_like_pandas():
+    close, volume = synthetic_prices(200, seed=1)
+    close[[5, 60, 61]] = np.nan
+    volume[100] = np.nan
+    assert_matches_reference(indicator_kernels._numpy_kernel(close, volume, allocate_indicator_buffer(len(close))), close, volume)
+    fused = indicator_kernels._fused_kernel
+    assert_matches_reference(fused(close, volume, allocate_indicator_buffer(len(close))), close, volume)
+
+def test_fused_kernel_volatility_does_not_drift():
+    # high price level, tiny spread: raw sums of squares cancel to noise here
+    rng = np.random.default_rng(2)
+    close = 1e5 + np.cumsum(rng.normal(0, 0.01, 20_000))
+    volume = np.ones_like(close)
+    fused = indicator_kernels._fused_kernel(close, volume, allocate_indicator_buffer(len(close)))
+    # the NumPy kernel computes every window from scratch
+    exact = indicator_kernels._numpy_kernel(close, volume, allocate_indicator_buffer(len(close)))
+    row = INDICATOR_COLUMNS.index('volatility_10')
+    np.testing.assert_allclose(fused[row], exact[row], rtol=1e-4)
+    # band width, the levels alone would hide the error
+    high, low = INDICATOR_COLUMNS.index('bb_high'), INDICATOR_COLUMNS.index('bb_low')
+    np.testing.assert_allclose(fused[high] - fused[low], exact[high] - exact[low], rtol=1e-4)
+
+def test_compute_indicators_writes_into_buffer():
+    close, volume = synthetic_prices(30)
+    out = allocate_indicator_buffer(len(close))
+    assert compute_indicators(close, volume, out=out) is out
+    df = compute_technical_indicators(pd.DataFrame({'Close': close, 'Volume': volume}))
+    assert list(df.columns[2:]) == list(INDICATOR_COLUMNS)
+
+if __name__=='__main__':
+    test_kernels_match_pandas()
+    test_kernels_handle_missing_values_like_pandas()
+    test_fused_kernel_volatility_does_not_drift()
+    test_compute_indicators_writes_into_buffer()
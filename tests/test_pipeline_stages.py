@@ -0,0 +1,59 @@
+import json
+import pandas as pd
+from benchmarks.fixtures import write_fixture_data_root
+from src.config import PipelineConfig
+from src.models import pipeline_stages
+from src.utils.artifact_store import ArtifactStore
+
+def make_config(tmp_path):
+    write_fixture_data_root(str(tmp_path / 'data'), n_rows=300)
+    config = PipelineConfig.load(data_root=str(tmp_path / 'data'), model_root=str(tmp_path / 'models'),
+                                 offline=True)
+    config.settings['model']['parameters'] = {"n_estimators": 10, "max_depth": 2}
+    return config
+
+def test_stages_skip_when_inputs_are_unchanged(tmp_path):
+    config = make_config(tmp_path)
+    first = pipeline_stages.run_staged_pipeline(config, prediction_days=3)
+    assert not first['prices']['updated'] and not first['macro']['updated']
+    assert not first['features']['skipped'] and not first['train']['skipped']
+    with open(first['predict']['path']) as f:
+        assert len(json.load(f)['predictions']) == 3
+    store = ArtifactStore.from_config(config)
+    assert len(store.get(first['predict']['artifact'])['predictions']) == 3
+    assert 'R2' in store.get(first['train']['artifact'])['metrics']
+    # the new predictions target dates past the last close
+    assert first['score']['scored_predictions'] == 0 and first['score']['alerts'] == []
+
+    second = pipeline_stages.run_staged_pipeline(config, prediction_days=3)
+    assert second['features']['skipped'] and second['train']['skipped'] and second['predict']['skipped']
+    assert second['score']['skipped']
+    assert second['predict']['artifact']['uri'] == first['predict']['artifact']['uri']
+
+    # changed price rows rebuild features, but the model only retrains on drift
+    stock_csv = config.path('stock_csv')
+    prices = pd.read_csv(stock_csv)
+    prices.iloc[:-5].to_csv(stock_csv, index=False)
+    third = pipeline_stages.run_staged_pipeline(config, prediction_days=3)
+    assert not third['features']['skipped'] and not third['predict']['skipped']
+    assert third['features']['rows'] < first['features']['rows']
+    assert third['train']['skipped'] and third['train']['decision']['retrain'] is False
+    forced = pipeline_stages.train(config, force=True)
+    assert not forced['skipped'] and forced['decision']['reasons'] == ["Retraining requested"]
+
+def test_failed_price_fetch_keeps_saved_prices(tmp_path, monkeypatch):
+    config = make_config(tmp_path)
+    config.offline = False
+    stock_csv = config.path('stock_csv')
+    before = pipeline_stages.file_fingerprint(stock_csv)
+
+    def fail(*args, **kwargs):
+        raise ConnectionError("Yahoo unavailable")
+    monkeypatch.setattr('src.data.data_pipeline.get_data_from_yahoo', fail)
+    result = pipeline_stages.refresh_prices(config)
+    assert result['updated'] is False and 'Yahoo unavailable' in result['error']
+    assert pipeline_stages.file_fingerprint(stock_csv) == before
+
+if __name__=='__main__':
+    import pathlib, tempfile
+    test_stages_skip_when_inputs_are_unchanged(pathlib.Path(tempfile.mkdtemp()))
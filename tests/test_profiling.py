@@ -0,0 +1,40 @@
+import json
+import sys
+import types
+import pytest
+from src.utils import profiling
+from src.utils.profiling import PipelineProfiler, io_counters
+
+def test_profiler_records_stages(tmp_path):
+    profiler = PipelineProfiler()
+    with profiler.stage("fetch") as stage:
+        (tmp_path / "data.csv").write_text("a,b\n1,2\n")
+        stage["rows"] = 1
+    with pytest.raises(ValueError):
+        with profiler.stage("train", rows=10):
+            raise ValueError("boom")
+
+    summary = profiler.save(str(tmp_path / "pipeline_metrics.json"))
+    assert [s["stage"] for s in summary["stages"]] == ["fetch", "train"]
+    assert summary["stages"][0]["rows"] == 1
+    assert summary["stages"][1]["status"] == "error"
+    for record in summary["stages"]:
+        assert record["wall_seconds"] >= 0
+        assert record["cpu_seconds"] >= 0
+    assert json.loads((tmp_path / "pipeline_metrics.json").read_text()) == summary
+
+def test_io_counters_prefer_character_counts(monkeypatch):
+    def no_proc(*args, **kwargs):
+        raise OSError("no /proc")
+    monkeypatch.setattr(profiling, 'open', no_proc, raising=False)
+    counters = types.SimpleNamespace(read_chars=10, write_chars=20, read_bytes=1, write_bytes=2)
+    fake_psutil = types.SimpleNamespace(Process=lambda: types.SimpleNamespace(io_counters=lambda: counters))
+    monkeypatch.setitem(sys.modules, 'psutil', fake_psutil)
+    assert io_counters() == {'read': 10, 'write': 20, 'counter': 'chars'}
+    # platforms without character counters are labelled
+    counters = types.SimpleNamespace(read_bytes=1, write_bytes=2)
+    assert io_counters() == {'read': 1, 'write': 2, 'counter': 'bytes'}
+
+if __name__=='__main__':
+    import pathlib, tempfile
+    test_profiler_records_stages(pathlib.Path(tempfile.mkdtemp()))
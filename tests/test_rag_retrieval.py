@@ -0,0 +1,150 @@
+import pytest
+pytest.importorskip('chromadb')
+from benchmarks.fixtures import HashingEmbeddingFunction, HashingEncoder, synthetic_corpus, write_jsonl
+from src.llm.intent_routing import IntentRouter
+from src.llm.rag_retrieval import ChromaDBRetriever, date_key
+
+def build_retriever(tmp_path, n_docs=40, partition_by_type=True, hybrid=False):
+    retriever = ChromaDBRetriever(collection_name="test_corpus", persist_directory=str(tmp_path / "chroma"),
+                                  embedding_function=HashingEmbeddingFunction(),
+                                  partition_by_type=partition_by_type, hybrid=hybrid)
+    retriever.build_index_from_jsonl(write_jsonl(synthetic_corpus(n_docs), str(tmp_path / "corpus.jsonl")))
+    return retriever
+
+def test_precomputed_embedding_matches_text_search(tmp_path):
+    retriever = build_retriever(tmp_path)
+    query = "What was total revenue this quarter?"
+    by_text = retriever.search(query, top_k=5)
+    by_vector = retriever.search(query, top_k=5, query_embedding=HashingEncoder().encode(query))
+    assert [d['text'] for d in by_text] == [d['text'] for d in by_vector]
+    assert [d['distance'] for d in by_text] == pytest.approx([d['distance'] for d in by_vector], abs=1e-5)
+
+def test_corpus_version_changes_with_index(tmp_path):
+    retriever = build_retriever(tmp_path, n_docs=10)
+    version = retriever.get_corpus_version()
+    assert version.endswith(":10")
+    retriever.build_index_from_jsonl(write_jsonl(synthetic_corpus(12, seed=1), str(tmp_path / "more.jsonl")))
+    assert retriever.get_corpus_version() != version
+
+def test_type_partitions_restrict_search(tmp_path):
+    retriever = build_retriever(tmp_path)
+    for chunk_type in ("news", "financials", "sec_filing", "fundamentals"):
+        assert retriever._get_partition(chunk_type).count() == 10
+    docs = retriever.search("revenue growth", top_k=8, chunk_types=["financials", "fundamentals"])
+    assert len(docs) == 8
+    assert {d['metadata']['type'] for d in docs} <= {"financials", "fundamentals"}
+    distances = [d['distance'] for d in docs]
+    assert distances == sorted(distances)
+
+def test_missing_types_query_only_existing_partitions(tmp_path, monkeypatch):
+    retriever = build_retriever(tmp_path)
+    # a full-collection scan would be a bug for a partitioned index
+    monkeypatch.setattr(retriever.collection, 'query', None)
+    docs = retriever.search("revenue", top_k=5, chunk_types=["company_info", "financials"])
+    assert len(docs) == 5 and {d['metadata']['type'] for d in docs} == {"financials"}
+    assert "company_info" in retriever._partition_misses
+
+def test_partitions_built_elsewhere_are_found(tmp_path, monkeypatch):
+    from src.llm import rag_retrieval
+    retriever = build_retriever(tmp_path)
+    assert retriever._get_partition("company_info") is None
+    # another process (the corpus build) adds the partition later
+    writer = ChromaDBRetriever(collection_name="test_corpus", persist_directory=str(tmp_path / "chroma"),
+                               embedding_function=HashingEmbeddingFunction())
+    writer.upsert_documents(["info_0"], ["Northern Oil and Gas is a non-operated E&P."],
+                            [{"type": "company_info"}])
+    assert retriever._get_partition("company_info") is None
+    monkeypatch.setattr(rag_retrieval, 'PARTITION_MISS_TTL', 0.0)
+    assert retriever._get_partition("company_info").count() == 1
+    docs = retriever.search("non-operated", top_k=3, chunk_types=["company_info"])
+    assert [d['id'] for d in docs] == ["info_0"]
+
+def test_unpartitioned_recency_window(tmp_path):
+    partitioned = build_retriever(tmp_path / "a")
+    unpartitioned = build_retriever(tmp_path / "b", partition_by_type=False)
+    ids = lambda docs: sorted(d['id'] for d in docs)
+    assert ids(unpartitioned.search("oil", top_k=10, chunk_types=["news"], within_days=14)) == \
+        ids(partitioned.search("oil", top_k=10, chunk_types=["news"], within_days=14))
+
+def test_recency_window_is_relative_to_newest_chunk(tmp_path):
+    retriever = build_retriever(tmp_path)
+    news_dates = sorted(d['metadata']['date_key'] for d in retriever.search("oil", top_k=10, chunk_types=["news"]))
+    recent = retriever.search("oil", top_k=10, chunk_types=["news"], within_days=14)
+    assert recent and len(recent) < len(news_dates)
+    assert all(d['metadata']['date_key'] >= 20230000 for d in recent)
+    assert min(d['metadata']['date_key'] for d in recent) > news_dates[0]
+
+def test_unpartitioned_index_filters_by_type(tmp_path):
+    retriever = build_retriever(tmp_path, partition_by_type=False)
+    docs = retriever.search("revenue", top_k=5, chunk_types=["news"])
+    assert docs and all(d['metadata']['type'] == "news" for d in docs)
+    # unknown types fall back to the whole collection
+    assert len(retriever.search("revenue", top_k=5, chunk_types=["price"])) == 5
+
+def test_hybrid_search_fuses_bm25(tmp_path):
+    retriever = build_retriever(tmp_path, hybrid=True)
+    retriever.upsert_documents(["filing_1"], ["Filing type 10-Q submitted by NOG. Accession 0001104659-24-115432."],
+                               [{"type": "sec_filing", "date": "2024-11-05", "date_key": 20241105}])
+    docs = retriever.search("0001104659-24-115432", top_k=5)
+    assert docs[0]['id'] == "filing_1"
+    assert all('rrf_score' in d for d in docs)
+    scores = [d['rrf_score'] for d in docs]
+    assert scores == sorted(scores, reverse=True)
+    # typed search restricts both rankings
+    assert all(d['metadata']['type'] == "news" for d in retriever.search("revenue", top_k=5, chunk_types=["news"]))
+    # the BM25 side is persisted next to the collection
+    reopened = ChromaDBRetriever(collection_name="test_corpus", persist_directory=str(tmp_path / "chroma"),
+                                 embedding_function=HashingEmbeddingFunction(), hybrid=True)
+    assert reopened.get_collection_stats()['bm25_documents'] == 41
+
+def test_rebuild_drops_removed_and_moved_documents(tmp_path):
+    retriever = build_retriever(tmp_path, n_docs=2, hybrid=True)
+    assert retriever._get_partition("news").count() == 1
+    # doc_0 becomes a financials chunk, doc_1 is gone
+    corpus = tmp_path / "smaller.jsonl"
+    corpus.write_text('{"text": "Quarterly revenue rose on higher oil volumes.", '
+                      '"metadata": {"type": "financials", "date": "2024-06-30"}}\n')
+    retriever.build_index_from_jsonl(str(corpus))
+    assert retriever.collection.count() == 1
+    assert retriever.get_collection_stats()['bm25_documents'] == 1
+    assert retriever._get_partition("news").count() == 0
+    assert retriever._get_partition("financials").get(include=[])['ids'] == ["doc_0"]
+    # BM25 keeps only the new version, under its new type
+    assert retriever.sparse_index.search("revenue", 5, chunk_types=["news"]) == []
+
+def test_partitions_keep_embeddings_of_reordered_upserts(tmp_path):
+    retriever = ChromaDBRetriever(collection_name="test_corpus", persist_directory=str(tmp_path / "chroma"),
+                                  embedding_function=HashingEmbeddingFunction())
+    news = {"type": "news", "date": "2024-06-30"}
+    retriever.upsert_documents(["n1", "n2"], ["Board raised the dividend.", "Oil output hit a record."],
+                               [news, news])
+    # overlapping batch in an order Chroma does not store them in
+    retriever.upsert_documents(["n3", "n1"], ["NOG closed an acquisition in the Permian.",
+                                              "Dividend raised by the board."], [news, news])
+    main = retriever.collection.get(include=['embeddings'])
+    partition = retriever._get_partition("news").get(include=['embeddings'])
+    expected = dict(zip(main['ids'], main['embeddings']))
+    assert sorted(partition['ids']) == ["n1", "n2", "n3"]
+    for doc_id, embedding in zip(partition['ids'], partition['embeddings']):
+        assert list(embedding) == pytest.approx(list(expected[doc_id]))
+    docs = retriever.search("Dividend raised by the board.", top_k=1, chunk_types=["news"])
+    assert docs[0]['id'] == "n1"
+
+def test_intent_router():
+    router = IntentRouter({"news": {"types": ["news"], "within_days": 30}})
+    assert router.route("news") == {"chunk_types": ["news"], "within_days": 30}
+    assert router.route("general") == {"chunk_types": None, "within_days": None}
+    assert date_key("2023-06-15") == 20230615 and date_key("current") is None
+
+if __name__=='__main__':
+    import pathlib, tempfile
+    test_precomputed_embedding_matches_text_search(pathlib.Path(tempfile.mkdtemp()))
+    test_corpus_version_changes_with_index(pathlib.Path(tempfile.mkdtemp()))
+    test_type_partitions_restrict_search(pathlib.Path(tempfile.mkdtemp()))
+    test_rebuild_drops_removed_and_moved_documents(pathlib.Path(tempfile.mkdtemp()))
+    test_unpartitioned_recency_window(pathlib.Path(tempfile.mkdtemp()))
+    test_recency_window_is_relative_to_newest_chunk(pathlib.Path(tempfile.mkdtemp()))
+    test_unpartitioned_index_filters_by_type(pathlib.Path(tempfile.mkdtemp()))
+    test_hybrid_search_fuses_bm25(pathlib.Path(tempfile.mkdtemp()))
+    test_partitions_keep_embeddings_of_reordered_upserts(pathlib.Path(tempfile.mkdtemp()))
+    test_intent_router()
@@ -0,0 +1,54 @@
+from src.llm.reranker import CrossEncoderReranker
+
+class FakeCrossEncoder:
+    """Scores a pair by the number of query words in the text."""
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, pairs, **kwargs):
+        self.calls.append(len(pairs))
+        return [sum(word in text.lower() for word in query.lower().split()) for query, text in pairs]
+
+DOCS = [
+    {"id": "doc_0", "text": "Crude oil prices rose this week.", "metadata": {}, "distance": 0.1},
+    {"id": "doc_1", "text": "NOG net income grew in Q3.", "metadata": {}, "distance": 0.2},
+    {"id": "doc_2", "text": "NOG quarterly net income and revenue beat estimates.", "metadata": {}, "distance": 0.3},
+]
+
+def test_reranks_and_truncates():
+    reranker = CrossEncoderReranker(model=FakeCrossEncoder())
+    docs = reranker.rerank("NOG net income revenue", DOCS, top_k=2)
+    assert [d["id"] for d in docs] == ["doc_2", "doc_1"]
+    assert docs[0]["rerank_score"] >= docs[1]["rerank_score"]
+
+def test_scores_are_cached_per_query_and_chunk():
+    model = FakeCrossEncoder()
+    reranker = CrossEncoderReranker(model=model)
+    reranker.rerank("NOG net income", DOCS, top_k=2)
+    reranker.rerank("  nog NET income? ", DOCS, top_k=2)
+    assert model.calls == [3]
+    reranker.rerank("NOG net income", DOCS + [{"id": "doc_3", "text": "Dividend raised.", "metadata": {}}], top_k=2)
+    assert model.calls == [3, 1]
+    # new text under an existing id is rescored
+    reranker.rerank("NOG net income", [{**DOCS[0], "text": "NOG net income fell."}], top_k=1)
+    assert model.calls == [3, 1, 1]
+    assert reranker.stats["cached"] == 6
+
+def test_tiny_cache_still_returns_scores():
+    reranker = CrossEncoderReranker(model=FakeCrossEncoder(), max_cache_entries=1)
+    assert len(reranker.rerank("NOG", DOCS, top_k=3)) == 3
+
+def test_concurrent_reranks_share_the_cache():
+    from concurrent.futures import ThreadPoolExecutor
+    reranker = CrossEncoderReranker(model=FakeCrossEncoder(), max_cache_entries=8)
+    docs = [{"id": f"doc_{i}", "text": f"NOG update {i}", "metadata": {}} for i in range(20)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda i: reranker.rerank(f"NOG {i % 5}", docs, top_k=3), range(200)))
+    assert all(len(r) == 3 for r in results)
+    assert len(reranker._scores) <= 8
+
+if __name__=='__main__':
+    test_reranks_and_truncates()
+    test_scores_are_cached_per_query_and_chunk()
+    test_tiny_cache_still_returns_scores()
+    test_concurrent_reranks_share_the_cache()
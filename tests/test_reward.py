@@ -1,4 +1,5 @@
-from src.rl.reward import compute_reward
+import numpy as np
+from src.rl.reward import compute_reward, compute_reward_batch
 
 def test_compute_reward():
     prev = 100
@@ -14,5 +15,20 @@ def test_compute_reward():
 
     print('Reward function test passed!')
 
+def test_compute_reward_batch_matches_scalar():
+    rng = np.random.default_rng(0)
+    prev = rng.normal(30, 5, 1000)
+    curr = prev + rng.normal(0, 1, 1000)
+    actions = rng.integers(0, 4, 1000)
+    expected = [compute_reward(p, c, a) for p, c, a in zip(prev, curr, actions)]
+    np.testing.assert_array_equal(compute_reward_batch(prev, curr, actions), expected)
+
+    # preallocated buffers are filled in place and reused
+    out = np.full(1000, np.nan)
+    mask = np.empty(1000, dtype=bool)
+    assert compute_reward_batch(prev, curr, actions, out=out, mask=mask) is out
+    np.testing.assert_array_equal(out, expected)
+
 if __name__=='__main__':
-    test_compute_reward()
\ No newline at end of file
+    test_compute_reward()
+    test_compute_reward_batch_matches_scalar()
\ No newline at end of file
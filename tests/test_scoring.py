@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+from src.models.history_store import HistoryStore
+from src.models.scoring import (score_predictions, rolling_live_metrics, summarize_live_metrics,
+                                evaluate_alerts, run_scoring)
+
+def make_history(n_runs=6, error=0.5, width=1.0):
+    store = HistoryStore()
+    dates = pd.bdate_range('2025-01-06', periods=n_runs * 5)
+    for run in range(n_runs):
+        week = dates[run * 5:(run + 1) * 5]
+        run_date = (week[0] - pd.offsets.BDay(1)).strftime('%Y-%m-%d')
+        store.add_predictions([{"date": d.strftime('%Y-%m-%d'), "predicted_price": 20.0 + i + error,
+                                "confidence_interval": {"lower": 20.0 + i + error - width,
+                                                        "upper": 20.0 + i + error + width}}
+                               for i, d in enumerate(week)], model_version="v1", run_date=run_date)
+    prices = pd.DataFrame({'Date': dates.strftime('%Y-%m-%d'), 'Close': 20.0 + np.tile(np.arange(5.0), n_runs)})
+    return store, prices
+
+def test_predictions_are_scored_against_closes():
+    store, prices = make_history(n_runs=2)
+    # the last week has no closes yet
+    scored = score_predictions(store.predictions(), prices.iloc[:7])
+    assert len(scored) == 7
+    np.testing.assert_allclose(scored['error'], 0.5)
+    assert scored['covered'].all()
+
+    scored = rolling_live_metrics(scored, window=3)
+    np.testing.assert_allclose(scored['rolling_mae'], 0.5)
+    summary = summarize_live_metrics(scored, window=5)
+    assert summary['n'].tolist() == [5]
+    assert summary['bias'].iloc[0] == 0.5 and summary['coverage'].iloc[0] == 1.0
+    # constant offset of 0.5 on closes 20..24 with variance 2
+    assert abs(summary['r2'].iloc[0] - (1 - 0.25 / 2)) < 1e-9
+
+def test_alerts_fire_past_thresholds():
+    store, prices = make_history(error=2.0, width=1.0)
+    summary = summarize_live_metrics(score_predictions(store.predictions(), prices))
+    fired = evaluate_alerts(summary, {"mae_threshold": 1.0, "r2_threshold": 0.5, "coverage_threshold": 0.8})
+    assert sorted(a['metric'] for a in fired) == ['coverage', 'mae', 'r2']
+    assert evaluate_alerts(summary, {"mae_threshold": 1.0}, min_predictions=100) == []
+
+def test_run_scoring_records_live_metrics():
+    store, prices = make_history()
+    result = run_scoring(store, prices, window=10, alerts={"mae_threshold": 0.1}, as_of='2025-02-14')
+    assert len(result['scored']) == 30
+    assert [a['metric'] for a in result['alerts']] == ['mae']
+    recorded = store.live_metrics(model_version='v1')
+    assert recorded[['scored_on', 'window_size', 'n']].values.tolist() == [['2025-02-14', 10, 10]]
+    assert abs(recorded['mae'].iloc[0] - 0.5) < 1e-9
+
+if __name__=='__main__':
+    test_predictions_are_scored_against_closes()
+    test_alerts_fire_past_thresholds()
+    test_run_scoring_records_live_metrics()
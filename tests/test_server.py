@@ -0,0 +1,149 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from aiohttp.test_utils import TestClient, TestServer
+from src.llm.async_inference import AsyncLLMClient, EchoBackend
+from src.serving.forecast_snapshot import ForecastSnapshot
+from src.serving.server import create_app
+
+class FakeSystem:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def analyze_query(self, query, top_k=5):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return {"query": query, "intent": "general", "answer": "ok", "sources": [], "confidence": "low"}
+
+    def get_system_stats(self):
+        return {"system": "NOG Analysis System", "status": "operational"}
+
+class FakeRetrievingSystem(FakeSystem):
+    """Splits retrieval from generation like NOGAnalysisSystem."""
+    def __init__(self):
+        super().__init__()
+        self.answers = []
+
+    def retrieve_context(self, query, top_k=5):
+        response = {"query": query, "answer": "cached"} if query == "cached" else None
+        return {"query": query, "context_texts": ["NOG closed at 30."], "response": response}
+
+    def complete_response(self, context, answer):
+        self.answers.append(answer)
+        return {"query": context["query"], "answer": answer if answer is not None else "error"}
+
+class FailingBackend:
+    async def stream(self, prompt):
+        raise ValueError("boom")
+        yield
+
+def write_forecast(path, generated, n=5):
+    with open(path, 'w') as f:
+        json.dump({"generated_date": generated,
+                   "predictions": [{"day": i + 1, "predicted_price": 30.0 + i} for i in range(n)]}, f)
+
+def run(app, scenario):
+    async def go():
+        async with TestClient(TestServer(app)) as client:
+            return await scenario(client)
+    return asyncio.run(go())
+
+def test_ask_forecast_and_stats(tmp_path):
+    forecast_path = str(tmp_path / "weekly_predictions.json")
+    write_forecast(forecast_path, "2026-01-05")
+    app = create_app(system=FakeSystem(), forecast_path=forecast_path)
+
+    async def scenario(client):
+        resp = await client.post('/ask', json={"query": "What is NOG's ROE?"})
+        assert resp.status == 200
+        assert (await resp.json())["answer"] == "ok"
+        assert (await client.post('/ask', json={"top_k": 3})).status == 400
+        assert (await client.post('/ask', data="not json")).status == 400
+
+        resp = await client.get('/forecast?days=2')
+        body = await resp.json()
+        assert body["generated_date"] == "2026-01-05" and len(body["predictions"]) == 2
+
+        body = await (await client.get('/stats')).json()
+        assert body["status"] == "operational"
+        assert body["server"]["ask_requests"] == 1
+        assert body["forecast"]["loaded"]
+
+    run(app, scenario)
+
+def test_forecast_missing_returns_404(tmp_path):
+    app = create_app(system=FakeSystem(), forecast_path=str(tmp_path / "missing.json"))
+
+    async def scenario(client):
+        assert (await client.get('/forecast')).status == 404
+
+    run(app, scenario)
+
+def test_requests_run_concurrently_up_to_limit(tmp_path):
+    system = FakeSystem(delay=0.05)
+    app = create_app(system=system, max_concurrency=3, forecast_path=str(tmp_path / "f.json"))
+
+    async def scenario(client):
+        responses = await asyncio.gather(*[client.post('/ask', json={"query": f"q{i}"}) for i in range(8)])
+        assert all(r.status == 200 for r in responses)
+
+    run(app, scenario)
+    assert system.peak == 3
+
+def test_ask_generates_with_async_client(tmp_path):
+    system = FakeRetrievingSystem()
+    client = AsyncLLMClient(backend=EchoBackend(reply="NOG looks fine", token_delay=0.001))
+    app = create_app(system=system, forecast_path=str(tmp_path / "f.json"), llm_client=client)
+
+    async def scenario(http):
+        resp = await http.post('/ask', json={"query": "How is NOG?"})
+        assert (await resp.json())["answer"] == "NOG looks fine"
+        assert (await (await http.post('/ask', json={"query": "cached"})).json())["answer"] == "cached"
+        body = await (await http.get('/stats')).json()
+        assert body["llm"]["requests"] == 1
+
+    run(app, scenario)
+    assert system.answers == ["NOG looks fine"]
+
+    system = FakeRetrievingSystem()
+    app = create_app(system=system, forecast_path=str(tmp_path / "f.json"),
+                     llm_client=AsyncLLMClient(backend=FailingBackend(), max_retries=0))
+
+    async def failing(http):
+        resp = await http.post('/ask', json={"query": "How is NOG?"})
+        assert resp.status == 200 and (await resp.json())["answer"] == "error"
+
+    run(app, failing)
+    assert system.answers == [None]
+
+def test_snapshot_hot_reloads(tmp_path):
+    path = str(tmp_path / "weekly_predictions.json")
+    snapshot = ForecastSnapshot(path, check_interval=0.0)
+    assert snapshot.get() is None
+    write_forecast(path, "2026-01-05")
+    assert snapshot.get()["generated_date"] == "2026-01-05"
+    write_forecast(path, "2026-01-12", n=3)
+    os.utime(path, ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+    assert snapshot.get()["generated_date"] == "2026-01-12"
+    with open(path, 'w') as f:
+        f.write('{"generated_')  # pipeline mid-write
+    os.utime(path, ns=(time.time_ns() + 2 * 10**9, time.time_ns() + 2 * 10**9))
+    assert snapshot.get()["generated_date"] == "2026-01-12"
+    assert snapshot.reloads == 2
+
+if __name__=='__main__':
+    import pathlib, tempfile
+    test_ask_forecast_and_stats(pathlib.Path(tempfile.mkdtemp()))
+    test_forecast_missing_returns_404(pathlib.Path(tempfile.mkdtemp()))
+    test_requests_run_concurrently_up_to_limit(pathlib.Path(tempfile.mkdtemp()))
+    test_ask_generates_with_async_client(pathlib.Path(tempfile.mkdtemp()))
+    test_snapshot_hot_reloads(pathlib.Path(tempfile.mkdtemp()))
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+from src.models.signal_table import SignalTable, build_signal_table, daily_sentiment, score_sentiment
+from src.rl.environment import HistoricalTradingEnv
+
+def make_frame(n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 30 + np.cumsum(rng.normal(0, 0.5, n))
+    return pd.DataFrame({
+        'Date': pd.bdate_range('2024-01-01', periods=n),
+        'Close': close,
+        'ma_10': pd.Series(close).rolling(10, min_periods=1).mean(),
+        'RSI_14': rng.uniform(0, 100, n),
+    })
+
+def test_score_sentiment():
+    scores = score_sentiment(["Strong profit growth", "Loss and decline, some gain", "Flat quarter", None])
+    np.testing.assert_allclose(scores, [1.0, -1 / 3, 0.0, 0.0])
+
+def test_daily_sentiment_maps_weekend_news_to_monday():
+    trading = pd.bdate_range('2024-01-01', periods=10).to_numpy()   # Monday 2024-01-01
+    news_dates = ['2024-01-01', '2024-01-06', '2024-01-07', '2030-01-01']
+    sentiment, counts = daily_sentiment(trading, news_dates, [1.0, -1.0, -1.0, 1.0], halflife_days=1)
+    assert list(counts) == [1, 0, 0, 0, 0, 2, 0, 0, 0, 0]
+    assert sentiment[0] == 1.0 and sentiment[4] == 1.0
+    assert -1.0 < sentiment[5] < 0.0
+    # quiet days carry the last value forward
+    np.testing.assert_allclose(sentiment[6:], sentiment[5])
+
+def test_build_signal_table_walk_forward_and_reuse(tmp_path):
+    df = make_frame()
+    params = {"n_estimators": 10, "max_depth": 2}
+    news = pd.DataFrame({'date': ['2024-01-15', '2024-03-01'], 'content': ['strong growth', 'weak']})
+    table = build_signal_table(df, news, params=params, min_train_size=60, refit_every=20)
+    assert len(table) == len(df)
+    assert np.isnan(table.forecast[:60]).all() and np.isfinite(table.forecast[60:]).all()
+    assert table.news_count.sum() == 2
+
+    path = str(tmp_path / "signals.npz")
+    table.save(path)
+    loaded = SignalTable.load(path)
+    np.testing.assert_array_equal(loaded.forecast, table.forecast)
+    np.testing.assert_array_equal(loaded.date, table.date)
+
+    # a longer history only fits the new rows
+    longer = make_frame(n=140)
+    extended = build_signal_table(longer, params=params, previous=loaded, min_train_size=60, refit_every=20)
+    np.testing.assert_array_equal(extended.forecast[:120], table.forecast)
+    assert np.isfinite(extended.forecast[120:]).all()
+
+    # other walk-forward settings refit everything
+    refit = build_signal_table(longer, params=params, previous=loaded, min_train_size=60, refit_every=10)
+    assert not np.array_equal(refit.forecast[60:120], table.forecast[60:])
+    stale = SignalTable(loaded.date, loaded.close, np.zeros(len(loaded)), loaded.sentiment)
+    rebuilt = build_signal_table(longer, params=params, previous=stale, min_train_size=60, refit_every=20)
+    fresh = build_signal_table(longer, params=params, min_train_size=60, refit_every=20)
+    np.testing.assert_array_equal(rebuilt.forecast, fresh.forecast)
+
+    env = HistoricalTradingEnv.from_signal_table(extended, n_envs=2, episode_length=10, seed=0)
+    assert env.prices.shape == (80,)
+    np.testing.assert_array_equal(env.forecasts, extended.forecast[60:])
+
+if __name__=='__main__':
+    import pathlib, tempfile
+    test_score_sentiment()
+    test_daily_sentiment_maps_weekend_news_to_monday()
+    test_build_signal_table_walk_forward_and_reuse(pathlib.Path(tempfile.mkdtemp()))
@@ -1,4 +1,5 @@
-from src.rl.state_builder import build_state
+import numpy as np
+from src.rl.state_builder import build_state, build_state_batch
 
 def test_build_state():
     current_price = 100
@@ -13,5 +14,18 @@ def test_build_state():
 
     print('State builder test passed!')
 
+def test_build_state_batch_matches_scalar():
+    rng = np.random.default_rng(0)
+    prices = rng.normal(30, 5, 100)
+    forecasts = prices + rng.normal(0, 1, 100)
+    sentiment = rng.uniform(-1, 1, 100)
+    expected = np.array([build_state(p, f, s) for p, f, s in zip(prices, forecasts, sentiment)])
+    np.testing.assert_array_equal(build_state_batch(prices, forecasts, sentiment), expected)
+
+    out = np.empty((100, 3))
+    assert build_state_batch(prices, forecasts, sentiment, out=out) is out
+    np.testing.assert_array_equal(out, expected)
+
 if __name__=='__main__':
-    test_build_state()
\ No newline at end of file
+    test_build_state()
+    test_build_state_batch_matches_scalar()
\ No newline at end of file